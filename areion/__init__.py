@@ -8,8 +8,11 @@ from .default.orchestrator import Orchestrator as DefaultOrchestrator
 
 from .core import (
     HttpResponse,
+    StreamingResponse,
+    FileResponse,
     HttpRequest,
     HttpRequestFactory,
+    Headers,
     HttpServer,
     HTTP_STATUS_CODES,
     HttpError,
@@ -18,6 +21,10 @@ from .core import (
     ForbiddenError,
     NotFoundError,
     MethodNotAllowedError,
+    RequestTimeoutError,
+    PayloadTooLargeError,
+    UriTooLongError,
+    RequestHeaderFieldsTooLargeError,
     InternalServerError,
 )
 
@@ -36,8 +43,11 @@ __all__ = [
     "DefaultEngine",
     # Core classes
     "HttpResponse",
+    "StreamingResponse",
+    "FileResponse",
     "HttpRequest",
     "HttpRequestFactory",
+    "Headers",
     "HttpServer",
     "HTTP_STATUS_CODES",
     # Base classes
@@ -53,6 +63,10 @@ __all__ = [
     "ForbiddenError",
     "NotFoundError",
     "MethodNotAllowedError",
+    "RequestTimeoutError",
+    "PayloadTooLargeError",
+    "UriTooLongError",
+    "RequestHeaderFieldsTooLargeError",
     "InternalServerError",
     # Misc
     AREION_LOGO,
@@ -1,6 +1,12 @@
 from .server import HttpServer
-from .response import HttpResponse, HTTP_STATUS_CODES
+from .response import (
+    HttpResponse,
+    StreamingResponse,
+    FileResponse,
+    HTTP_STATUS_CODES,
+)
 from .request import HttpRequest, HttpRequestFactory
+from .headers import Headers
 from .exceptions import (
     HttpError,
     BadRequestError,
@@ -8,6 +14,10 @@ from .exceptions import (
     ForbiddenError,
     NotFoundError,
     MethodNotAllowedError,
+    RequestTimeoutError,
+    PayloadTooLargeError,
+    UriTooLongError,
+    RequestHeaderFieldsTooLargeError,
     InternalServerError,
 )
 
@@ -18,14 +28,21 @@ __exceptions__ = [
     "ForbiddenError",
     "NotFoundError",
     "MethodNotAllowedError",
+    "RequestTimeoutError",
+    "PayloadTooLargeError",
+    "UriTooLongError",
+    "RequestHeaderFieldsTooLargeError",
     "InternalServerError",
 ]
 
 __core__ = [
     "HttpServer",
     "HttpResponse",
+    "StreamingResponse",
+    "FileResponse",
     "HttpRequest",
     "HttpRequestFactory",
+    "Headers",
 ]
 
 __all__ = __core__ + __exceptions__ + ["HTTP_STATUS_CODES"]
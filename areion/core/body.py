@@ -0,0 +1,169 @@
+"""
+Streamed request bodies.
+
+Bodies that are not read up front are exposed to handlers as a RequestBody, an async
+iterator that pulls bytes off the connection as it is consumed. The reader passed in
+only needs the StreamReader methods readuntil(), readexactly() and read(), which both
+asyncio.StreamReader and HttpProtocol provide.
+"""
+
+import asyncio
+import re
+
+from .exceptions import BadRequestError, PayloadTooLargeError, RequestTimeoutError
+
+# Largest piece yielded at once, chunks bigger than this are split
+READ_SIZE = 2**16
+
+# Bound on the discarded trailer section after the last chunk
+MAX_TRAILER_SIZE = 2**13
+
+# Interim response for clients that sent "Expect: 100-continue"
+CONTINUE_RESPONSE = b"HTTP/1.1 100 Continue\r\n\r\n"
+
+_CHUNK_SIZE = re.compile(rb"[0-9A-Fa-f]{1,16}")
+
+
+async def read_length(reader, length: int):
+    """
+    Reads a Content-Length delimited body incrementally.
+
+    Args:
+        reader: Source with a StreamReader-style read().
+        length (int): Body size from the Content-Length header.
+
+    Yields:
+        bytes: Body data, in pieces of at most READ_SIZE bytes.
+
+    Raises:
+        asyncio.IncompleteReadError: If the connection ends mid-body.
+    """
+    while length:
+        data = await reader.read(min(length, READ_SIZE))
+        if not data:
+            raise asyncio.IncompleteReadError(b"", length)
+        length -= len(data)
+        yield data
+
+
+async def read_chunked(reader, max_chunk_size: int, max_body_size: int):
+    """
+    Decodes a chunked transfer-coded body incrementally.
+
+    Chunk sizes are checked against the limits before any chunk data is read, so an
+    oversized upload is rejected without buffering it.
+
+    Args:
+        reader: Source with StreamReader-style readuntil(), readexactly() and read().
+        max_chunk_size (int): Largest chunk size a client may declare.
+        max_body_size (int): Largest total body size.
+
+    Yields:
+        bytes: Body data, in pieces of at most READ_SIZE bytes.
+
+    Raises:
+        BadRequestError: If the chunked framing is malformed.
+        PayloadTooLargeError: If a chunk or the whole body exceeds its limit.
+        asyncio.IncompleteReadError: If the connection ends mid-body.
+    """
+    total = 0
+    while True:
+        line = await reader.readuntil(b"\r\n")
+        # Chunk extensions are allowed after ";" and ignored
+        size_field = line[:-2].split(b";", 1)[0].strip()
+        if not _CHUNK_SIZE.fullmatch(size_field):
+            raise BadRequestError("Invalid chunk size.")
+        size = int(size_field, 16)
+        if size == 0:
+            break
+        if size > max_chunk_size:
+            raise PayloadTooLargeError("Chunk too large.")
+        total += size
+        if total > max_body_size:
+            raise PayloadTooLargeError()
+
+        while size:
+            data = await reader.read(min(size, READ_SIZE))
+            if not data:
+                raise asyncio.IncompleteReadError(b"", size)
+            size -= len(data)
+            yield data
+        if await reader.readexactly(2) != b"\r\n":
+            raise BadRequestError("Invalid chunk terminator.")
+
+    trailer_size = 0
+    while True:
+        line = await reader.readuntil(b"\r\n")
+        if line == b"\r\n":
+            return
+        trailer_size += len(line)
+        if trailer_size > MAX_TRAILER_SIZE:
+            raise BadRequestError("Trailer section too large.")
+
+
+class RequestBody:
+    """
+    Async byte stream over a request body that is read from the connection on demand.
+
+    A body can only be iterated once. While waiting for data the connection's body
+    timeout is armed, time spent by the handler between reads is not counted.
+
+    Attributes:
+        complete (bool): True once the whole body has been read off the connection.
+    """
+
+    def __init__(
+        self,
+        chunks,
+        timer_wheel=None,
+        timeout_entry=None,
+        timeout=None,
+        on_first_read=None,
+    ):
+        self.complete = False
+        self._chunks = chunks
+        self._started = False
+        self._timer_wheel = timer_wheel
+        self._timeout_entry = timeout_entry
+        self._timeout = timeout
+        # Sends "100 Continue" to clients waiting for it before uploading the body
+        self._on_first_read = on_first_read
+
+    def __aiter__(self):
+        if self._started:
+            raise RuntimeError("Request body can only be streamed once.")
+        self._started = True
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self.complete:
+            raise StopAsyncIteration
+        if self._on_first_read is not None:
+            self._on_first_read()
+            self._on_first_read = None
+        timed = self._timer_wheel is not None
+        if timed:
+            self._timer_wheel.schedule(self._timeout_entry, self._timeout, "body")
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.complete = True
+            raise
+        except asyncio.IncompleteReadError:
+            if timed and self._timeout_entry.expired:
+                raise RequestTimeoutError() from None
+            raise BadRequestError("Incomplete request body.") from None
+        except asyncio.LimitOverrunError:
+            raise BadRequestError("Invalid chunk size.") from None
+        finally:
+            if timed:
+                self._timer_wheel.cancel(self._timeout_entry)
+
+    async def read(self) -> bytes:
+        """
+        Reads the rest of the body into memory.
+
+        Returns:
+            bytes: The body data that has not been streamed yet.
+        """
+        return b"".join([chunk async for chunk in self])
@@ -0,0 +1,232 @@
+"""
+Content-coding negotiation (RFC 9110, section 12.5.3) and on-the-fly response
+compression.
+
+gzip and deflate use the standard library, br and zstd are offered when the
+optional brotli and zstandard packages are installed.
+"""
+
+import asyncio
+import gzip
+import zlib
+from functools import lru_cache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+@lru_cache(maxsize=128)
+def parse_accept_encoding(header: str) -> dict:
+    """
+    Parses an Accept-Encoding header into coding -> quality.
+
+    Clients send the same few header values over and over, so results are cached.
+
+    Args:
+        header (str): The Accept-Encoding header value, e.g. "gzip, br;q=0.9".
+
+    Returns:
+        dict: Lowercase coding names mapped to their q-value.
+    """
+    qualities = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def negotiate_encoding(accept_encoding: str | None, available) -> str | None:
+    """
+    Picks the content coding to send a response in.
+
+    Args:
+        accept_encoding (str | None): The request's Accept-Encoding header.
+        available (Iterable[str]): Codings the server can send, most preferred first.
+
+    Returns:
+        str | None: The coding with the highest q-value the client accepts, ties
+        going to the server's preference, or None to send the identity coding.
+    """
+    if not accept_encoding:
+        return None
+    qualities = parse_accept_encoding(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _gzip(data: bytes, level: int) -> bytes:
+    # mtime=0 keeps the output, and so the ETag, stable for the same body
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _deflate(data: bytes, level: int) -> bytes:
+    # HTTP "deflate" is the zlib format (RFC 1950), not a raw deflate stream
+    return zlib.compress(data, level)
+
+
+CODECS = {}
+if zstandard is not None:
+    CODECS["zstd"] = lambda data, level: zstandard.ZstdCompressor(level=level).compress(
+        data
+    )
+if brotli is not None:
+    CODECS["br"] = lambda data, level: brotli.compress(data, quality=level)
+CODECS["gzip"] = _gzip
+CODECS["deflate"] = _deflate
+
+# Compressible media types, an entry ending in "/" matches the whole type
+DEFAULT_CONTENT_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/xhtml+xml",
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/manifest+json",
+    "application/wasm",
+    "image/svg+xml",
+)
+
+# Statuses whose responses never have a body to compress
+_BODILESS_STATUSES = frozenset((204, 304))
+
+# Statuses whose Content-Range offsets refer to the uncompressed body
+_PARTIAL_STATUSES = frozenset((206, 416))
+
+
+class Compressor:
+    """
+    Compresses response bodies on the fly in a content coding the client accepts.
+
+    Codings are preferred in the order zstd, br, gzip, deflate; zstd and br are
+    only offered when the zstandard and brotli packages are installed.
+
+    Attributes:
+        min_size (int): Smallest body in bytes worth compressing.
+        level (int): Compression level 1-9, used as the zlib level, the brotli
+            quality and the zstd level.
+        content_types (tuple): Media types that are compressed.
+        thread_size (int): Bodies of at least this many bytes are compressed in
+            the default executor instead of on the event loop.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1024,
+        level: int = 6,
+        content_types: tuple = DEFAULT_CONTENT_TYPES,
+        thread_size: int = 2**16,
+    ):
+        if not isinstance(min_size, int) or min_size < 0:
+            raise ValueError("Min size must be a non-negative integer.")
+        if not isinstance(level, int) or not 1 <= level <= 9:
+            raise ValueError("Level must be an integer between 1 and 9.")
+        if not isinstance(thread_size, int) or thread_size < 0:
+            raise ValueError("Thread size must be a non-negative integer.")
+        self.min_size = min_size
+        self.level = level
+        self.content_types = tuple(content_types)
+        self.thread_size = thread_size
+        self.codings = tuple(CODECS)
+        self._type_cache = {}
+
+    def is_compressible(self, content_type: str | None) -> bool:
+        """
+        Checks a Content-Type against the allow-list, ignoring parameters.
+        """
+        if content_type is None:
+            return False
+        allowed = self._type_cache.get(content_type)
+        if allowed is None:
+            media_type = content_type.partition(";")[0].strip().lower()
+            allowed = any(
+                (
+                    media_type.startswith(entry)
+                    if entry.endswith("/")
+                    else media_type == entry
+                )
+                for entry in self.content_types
+            )
+            if len(self._type_cache) < 256:
+                self._type_cache[content_type] = allowed
+        return allowed
+
+    async def compress(self, response, accept_encoding: str | None):
+        """
+        Compresses a response's body in place if it qualifies.
+
+        The response must not be sent yet. Its body is replaced by the compressed
+        bytes, Content-Encoding and Vary are set, and a strong ETag is made weak
+        since the bytes no longer match the identity representation.
+
+        Args:
+            response (HttpResponse): The response about to be sent.
+            accept_encoding (str | None): The request's Accept-Encoding header.
+
+        Returns:
+            HttpResponse: The same response.
+        """
+        headers = response.headers
+        if (
+            not response.compressible
+            or response.status_code < 200
+            or response.status_code in _BODILESS_STATUSES
+            or response.status_code in _PARTIAL_STATUSES
+            or "Content-Encoding" in headers
+            or "Content-Range" in headers
+            or not self.is_compressible(headers.get("Content-Type"))
+        ):
+            return response
+
+        etag = response.get_etag()
+        body = response.serialize_body()
+        if len(body) < self.min_size:
+            return response
+
+        # The representation depends on Accept-Encoding from here on
+        vary = headers.get("Vary")
+        if vary is None:
+            headers["Vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower():
+            headers["Vary"] = f"{vary}, Accept-Encoding"
+
+        coding = negotiate_encoding(accept_encoding, self.codings)
+        if coding is None:
+            return response
+
+        codec = CODECS[coding]
+        if len(body) >= self.thread_size:
+            loop = asyncio.get_running_loop()
+            body = await loop.run_in_executor(None, codec, body, self.level)
+        else:
+            body = codec(body, self.level)
+
+        response.body = body
+        headers["Content-Encoding"] = coding
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+        return response
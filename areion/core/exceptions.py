@@ -59,6 +59,39 @@ class MethodNotAllowedError(HttpError):
     status_code = 405
     message = "Method Not Allowed"
 
+    def __init__(self, message: str = None, status_code: int = None, response=None):
+        super().__init__(message, status_code)
+        # The router's preformatted 405 for the path, with its Allow header
+        self.response = response
+
+
+class RequestTimeoutError(HttpError):
+    """408 Request Timeout."""
+
+    status_code = 408
+    message = "Request Timeout"
+
+
+class PayloadTooLargeError(HttpError):
+    """413 Payload Too Large."""
+
+    status_code = 413
+    message = "Payload Too Large"
+
+
+class UriTooLongError(HttpError):
+    """414 URI Too Long."""
+
+    status_code = 414
+    message = "URI Too Long"
+
+
+class RequestHeaderFieldsTooLargeError(HttpError):
+    """431 Request Header Fields Too Large."""
+
+    status_code = 431
+    message = "Request Header Fields Too Large"
+
 
 class InternalServerError(HttpError):
     """500 Internal Server Error."""
@@ -0,0 +1,207 @@
+"""
+Case-insensitive, multi-value container for HTTP headers.
+
+Headers are kept as the (name, value) byte pairs they were received or set as.
+The lowercase name index used for lookups is only built once a header is looked
+up, and values are only decoded when they are read, so headers a handler never
+touches cost nothing beyond splitting the header block.
+"""
+
+from collections.abc import Mapping, MutableMapping
+
+
+def _encode(value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if not isinstance(value, str):
+        value = str(value)
+    try:
+        return value.encode("latin-1")
+    except UnicodeEncodeError:
+        return value.encode("utf-8")
+
+
+# Lowercase byte keys of the header names looked up, which are mostly a fixed
+# set spelled the same way every time
+_KEYS: dict = {}
+
+
+def _key(name) -> bytes:
+    key = _KEYS.get(name)
+    if key is None:
+        # Lowercased as bytes, like the names in the index
+        key = _encode(name).lower()
+        if len(_KEYS) < 1024:
+            _KEYS[name] = key
+    return key
+
+
+class Headers(MutableMapping):
+    """
+    HTTP headers with case-insensitive lookup and repeated fields kept apart.
+
+    Behaves like a dict of str to str: reading a header returns its first value,
+    setting one replaces all its values, iterating yields each name once. Names
+    may be looked up as str or bytes. Names and values are decoded as
+    ISO-8859-1, the raw bytes are available through raw and get_raw().
+
+    Methods:
+        add(name: str, value: any) -> None:
+            Adds a value without replacing the existing ones.
+        getall(name: str) -> list[str]:
+            Returns every value of a header, in the order they were added.
+        get_raw(name: str) -> bytes | None:
+            Returns the first value of a header as bytes, without decoding it.
+        copy() -> Headers:
+            Returns a shallow copy.
+    """
+
+    __slots__ = ("_raw", "_index")
+
+    def __init__(self, headers=None):
+        """
+        Initializes the headers.
+
+        Args:
+            headers (Mapping | Iterable, optional): A dict or Headers, or an iterable of (name, value) pairs. Names and values may be str or bytes, other values are formatted with str().
+        """
+        self._raw: list = []
+        # Lowercase name -> position of its first value, built on the first lookup
+        self._index: dict | None = None
+        if headers is None:
+            return
+        if isinstance(headers, Headers):
+            self._raw = list(headers._raw)
+            return
+        if isinstance(headers, Mapping):
+            headers = headers.items()
+        self._raw = [(_encode(name), _encode(value)) for name, value in headers]
+
+    @classmethod
+    def from_raw(cls, raw: list) -> "Headers":
+        """
+        Wraps a list of (name, value) byte pairs without copying or decoding it.
+
+        Args:
+            raw (list): The pairs, e.g. as split off a request's header block.
+
+        Returns:
+            Headers: Headers backed by the list.
+        """
+        headers = cls()
+        headers._raw = raw
+        return headers
+
+    @property
+    def raw(self) -> list:
+        """
+        The (name, value) byte pairs in order, including repeated headers.
+        """
+        return self._raw
+
+    def _lookup(self) -> dict:
+        index = self._index
+        if index is None:
+            index = {}
+            for position, (name, _) in enumerate(self._raw):
+                index.setdefault(name.lower(), position)
+            self._index = index
+        return index
+
+    def __getitem__(self, name: str) -> str:
+        position = self._lookup().get(_key(name))
+        if position is None:
+            raise KeyError(name)
+        return self._raw[position][1].decode("latin-1")
+
+    def get(self, name: str, default=None):
+        position = self._lookup().get(_key(name))
+        if position is None:
+            return default
+        return self._raw[position][1].decode("latin-1")
+
+    def get_raw(self, name: str) -> bytes | None:
+        position = self._lookup().get(_key(name))
+        if position is None:
+            return None
+        return self._raw[position][1]
+
+    def getall(self, name: str) -> list:
+        key = _key(name)
+        if key not in self._lookup():
+            return []
+        return [
+            value.decode("latin-1") for item, value in self._raw if item.lower() == key
+        ]
+
+    def __contains__(self, name) -> bool:
+        return isinstance(name, (str, bytes)) and _key(name) in self._lookup()
+
+    def __setitem__(self, name: str, value) -> None:
+        raw = self._raw
+        pair = (_encode(name), _encode(value))
+        if not raw:
+            # A response's first header, nothing to replace, an index built while
+            # the headers were empty is dropped rather than updated
+            raw.append(pair)
+            self._index = None
+            return
+        key = _key(name)
+        index = self._lookup()
+        position = index.get(key)
+        if position is None:
+            index[key] = len(raw)
+            raw.append(pair)
+            return
+        # The first occurrence keeps its place, like assigning an existing dict key
+        raw[position] = pair
+        for later in range(position + 1, len(raw)):
+            if raw[later][0].lower() == key:
+                self._remove(key, start=position + 1)
+                break
+
+    def add(self, name: str, value) -> None:
+        index = self._index
+        if index is not None:
+            index.setdefault(_key(name), len(self._raw))
+        self._raw.append((_encode(name), _encode(value)))
+
+    def __delitem__(self, name: str) -> None:
+        key = _key(name)
+        if key not in self._lookup():
+            raise KeyError(name)
+        self._remove(key)
+
+    def _remove(self, key: bytes, start: int = 0) -> None:
+        raw = self._raw
+        self._raw = raw[:start] + [
+            pair for pair in raw[start:] if pair[0].lower() != key
+        ]
+        self._index = None
+
+    def __iter__(self):
+        # Each name once, spelled as it first appeared, like the keys of a dict
+        raw = self._raw
+        for position in list(self._lookup().values()):
+            yield raw[position][0].decode("latin-1")
+
+    def __len__(self) -> int:
+        return len(self._lookup())
+
+    def items(self) -> list:
+        """
+        Returns every (name, value) pair, repeated headers included.
+        """
+        return [
+            (name.decode("latin-1"), value.decode("latin-1"))
+            for name, value in self._raw
+        ]
+
+    def values(self) -> list:
+        return [value.decode("latin-1") for _, value in self._raw]
+
+    def copy(self) -> "Headers":
+        return Headers.from_raw(list(self._raw))
+
+    def __repr__(self) -> str:
+        return f"Headers({self.items()!r})"
@@ -0,0 +1,186 @@
+"""
+HTTP/1.x request head parsers.
+
+A parser turns the request line and header block, up to and including the blank
+line, into (method, path, http_version) and a Headers. Two backends are
+available: "httptools" wraps the llhttp C parser used by Node.js and is picked
+automatically when the httptools package is installed, "python" is a pure-Python
+parser with no dependencies. Both reject the same malformed input with
+ValueError.
+"""
+
+from .headers import Headers
+
+try:
+    import httptools
+except ImportError:
+    httptools = None
+
+# "auto" picks httptools when it is installed, otherwise the pure-Python parser
+PARSERS = ("auto", "httptools", "python")
+
+# Anything else, including the HTTP/0.9 "GET /" llhttp accepts, is rejected
+_VERSIONS = frozenset(("HTTP/1.1", "HTTP/1.0"))
+
+# Optional whitespace around header values (RFC 9110, section 5.6.3)
+_OWS = b" \t"
+
+# Longer header lines (cookies, tokens) are mostly unique and not worth caching
+_MAX_CACHED_LINE = 256
+
+
+class PythonParser:
+    """
+    Pure-Python request head parser.
+
+    The head is split as bytes, only the request line is decoded. Header names
+    and values are kept as bytes in the returned Headers until they are read.
+    Clients repeat most header lines verbatim on every request (Host, User-Agent,
+    Accept...), so parsed lines are cached and a repeated line costs one dict
+    lookup.
+
+    Attributes:
+        cache_size (int): Most header lines kept in the cache, it is emptied when full.
+    """
+
+    name = "python"
+
+    def __init__(self, cache_size: int = 4096):
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError("Cache size must be a non-negative integer.")
+        self.cache_size = cache_size
+        # Raw header line -> (name, value)
+        self._lines: dict = {}
+
+    def parse(self, data: bytes) -> tuple:
+        """
+        Parses a request head.
+
+        Args:
+            data (bytes): The request line and headers, ending with the blank line.
+
+        Returns:
+            tuple: ((method, path, http_version), Headers).
+
+        Raises:
+            ValueError: If the request line or a header line is malformed, or the
+                HTTP version is not 1.0 or 1.1.
+        """
+        # Blank lines before the request line are ignored (RFC 9112, section 2.2)
+        lines = data.strip(b"\r\n").split(b"\r\n")
+        method, path, http_version = lines[0].decode("iso-8859-1").split(" ")
+        if not method or not path:
+            raise ValueError(f"malformed request line {lines[0]!r}")
+        if http_version not in _VERSIONS:
+            raise ValueError(f"unsupported HTTP version {http_version!r}")
+
+        cached = self._lines.get
+        raw = []
+        append = raw.append
+        for line in lines[1:]:
+            append(cached(line) or self._parse_line(line))
+        return (method, path, http_version), Headers.from_raw(raw)
+
+    def _parse_line(self, line: bytes) -> tuple:
+        name, colon, value = line.partition(b":")
+        # Whitespace before the colon, or a line folded onto the previous one
+        # (RFC 9112, section 5), must be rejected
+        if not colon or not name or name[0] in _OWS or name[-1] in _OWS:
+            raise ValueError(f"malformed header line {line!r}")
+        pair = (name, value.strip(_OWS))
+        if len(line) <= _MAX_CACHED_LINE:
+            lines = self._lines
+            if len(lines) >= self.cache_size:
+                # Cheaper than LRU bookkeeping, the common lines come back at once
+                lines.clear()
+            if self.cache_size:
+                lines[line] = pair
+        return pair
+
+
+class _HttptoolsCallbacks:
+    __slots__ = ("url", "raw", "complete")
+
+    def __init__(self):
+        self.url = b""
+        self.raw = []
+        self.complete = False
+
+    def on_url(self, url: bytes) -> None:
+        self.url += url
+
+    def on_header(self, name: bytes, value: bytes) -> None:
+        self.raw.append((name, value.strip(_OWS)))
+
+    def on_headers_complete(self) -> None:
+        self.complete = True
+
+
+class HttptoolsParser:
+    """
+    Request head parser backed by httptools (llhttp).
+
+    A fresh llhttp parser is used for every head, the body is framed by the
+    server as with the pure-Python parser.
+    """
+
+    name = "httptools"
+
+    def __init__(self):
+        if httptools is None:
+            raise ValueError("The httptools parser requires the httptools package.")
+
+    def parse(self, data: bytes) -> tuple:
+        """
+        Parses a request head.
+
+        Args:
+            data (bytes): The request line and headers, ending with the blank line.
+
+        Returns:
+            tuple: ((method, path, http_version), Headers).
+
+        Raises:
+            ValueError: If llhttp rejects the request line or a header line, or
+                the HTTP version is not 1.0 or 1.1.
+        """
+        callbacks = _HttptoolsCallbacks()
+        parser = httptools.HttpRequestParser(callbacks)
+        try:
+            parser.feed_data(data)
+        except httptools.HttpParserUpgrade:
+            # Upgrade and CONNECT requests, the head itself is complete
+            pass
+        except httptools.HttpParserError as e:
+            raise ValueError(str(e)) from e
+        if not callbacks.complete:
+            raise ValueError("incomplete request head")
+        http_version = "HTTP/" + parser.get_http_version()
+        if http_version not in _VERSIONS:
+            raise ValueError(f"unsupported HTTP version {http_version!r}")
+        request_line = (
+            parser.get_method().decode("iso-8859-1"),
+            callbacks.url.decode("iso-8859-1"),
+            http_version,
+        )
+        return request_line, Headers.from_raw(callbacks.raw)
+
+
+def create_parser(name: str = "auto"):
+    """
+    Creates a request head parser.
+
+    Args:
+        name (str): One of PARSERS, "auto" uses httptools when it is installed.
+
+    Returns:
+        PythonParser | HttptoolsParser: The parser.
+
+    Raises:
+        ValueError: If the parser is unknown, or httptools is asked for but not installed.
+    """
+    if name not in PARSERS:
+        raise ValueError(f"Parser must be one of: {', '.join(PARSERS)}.")
+    if name == "httptools" or (name == "auto" and httptools is not None):
+        return HttptoolsParser()
+    return PythonParser()
@@ -0,0 +1,467 @@
+"""
+Raw asyncio.Protocol transport for HttpServer.
+
+Requests are parsed incrementally in data_received and responses are written
+straight to the transport, skipping the StreamReader/StreamWriter machinery used
+by the default stream transport.
+"""
+
+import asyncio
+import sys
+
+from .body import CONTINUE_RESPONSE, RequestBody, read_chunked, read_length
+from .exceptions import HttpError
+from .reader import HeadScanner
+from .response import HttpResponse, StreamingResponse, HTTP_STATUS_CODES
+from .timeouts import TimeoutEntry
+
+# Same bound asyncio.StreamReader applies to readuntil() by default, also the
+# default of HttpServer.max_header_bytes
+MAX_HEADER_SIZE = 2**16
+
+# Pipelined responses are coalesced into one write until this many bytes are queued
+PIPELINE_FLUSH_SIZE = 2**16
+
+_READ_HEADERS = 0
+_READ_BODY = 1
+
+
+if sys.version_info >= (3, 12):
+
+    def _create_task(loop, coro):
+        # Runs the handler synchronously until its first real suspension point,
+        # so fast handlers never round-trip through the event loop
+        return asyncio.Task(coro, loop=loop, eager_start=True)
+
+else:
+
+    def _create_task(loop, coro):
+        return loop.create_task(coro)
+
+
+class FlushOnSuspend:
+    """
+    Awaits a coroutine, calling flush() the first time it suspends.
+
+    Responses to pipelined requests are held back to be written together, a request
+    whose handling has to wait must not hold back the responses finished before it.
+    """
+
+    __slots__ = ("_coro", "_flush")
+
+    def __init__(self, coro, flush):
+        self._coro = coro
+        self._flush = flush
+
+    def __await__(self):
+        coro = self._coro
+        flush = self._flush
+        value = error = None
+        while True:
+            try:
+                if error is None:
+                    waited = coro.send(value)
+                else:
+                    waited = coro.throw(error)
+            except StopIteration as e:
+                return e.value
+            if flush is not None:
+                flush()
+                flush = None
+            try:
+                value, error = (yield waited), None
+            except BaseException as e:
+                value, error = None, e
+
+
+class HttpProtocol(asyncio.Protocol):
+    """
+    HTTP/1.1 connection handler built on asyncio.Protocol.
+
+    One instance is created per connection. Requests on a connection are answered
+    in order, one at a time. Pipelined requests that are already buffered are
+    handled back to back and their responses written with a single writelines()
+    call once no complete request is left in the buffer, or as soon as a request's
+    handling has to wait.
+
+    The protocol also exposes the subset of the StreamWriter interface used by
+    HttpServer._send_response (write, writelines, drain, is_closing, close) so
+    response serialization is shared between transports, and the StreamReader
+    methods (readuntil, readexactly, read) that streamed request bodies pull from.
+
+    Attributes:
+        server (HttpServer): The server that owns routing and request handling.
+        transport (asyncio.Transport | None): The connection transport.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.loop = asyncio.get_running_loop()
+        self.transport = None
+        self._buffer = bytearray()
+        self._state = _READ_HEADERS
+        # Limits are checked as a slow client sends its head
+        self._head = HeadScanner(server)
+        self._request_line = None
+        self._headers = None
+        self._content_length = 0
+        self._task = None
+        self._pending = []
+        self._timeout = TimeoutEntry(self._on_timeout)
+        self._write_paused = False
+        self._drain_waiter = None
+        self._data_waiter = None
+        self._eof = False
+        self._closing = False
+        self._connection_lost = False
+        self._admitted = False
+        self._idle = False
+
+    ### asyncio.Protocol callbacks ###
+
+    def connection_made(self, transport):
+        self.transport = transport
+        if not self.server._admit_connection():
+            self._closing = True
+            transport.write(self.server._overload_response())
+            transport.close()
+            return
+        self._admitted = True
+        self._arm_timeout(self.server.header_timeout, "header")
+
+    def data_received(self, data):
+        if self._idle:
+            self._set_idle(False)
+            self._arm_timeout(self.server.header_timeout, "header")
+        self._buffer += data
+        self._wake_data_waiter()
+        if self._task is None:
+            self._process_buffer()
+        elif len(self._buffer) > MAX_HEADER_SIZE:
+            # Client is racing ahead of the handler, stop reading until it catches up
+            self.transport.pause_reading()
+
+    def eof_received(self):
+        self._eof = True
+        self._wake_data_waiter()
+        if self._task is not None:
+            # Keep the write side open so the in-flight response can be sent
+            return True
+        return None
+
+    def connection_lost(self, exc):
+        self._connection_lost = True
+        self._closing = True
+        self._cancel_timeout()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._wake_drain_waiter(exc or ConnectionResetError("Connection lost"))
+        self._wake_data_waiter()
+        if self._idle:
+            self._set_idle(False)
+        if self._admitted:
+            self._admitted = False
+            self.server._release_connection()
+
+    def pause_writing(self):
+        self._write_paused = True
+
+    def resume_writing(self):
+        self._write_paused = False
+        self._wake_drain_waiter(None)
+
+    ### StreamWriter-compatible interface ###
+
+    def write(self, data):
+        self.transport.write(data)
+
+    def writelines(self, data):
+        self.transport.writelines(data)
+
+    async def drain(self):
+        if self._connection_lost:
+            raise ConnectionResetError("Connection lost")
+        if not self._write_paused:
+            return
+        self._drain_waiter = self.loop.create_future()
+        await self._drain_waiter
+
+    def is_closing(self):
+        return self.transport.is_closing()
+
+    def close(self):
+        self._closing = True
+        self._cancel_timeout()
+        self.transport.close()
+        self._wake_data_waiter()
+
+    def get_extra_info(self, name, default=None):
+        return self.transport.get_extra_info(name, default)
+
+    ### StreamReader-compatible interface ###
+
+    async def readuntil(self, separator=b"\n"):
+        buffer = self._buffer
+        while True:
+            index = buffer.find(separator)
+            if index != -1:
+                end = index + len(separator)
+                data = bytes(buffer[:end])
+                del buffer[:end]
+                return data
+            if len(buffer) > MAX_HEADER_SIZE:
+                raise asyncio.LimitOverrunError(
+                    "Separator is not found, and chunk exceed the limit", len(buffer)
+                )
+            await self._wait_for_data(bytes(buffer))
+
+    async def readexactly(self, n):
+        buffer = self._buffer
+        while len(buffer) < n:
+            await self._wait_for_data(bytes(buffer), n)
+        data = bytes(buffer[:n])
+        del buffer[:n]
+        return data
+
+    async def read(self, n=-1):
+        buffer = self._buffer
+        if not buffer:
+            try:
+                await self._wait_for_data(b"")
+            except asyncio.IncompleteReadError:
+                return b""
+        if n < 0 or n >= len(buffer):
+            data = bytes(buffer)
+            buffer.clear()
+        else:
+            data = bytes(buffer[:n])
+            del buffer[:n]
+        return data
+
+    ### Request processing ###
+
+    def _process_buffer(self):
+        if self._task is not None or self._closing:
+            return
+        request = self._parse_request()
+        if request is None:
+            if self._eof and not self._closing:
+                self.close()
+            return
+        task = _create_task(self.loop, self._respond(request))
+        if not task.done():
+            self._task = task
+
+    def _parse_request(self):
+        """
+        Advances the parser state machine over the buffered bytes.
+
+        Returns:
+            tuple | None: (method, path, http_version, headers, body) once a full
+            request is buffered, otherwise None.
+        """
+        buffer = self._buffer
+        if self._state == _READ_HEADERS:
+            try:
+                end = self._head.find_end(buffer)
+            except HttpError as e:
+                self._send_error(e.status_code, e.message)
+                return None
+            if end == -1:
+                return None
+            headers_data = bytes(buffer[:end])
+            del buffer[:end]
+
+            try:
+                self._request_line, self._headers = self.server._parse_headers(
+                    headers_data
+                )
+            except HttpError as e:
+                self._send_error(e.status_code, e.message)
+                return None
+            except ValueError as e:
+                self.server.log("error", f"Error parsing headers: {e}")
+                self._send_error(400)
+                return None
+
+            try:
+                chunked, self._content_length = self.server._parse_body_framing(
+                    self._headers
+                )
+            except HttpError as e:
+                self._send_error(e.status_code, e.message)
+                return None
+
+            server = self.server
+            if chunked or self._content_length > server.buffer_size:
+                # Pulled through readuntil/read by the server, or by the handler
+                # if its route streams the body
+                if chunked:
+                    chunks = read_chunked(
+                        self, server.max_chunk_size, server.max_body_size
+                    )
+                else:
+                    chunks = read_length(self, self._content_length)
+                body = server._stream_body(chunks, self._headers, self, self._timeout)
+                return self._request_ready(body)
+
+            self._state = _READ_BODY
+            if len(buffer) < self._content_length:
+                if server._expects_continue(self._headers):
+                    self._flush()
+                    self.transport.write(CONTINUE_RESPONSE)
+                self._arm_timeout(server.body_timeout, "body")
+
+        content_length = self._content_length
+        if len(buffer) < content_length:
+            return None
+        if content_length:
+            body = bytes(buffer[:content_length])
+            del buffer[:content_length]
+        else:
+            body = b""
+        return self._request_ready(body)
+
+    def _request_ready(self, body):
+        self._state = _READ_HEADERS
+        self._cancel_timeout()
+        if self.transport is not None and len(self._buffer) <= MAX_HEADER_SIZE:
+            self.transport.resume_reading()
+
+        method, path, http_version = self._request_line
+        return method, path, http_version, self._headers, body
+
+    async def _respond(self, request):
+        keep_alive = False
+        pending_size = 0
+        try:
+            while request is not None:
+                if isinstance(request[4], RequestBody):
+                    # Earlier responses must go out before a possible 100 Continue
+                    self._flush()
+                handling = self.server._handle_request(*request)
+                if self._pending:
+                    handling = FlushOnSuspend(handling, self._flush)
+                response, keep_alive = await handling
+                if not self._pending:
+                    pending_size = 0
+                if self._closing:
+                    # Timed out reading a streamed body, the 408 is already out
+                    break
+                if isinstance(response, StreamingResponse):
+                    self._flush()
+                    pending_size = 0
+                    method, _, http_version = request[:3]
+                    if not await self.server._send_streaming(
+                        self, response, method, http_version
+                    ):
+                        keep_alive = False
+                    if not keep_alive:
+                        break
+                    request = self._parse_request()
+                    continue
+                buffer = self.server._format_response(response)
+                self._pending.append(buffer)
+                if not keep_alive:
+                    break
+                pending_size += len(buffer)
+                if pending_size >= PIPELINE_FLUSH_SIZE:
+                    self._flush()
+                    await self.drain()
+                    pending_size = 0
+                request = self._parse_request()
+            self._flush()
+            await self.drain()
+        except ConnectionResetError:
+            self.server.log("debug", "Connection reset by peer.")
+            keep_alive = False
+        except Exception as e:
+            self.server.log("error", f"{e}")
+            keep_alive = False
+
+        if not keep_alive or self._closing or self.server._shutdown_event.is_set():
+            if not self._closing:
+                self.close()
+            self._task = None
+            return
+
+        if self._buffer:
+            self._arm_timeout(self.server.header_timeout, "header")
+        else:
+            self._arm_timeout(self.server.keep_alive_timeout, "idle")
+            self._set_idle(True)
+        # Pick up a request that arrived while the last response was draining
+        self._task = None
+        self._process_buffer()
+
+    def _set_idle(self, idle):
+        self._idle = idle
+        self.server.idle_conns += 1 if idle else -1
+
+    def _send_error(self, status_code, body=None):
+        response = HttpResponse(
+            status_code=status_code,
+            body=body or HTTP_STATUS_CODES[status_code],
+            content_type="text/plain",
+        )
+        self._pending.append(response.format_response())
+        self._flush()
+        self.close()
+
+    def _flush(self):
+        pending = self._pending
+        if len(pending) == 1:
+            self.transport.write(pending[0])
+        elif pending:
+            self.transport.writelines(pending)
+        else:
+            return
+        self._pending = []
+
+    ### Timeouts ###
+
+    def _arm_timeout(self, timeout, phase):
+        self.server._timer_wheel.schedule(self._timeout, timeout, phase)
+
+    def _cancel_timeout(self):
+        self.server._timer_wheel.cancel(self._timeout)
+
+    def _on_timeout(self):
+        if self._closing:
+            return
+        if self._task is not None and self._timeout.phase != "body":
+            # Handlers are not timed, only their waits for a streamed body are
+            return
+        if self._timeout.phase == "idle":
+            self.close()
+        else:
+            self._send_error(408)
+
+    async def _wait_for_data(self, partial, expected=None):
+        if self._eof or self._closing:
+            raise asyncio.IncompleteReadError(partial, expected)
+        # Reading may have been paused while the handler was busy
+        self.transport.resume_reading()
+        self._data_waiter = self.loop.create_future()
+        try:
+            await self._data_waiter
+        finally:
+            self._data_waiter = None
+
+    def _wake_data_waiter(self):
+        waiter = self._data_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _wake_drain_waiter(self, exc):
+        waiter = self._drain_waiter
+        if waiter is None:
+            return
+        self._drain_waiter = None
+        if waiter.done():
+            return
+        if exc is None:
+            waiter.set_result(None)
+        else:
+            waiter.set_exception(exc)
@@ -0,0 +1,104 @@
+"""
+Byte range requests (RFC 9110, section 14).
+
+Parses Range headers into (start, end) pairs and lays out multipart/byteranges
+bodies, for responses that can serve part of their body without producing all of it.
+"""
+
+import re
+import secrets
+
+# More ranges than this in one request are ignored and the full body is sent,
+# so a client can't make the server assemble thousands of tiny parts
+MAX_RANGES = 16
+
+_RANGE_SPEC = re.compile(r"([0-9]*)-([0-9]*)")
+
+
+def parse_range(header: str, size: int) -> list | None:
+    """
+    Parses a Range header against a body of the given size.
+
+    Args:
+        header (str): The Range header value, e.g. "bytes=0-499,-500".
+        size (int): Size of the full body in bytes.
+
+    Returns:
+        list | None: (start, end) pairs with inclusive ends, an empty list if no
+        range is satisfiable (416), or None if the header is malformed, uses
+        another unit or asks for too many ranges, meaning it must be ignored.
+    """
+    unit, _, specs = header.partition("=")
+    if unit.strip().lower() != "bytes" or not specs:
+        return None
+    specs = specs.split(",")
+    if len(specs) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for spec in specs:
+        match = _RANGE_SPEC.fullmatch(spec.strip())
+        if match is None:
+            return None
+        first, last = match.groups()
+        if first == "":
+            # Suffix range, the last N bytes
+            if last == "":
+                return None
+            length = int(last)
+            if length == 0 or size == 0:
+                continue
+            ranges.append((max(size - length, 0), size - 1))
+            continue
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+    return ranges
+
+
+def content_range(start: int, end: int, size: int) -> str:
+    return f"bytes {start}-{end}/{size}"
+
+
+class Multipart:
+    """
+    Layout of a multipart/byteranges body.
+
+    Attributes:
+        content_type (str): The Content-Type header value, including the boundary.
+        parts (list): (part head, start, end) for every range, in order.
+        tail (bytes): The closing delimiter.
+        content_length (int): Size of the whole body.
+    """
+
+    def __init__(self, ranges: list, size: int, content_type: str):
+        boundary = secrets.token_hex(12)
+        self.content_type = f"multipart/byteranges; boundary={boundary}"
+        self.parts = []
+        self.content_length = 0
+        for index, (start, end) in enumerate(ranges):
+            # The CRLF ending the previous part's data belongs to this delimiter
+            head = (b"\r\n" if index else b"") + (
+                f"--{boundary}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Range: {content_range(start, end, size)}\r\n\r\n"
+            ).encode("latin-1")
+            self.parts.append((head, start, end))
+            self.content_length += len(head) + end - start + 1
+        self.tail = f"\r\n--{boundary}--\r\n".encode("latin-1")
+        self.content_length += len(self.tail)
+
+    def join(self, body: bytes) -> bytes:
+        """
+        Builds the whole multipart body out of an in-memory full body.
+        """
+        pieces = []
+        for head, start, end in self.parts:
+            pieces.append(head)
+            pieces.append(body[start : end + 1])
+        pieces.append(self.tail)
+        return b"".join(pieces)
@@ -0,0 +1,199 @@
+"""
+Incremental reading of request heads.
+
+HeadScanner finds the end of a request head that arrives in pieces and checks the
+lines received so far against the server's limits, so an overlong request line or
+header is refused as soon as it crosses its limit instead of once the whole head,
+or max_header_bytes of it, has arrived. Both transports use it.
+
+ConnectionReader gives the stream transport a buffer of its own over the
+StreamReader, the head is scanned there as it arrives and the body readers in
+body.py pull from it through the same readuntil(), readexactly() and read()
+methods a StreamReader has.
+"""
+
+import asyncio
+
+from .exceptions import RequestHeaderFieldsTooLargeError, UriTooLongError
+
+# Most bytes taken off the StreamReader at once
+READ_SIZE = 2**16
+
+
+class HeadScanner:
+    """
+    Finds the end of a request head buffered at the start of a bytearray.
+
+    Attributes:
+        server (HttpServer): The server whose head limits apply.
+    """
+
+    __slots__ = ("server", "_scanned", "_line_start", "_lines")
+
+    def __init__(self, server):
+        self.server = server
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Starts over for the next head.
+        """
+        # Buffer offset the search for the end of the head resumes from
+        self._scanned = 0
+        # Start of the head's incomplete line and the complete lines before it
+        self._line_start = 0
+        self._lines = 0
+
+    def find_end(self, buffer: bytearray) -> int:
+        """
+        Looks for the blank line ending the head, checking the lines of a head that
+        is still incomplete. A complete head is checked by
+        HttpServer._check_head_limits() when it is parsed.
+
+        Args:
+            buffer (bytearray): The buffered bytes, starting with the head.
+
+        Returns:
+            int: The head's length including the blank line, -1 if it has not
+            fully arrived yet.
+
+        Raises:
+            UriTooLongError: If the request line is already too long.
+            RequestHeaderFieldsTooLargeError: If a header limit is already exceeded.
+        """
+        # Heads trickling in are only scanned once, the terminator may straddle
+        # the previous piece's last 3 bytes
+        end = buffer.find(b"\r\n\r\n", self._scanned)
+        if end != -1:
+            self.reset()
+            return end + 4
+        start = self._scanned
+        self._scanned = max(len(buffer) - 3, 0)
+        self._check_partial(buffer, start)
+        return -1
+
+    def _check_partial(self, buffer: bytearray, start: int) -> None:
+        server = self.server
+        if len(buffer) > server.max_header_bytes:
+            raise RequestHeaderFieldsTooLargeError()
+        position = max(start, self._line_start)
+        while True:
+            end = buffer.find(b"\r\n", position)
+            if end == -1:
+                break
+            self._check_line(end - self._line_start)
+            self._lines += 1
+            self._line_start = position = end + 2
+        if self._lines > server.max_header_count + 1:
+            raise RequestHeaderFieldsTooLargeError()
+        self._check_line(len(buffer) - self._line_start)
+
+    def _check_line(self, length: int) -> None:
+        if self._lines == 0:
+            if length > self.server.max_request_line:
+                raise UriTooLongError()
+        elif length > self.server.max_header_size:
+            raise RequestHeaderFieldsTooLargeError()
+
+
+class ConnectionReader:
+    """
+    Reads requests off an asyncio.StreamReader through a buffer of its own.
+
+    Attributes:
+        reader (asyncio.StreamReader): The connection's reader.
+        limit (int): Most bytes readuntil() buffers without finding its separator.
+    """
+
+    __slots__ = ("reader", "limit", "_buffer", "_head")
+
+    def __init__(self, reader, server):
+        self.reader = reader
+        self.limit = server.max_header_bytes
+        self._buffer = bytearray()
+        self._head = HeadScanner(server)
+
+    async def _fill(self, partial: bytes, expected: int = None) -> None:
+        data = await self.reader.read(READ_SIZE)
+        if not data:
+            raise asyncio.IncompleteReadError(partial, expected)
+        self._buffer += data
+
+    async def read_head(self, started=None) -> bytes:
+        """
+        Reads the next request head.
+
+        Args:
+            started (callable, optional): Called once the head's first byte is
+                buffered, right away if it already is.
+
+        Returns:
+            bytes: The head, ending with the blank line.
+
+        Raises:
+            asyncio.IncompleteReadError: If the connection ends first, its partial
+                is empty if no byte of the head arrived.
+            UriTooLongError: If the request line is too long.
+            RequestHeaderFieldsTooLargeError: If a header limit is exceeded.
+        """
+        buffer = self._buffer
+        head = self._head
+        while True:
+            if started is not None and buffer:
+                started()
+                started = None
+            end = head.find_end(buffer)
+            if end != -1:
+                data = bytes(buffer[:end])
+                del buffer[:end]
+                return data
+            await self._fill(bytes(buffer))
+
+    def head_buffered(self) -> bool:
+        """
+        Tells whether a complete request head is buffered, read_head() then returns
+        it without waiting on the connection.
+        """
+        return b"\r\n\r\n" in self._buffer
+
+    async def readuntil(self, separator=b"\n"):
+        buffer = self._buffer
+        start = 0
+        while True:
+            index = buffer.find(separator, start)
+            if index != -1:
+                end = index + len(separator)
+                data = bytes(buffer[:end])
+                del buffer[:end]
+                return data
+            if len(buffer) > self.limit:
+                raise asyncio.LimitOverrunError(
+                    "Separator is not found, and chunk exceed the limit", len(buffer)
+                )
+            start = max(len(buffer) - len(separator) + 1, 0)
+            await self._fill(bytes(buffer))
+
+    async def readexactly(self, n):
+        buffer = self._buffer
+        if len(buffer) >= n:
+            data = bytes(buffer[:n])
+            del buffer[:n]
+            return data
+        data = bytes(buffer)
+        buffer.clear()
+        try:
+            return data + await self.reader.readexactly(n - len(data))
+        except asyncio.IncompleteReadError as e:
+            raise asyncio.IncompleteReadError(data + e.partial, n) from None
+
+    async def read(self, n=-1):
+        buffer = self._buffer
+        if not buffer:
+            return await self.reader.read(n)
+        if n < 0 or n >= len(buffer):
+            data = bytes(buffer)
+            buffer.clear()
+        else:
+            data = bytes(buffer[:n])
+            del buffer[:n]
+        return data
@@ -3,6 +3,8 @@ HttpRequest is the representation of the request passed to route handlers by the
 """
 
 from .response import HttpResponse
+from .body import RequestBody
+from .headers import Headers
 from urllib.parse import urlparse, parse_qs
 
 
@@ -13,13 +15,15 @@ class HttpRequest:
         such as headers, body, and metadata, as well as provide access to logging, template rendering, and task submission.
     Attributes:
         method (str): The HTTP method (e.g., GET, POST).
-        path (str): The path of the request.
-        headers (dict): A dictionary of request headers.
-        body (str, optional): The body of the request. Defaults to None.
+        path (str): The path of the request. Parsed from the request target on first access.
+        query_params (dict): The query string parameters, each mapped to a list of values. Parsed on first access.
+        cookies (dict): The cookies sent in the Cookie header, parsed on first access.
+        headers (Headers): The request headers, looked up case-insensitively. Repeated headers are kept, see Headers.getall().
+        body (str, optional): The body of the request. Defaults to None. None for bodies streamed by a route added with stream_body=True until read() is awaited.
         logger (object, optional): A logger instance for logging messages. Defaults to None.
         engine (object, optional): A template engine instance for rendering templates. Defaults to None.
         orchestrator (object, optional): An orchestrator instance for submitting tasks. Defaults to None.
-        metadata (dict): A dictionary for storing additional metadata. Always an empty dictionary on initialization.
+        metadata (dict): A dictionary for storing additional metadata. Always an empty dictionary on initialization, created on first access.
     Methods:
         add_header(key: str, value: any) -> None:
             Adds a header to the request.
@@ -27,6 +31,10 @@ class HttpRequest:
             Retrieve the value of a specified header.
         get_body() -> str | None:
             Retrieve the body of the request, if available.
+        stream() -> AsyncIterator[bytes]:
+            Returns the request body as an async iterator of bytes.
+        read() -> bytes:
+            Reads the whole request body into memory and returns it.
         add_metadata(key: str, value: any) -> None:
             Adds a metadata entry to the request.
         get_metadata(key: str) -> any:
@@ -43,6 +51,23 @@ class HttpRequest:
             Returns a dictionary representation of the HttpRequest instance.
     """
 
+    # Requests are created for every request the server handles, slots keep them
+    # small and the lazily parsed fields are only paid for when a handler reads them
+    __slots__ = (
+        "method",
+        "headers",
+        "body",
+        "logger",
+        "engine",
+        "orchestrator",
+        "_stream",
+        "_target",
+        "_path",
+        "_query_params",
+        "_cookies",
+        "_metadata",
+    )
+
     def __init__(
         self,
         method,
@@ -57,25 +82,86 @@ class HttpRequest:
         Don't call this directly. Use HttpRequestFactory instead.
         """
         self.method: str = method
-        self.headers: dict = headers
+        self.headers: Headers = (
+            headers if isinstance(headers, Headers) else Headers(headers)
+        )
+        if isinstance(body, RequestBody):
+            # Read off the connection only once the handler asks for it
+            self._stream = body
+            body = None
+        else:
+            self._stream = None
         self.body: bytes = body
-        self.metadata: dict = {}
         self.logger = logger
         self.engine = engine
         self.orchestrator = orchestrator
+        self._target: str = path
+        self._path = None
+        self._query_params = None
+        self._cookies = None
+        self._metadata = None
+
+    @property
+    def path(self) -> str:
+        path = self._path
+        if path is None:
+            target = self._target
+            if _is_plain_path(target):
+                path = target
+            else:
+                path = urlparse(target).path
+            self._path = path
+        return path
+
+    @path.setter
+    def path(self, path: str) -> None:
+        self._path = path
+
+    @property
+    def query_params(self) -> dict:
+        query_params = self._query_params
+        if query_params is None:
+            target = self._target
+            if _is_plain_path(target):
+                query_params = {}
+            else:
+                query_params = parse_qs(urlparse(target).query)
+            self._query_params = query_params
+        return query_params
+
+    @query_params.setter
+    def query_params(self, query_params: dict) -> None:
+        self._query_params = query_params
 
-        parsed_url = urlparse(path)
-        self.path = parsed_url.path
-        self.query_params = parse_qs(parsed_url.query)
+    @property
+    def cookies(self) -> dict:
+        cookies = self._cookies
+        if cookies is None:
+            cookies = self._cookies = _parse_cookies(self.headers.get("Cookie"))
+        return cookies
+
+    @property
+    def metadata(self) -> dict:
+        metadata = self._metadata
+        if metadata is None:
+            metadata = self._metadata = {}
+        return metadata
+
+    @metadata.setter
+    def metadata(self, metadata: dict) -> None:
+        self._metadata = metadata
 
     def add_header(self, key: str, value: any) -> None:
         """
         Adds a header to the request.
         Args:
             key (str): The name of the header.
-            value (any): The value of the header.
+            value (any): The value of the header, None removes the header.
         """
-        self.headers[key] = value
+        if value is None:
+            self.headers.pop(key, None)
+        else:
+            self.headers[key] = value
 
     def get_header(self, key) -> str | None:
         """
@@ -95,6 +181,36 @@ class HttpRequest:
         """
         return self.body
 
+    def stream(self):
+        """
+        Returns the request body as an async iterator of bytes.
+        On routes added with stream_body=True, chunked uploads and bodies larger than the server's buffer_size are read from the connection as the iterator is consumed,
+            so they are never held in memory whole. The stream can only be consumed once.
+        Returns:
+            AsyncIterator[bytes]: The body, piece by piece.
+        Raises:
+            BadRequestError: If the body framing is malformed.
+            PayloadTooLargeError: If the body exceeds the server's size limits.
+        """
+        if self.body is None and self._stream is not None:
+            return self._stream
+        return _iter_body(self.body)
+
+    async def read(self) -> bytes:
+        """
+        Reads the whole request body into memory.
+        The result is kept in `body`, so read() can be awaited more than once. Bodies over the server's max_body_size are rejected with 413.
+        Returns:
+            bytes: The request body, b"" if there is none.
+        Raises:
+            BadRequestError: If the body framing is malformed.
+            PayloadTooLargeError: If the body exceeds the server's size limits.
+            RuntimeError: If the body was already consumed through stream().
+        """
+        if self.body is None and self._stream is not None:
+            self.body = await self._stream.read()
+        return self.body if self.body is not None else b""
+
     def add_metadata(self, key: str, value: any) -> None:
         """
         Adds a metadata entry to the request.
@@ -181,7 +297,7 @@ class HttpRequest:
                 "method": self.method,
                 "path": self.path,
                 "query_params": self.query_params,
-                "headers": self.headers,
+                "headers": dict(self.headers),
                 "metadata": self.metadata,
                 "body": self.body,
                 "logger": self.logger,
@@ -192,18 +308,51 @@ class HttpRequest:
             "method": self.method,
             "path": self.path,
             "query_params": self.query_params,
-            "headers": self.headers,
+            "headers": dict(self.headers),
             "metadata": self.metadata,
             "body": self.body,
         }
 
     def __repr__(self) -> str:
-        return f"<HttpRequest method={self.method} path={self.path} query_params={self.query_params} headers={self.headers} metadata={self.metadata}>"
+        return f"<HttpRequest method={self.method} path={self.path} query_params={self.query_params} headers={dict(self.headers)} metadata={self.metadata}>"
 
     def __str__(self) -> str:
         return f"[{self.method}] {self.path}"
 
 
+def _is_plain_path(target: str) -> bool:
+    # An origin-form target without query, fragment or params is its own path
+    return (
+        target[:1] == "/"
+        and target[1:2] != "/"
+        and "?" not in target
+        and "#" not in target
+        and ";" not in target
+    )
+
+
+def _parse_cookies(header: str | None) -> dict:
+    cookies = {}
+    if not header:
+        return cookies
+    for pair in header.split(";"):
+        name, sep, value = pair.partition("=")
+        name = name.strip()
+        if not sep or not name:
+            continue
+        value = value.strip()
+        if len(value) > 1 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        # The first occurrence wins, as with the most specific path (RFC 6265, 5.4)
+        cookies.setdefault(name, value)
+    return cookies
+
+
+async def _iter_body(body):
+    if body:
+        yield body
+
+
 class HttpRequestFactory:
     def __init__(self, logger=None, engine=None, orchestrator=None):
         """
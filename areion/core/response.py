@@ -1,5 +1,15 @@
+import asyncio
+import hashlib
+import mimetypes
+import os
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
 import orjson
 
+from .headers import Headers
+from .ranges import Multipart, content_range, parse_range
+
 
 HTTP_STATUS_CODES: dict[int, str] = {
     100: "Continue",
@@ -88,8 +98,153 @@ class ContentType:
         return cls.TYPE_MAP.get(body_type, cls.PLAIN)
 
 
+# Response lines of every known status, encoded once
+_STATUS_LINES: dict[int, bytes] = {
+    status_code: f"HTTP/1.1 {status_code} {phrase}\r\n".encode("latin-1")
+    for status_code, phrase in HTTP_STATUS_CODES.items()
+}
+
+# Looks cooler with version in response but security risk
+SERVER_HEADER = b"Server: Areion\r\n"
+
+# Headers the response always writes itself, values set by handlers are dropped
+_FRAMING_HEADERS = frozenset((b"server", b"content-length", b"transfer-encoding"))
+
+_date_second = None
+_date_header = b""
+
+# Headers a 304 repeats from the response it stands in for (RFC 9110, 15.4.5)
+_NOT_MODIFIED_HEADERS = frozenset(
+    (
+        b"etag",
+        b"last-modified",
+        b"cache-control",
+        b"content-location",
+        b"date",
+        b"expires",
+        b"vary",
+    )
+)
+
+
+def http_date(timestamp: float) -> str:
+    """
+    Formats a POSIX timestamp as an HTTP date, e.g. "Sun, 06 Nov 1994 08:49:37 GMT".
+    """
+    return formatdate(timestamp, usegmt=True)
+
+
+def status_line(status_code: int) -> bytes:
+    """
+    Returns the encoded response line for a status, e.g. b"HTTP/1.1 200 OK\\r\\n".
+    """
+    line = _STATUS_LINES.get(status_code)
+    if line is None:
+        phrase = HTTP_STATUS_CODES.get(status_code, "")
+        line = f"HTTP/1.1 {status_code} {phrase}\r\n".encode("latin-1")
+    return line
+
+
+def date_header() -> bytes:
+    """
+    Returns the encoded Date header line, formatted at most once per second.
+    """
+    global _date_second, _date_header
+    second = int(time.time())
+    if second != _date_second:
+        _date_header = f"Date: {http_date(second)}\r\n".encode("latin-1")
+        _date_second = second
+    return _date_header
+
+
+def join_response(line: bytes, head: bytes, body: bytes = b"") -> bytes:
+    """
+    Joins the parts returned by HttpResponse.format_parts() into the bytes to send,
+    adding the current Date header.
+
+    Args:
+        line (bytes): The response line.
+        head (bytes): The headers following Date, ending with the blank line.
+        body (bytes): The body, empty to send only the head.
+
+    Returns:
+        bytes: The formatted HTTP response.
+    """
+    return b"".join((line, date_header(), head, body))
+
+
+def file_etag(stat_result: os.stat_result) -> str:
+    """
+    Builds a strong ETag from a file's inode, modification time and size.
+    """
+    return (
+        f'"{stat_result.st_ino:x}-{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    )
+
+
+def content_etag(data: bytes) -> str:
+    """
+    Builds a strong ETag from a hash of the response body.
+    """
+    return f'"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, W/ prefixes are ignored
+    etag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _parse_http_date(value: str):
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _format_str(body: str) -> bytes:
+    return body.encode("utf-8")
+
+
+def _format_bytes(body: bytes) -> bytes:
+    return body
+
+
+def _format_other(body) -> bytes:
+    return str(body).encode("utf-8")
+
+
+# Serializers by exact body type, anything else is formatted with str()
+_BODY_FORMATTERS = {
+    str: _format_str,
+    dict: orjson.dumps,
+    bytes: _format_bytes,
+}
+
+
 class HttpResponse:
-    def __init__(self, body="", status_code=200, content_type=None, headers=None):
+    __slots__ = (
+        "status_code",
+        "body",
+        "headers",
+        "content_type",
+        "etag",
+        "_formatted",
+    )
+
+    # Whether the response can serve byte ranges, see with_range()
+    accept_ranges = False
+    # Whether the body may be compressed on the fly, see compression.Compressor
+    compressible = True
+
+    def __init__(
+        self, body="", status_code=200, content_type=None, headers=None, etag=False
+    ):
         """
         Initializes the HttpResponse object.
 
@@ -98,11 +253,16 @@ class HttpResponse:
             status_code (int): The HTTP status code.
             content_type (str, optional): The content type (e.g., "application/json"). If not specified, it will be inferred from the body type.
             headers (dict, optional): Any additional headers to include in the response.
+            etag (bool): Whether to add an ETag computed from a hash of the body, if no ETag header is set.
         """
         self.status_code = status_code
         self.body = body
-        self.headers = headers or {}
+        self.headers = headers if isinstance(headers, Headers) else Headers(headers)
         self.content_type = content_type or self._infer_content_type(body)
+        self.etag = etag
+        # (body, formatted body) kept when the body is serialized ahead of sending,
+        # e.g. for its ETag or for compression
+        self._formatted = None
 
         self.headers["Content-Type"] = self.content_type
 
@@ -125,16 +285,8 @@ class HttpResponse:
         Returns:
             bytes: The formatted body.
         """
-        body_type = type(self.body)
-
-        body_type_map = {
-            str: lambda body: body.encode("utf-8"),
-            dict: lambda body: orjson.dumps(body),
-            bytes: lambda body: body,
-        }
-
-        formatter = body_type_map.get(body_type, lambda body: str(body).encode("utf-8"))
-        return formatter(self.body)
+        body = self.body
+        return _BODY_FORMATTERS.get(type(body), _format_other)(body)
 
     def _get_status_phrase(self) -> str:
         """
@@ -145,23 +297,42 @@ class HttpResponse:
         """
         return HTTP_STATUS_CODES.get(self.status_code, "")
 
-    def _get_response_line(self) -> str:
+    def _format_headers(self, framing: bytes = b"\r\n") -> bytes:
         """
-        Get the response line for the HTTP response (e.g., "HTTP/1.1 200 OK").
+        Format the headers for the HTTP response, followed by Server and the framing
+        headers.
+
+        Args:
+            framing (bytes): Content-Length or Transfer-Encoding lines and the blank
+                line ending the head.
 
         Returns:
-            str: The HTTP response line.
+            bytes: The formatted headers.
         """
-        return f"HTTP/1.1 {self.status_code} {self._get_status_phrase()}\r\n"
-
-    def _format_headers(self) -> str:
+        pieces = []
+        for name, value in self.headers.raw:
+            if name.lower() not in _FRAMING_HEADERS:
+                pieces += (name, b": ", value, b"\r\n")
+        pieces.append(SERVER_HEADER)
+        pieces.append(framing)
+        return b"".join(pieces)
+
+    def format_parts(self) -> tuple[bytes, bytes, bytes]:
         """
-        Format the headers for the HTTP response.
+        Format the response without its Date header.
+
+        A response that is sent many times can be formatted once this way and sent
+        with join_response(), which adds the current date.
 
         Returns:
-            str: The formatted headers.
+            tuple[bytes, bytes, bytes]: The response line, the headers following
+            Date and the body.
         """
-        return "".join(f"{key}: {value}\r\n" for key, value in self.headers.items())
+        body = self.serialize_body()
+        if self.etag and "ETag" not in self.headers:
+            self.headers["ETag"] = content_etag(body)
+        head = self._format_headers(b"Content-Length: %d\r\n\r\n" % len(body))
+        return status_line(self.status_code), head, body
 
     def format_response(self) -> bytes:
         """
@@ -170,15 +341,105 @@ class HttpResponse:
         Returns:
             bytes: The formatted HTTP response.
         """
+        line, head, body = self.format_parts()
+        return b"".join((line, date_header(), head, body))
+
+    def for_head(self) -> "HttpResponse":
+        """
+        Get the response to send for a HEAD request, with this response's status and
+        headers but no body.
+
+        Returns:
+            HttpResponse: A HeadResponse standing in for this one.
+        """
+        return HeadResponse(self)
+
+    def serialize_body(self) -> bytes:
+        """
+        Get the body as bytes, serializing it only once while it is unchanged.
+
+        Returns:
+            bytes: The formatted body.
+        """
+        formatted = self._formatted
+        if formatted is not None and formatted[0] is self.body:
+            return formatted[1]
         body = self._format_body()
-        self.headers["Server"] = (
-            "Areion"  # Looks cooler with version in response but security risk
-        )
-        self.headers["Content-Length"] = str(len(body))
-        response_line = self._get_response_line()
-        headers = self._format_headers()
+        self._formatted = (self.body, body)
+        return body
 
-        return (response_line + headers + "\r\n").encode("utf-8") + body
+    def get_etag(self) -> str | None:
+        """
+        Get the response's ETag, hashing the body if the response asked for one.
+
+        Returns:
+            str | None: The ETag header value, None if the response has none.
+        """
+        etag = self.headers.get("ETag")
+        if etag is None and self.etag:
+            etag = self.headers["ETag"] = content_etag(self.serialize_body())
+        return etag
+
+    def is_not_modified(self, request_headers: dict) -> bool:
+        """
+        Evaluate the request's If-None-Match / If-Modified-Since against the
+        response's validators.
+
+        If-Modified-Since is ignored when If-None-Match is present (RFC 9110, 13.2.2).
+
+        Args:
+            request_headers (dict): The request headers.
+
+        Returns:
+            bool: True if the client's copy is current and a 304 can be sent instead.
+        """
+        if_none_match = request_headers.get("If-None-Match")
+        if if_none_match is not None:
+            etag = self.get_etag()
+            return etag is not None and _etag_matches(if_none_match, etag)
+
+        if_modified_since = request_headers.get("If-Modified-Since")
+        last_modified = self.headers.get("Last-Modified")
+        if if_modified_since is None or last_modified is None:
+            return False
+        since = _parse_http_date(if_modified_since)
+        modified = _parse_http_date(last_modified)
+        return since is not None and modified is not None and modified <= since
+
+    def if_range_matches(self, if_range: str) -> bool:
+        """
+        Evaluate an If-Range header, which makes a Range request conditional.
+
+        Args:
+            if_range (str): The If-Range header value, an ETag or an HTTP date.
+
+        Returns:
+            bool: True if the client's partial copy is still current and the Range
+            header applies, False if the full response must be sent instead.
+        """
+        if_range = if_range.strip()
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            # Strong comparison, weak validators never match
+            etag = self.get_etag()
+            return etag is not None and not etag.startswith("W/") and etag == if_range
+        return self.headers.get("Last-Modified") == if_range
+
+    def not_modified(self) -> "HttpResponse":
+        """
+        Build the bodiless 304 response that stands in for this one.
+
+        Returns:
+            NotModifiedResponse: The 304 response, carrying this response's validators.
+        """
+        return NotModifiedResponse(
+            Headers.from_raw(
+                [
+                    pair
+                    for pair in self.headers.raw
+                    if pair[0].lower() in _NOT_MODIFIED_HEADERS
+                ]
+            )
+        )
 
     def set_header(self, key: str, value: any) -> None:
         """
@@ -216,3 +477,438 @@ class HttpResponse:
 
     def __repr__(self):
         return f"<HttpResponse status_code={self.status_code} content_type={self.content_type} headers={self.headers}>"
+
+
+class NotModifiedResponse(HttpResponse):
+    __slots__ = ()
+
+    compressible = False
+
+    def __init__(self, headers=None):
+        """
+        Initializes a 304 Not Modified response, which never has a body.
+
+        Args:
+            headers (dict, optional): Headers to include, usually the validators of the response it replaces.
+        """
+        self.status_code = 304
+        self.body = b""
+        self.headers = headers if isinstance(headers, Headers) else Headers(headers)
+        self.content_type = None
+        self.etag = False
+        self._formatted = None
+
+    def format_parts(self) -> tuple[bytes, bytes, bytes]:
+        """
+        Format the response line and headers, a 304 has no Content-Length or body.
+
+        Returns:
+            tuple[bytes, bytes, bytes]: The response line, the headers following
+            Date and an empty body.
+        """
+        return status_line(304), self._format_headers(), b""
+
+    def for_head(self) -> HttpResponse:
+        # Already bodiless
+        return self
+
+    def __repr__(self):
+        return f"<NotModifiedResponse headers={self.headers}>"
+
+
+class HeadResponse(HttpResponse):
+    __slots__ = ("content_length",)
+
+    compressible = False
+
+    def __init__(self, response: HttpResponse):
+        """
+        Initializes the bodiless stand-in for a response to a HEAD request.
+
+        The body is not serialized only to be dropped. Content-Length is sent when
+        the length is already known, for bytes bodies or bodies serialized for
+        their ETag, and left out otherwise as RFC 9110 (section 9.3.2) allows.
+
+        Args:
+            response (HttpResponse): The response a GET request would get.
+        """
+        if response.etag:
+            # The ETag must match the GET response's, which needs the body
+            response.get_etag()
+        body = response.body
+        formatted = response._formatted
+        if type(body) is bytes:
+            self.content_length = len(body)
+        elif formatted is not None and formatted[0] is body:
+            self.content_length = len(formatted[1])
+        else:
+            self.content_length = None
+        self.status_code = response.status_code
+        self.body = b""
+        self.headers = response.headers
+        self.content_type = response.content_type
+        self.etag = False
+        self._formatted = None
+
+    def format_parts(self) -> tuple[bytes, bytes, bytes]:
+        """
+        Format the response line and headers, with the GET response's
+        Content-Length when it is known.
+
+        Returns:
+            tuple[bytes, bytes, bytes]: The response line, the headers following
+            Date and an empty body.
+        """
+        if self.content_length is None:
+            framing = b"\r\n"
+        else:
+            framing = b"Content-Length: %d\r\n\r\n" % self.content_length
+        return status_line(self.status_code), self._format_headers(framing), b""
+
+    def for_head(self) -> HttpResponse:
+        return self
+
+    def __repr__(self):
+        return f"<HeadResponse status_code={self.status_code} headers={self.headers}>"
+
+
+class PreformattedResponse(HttpResponse):
+    __slots__ = ("parts",)
+
+    compressible = False
+
+    def __init__(self, body="", status_code=200, content_type=None, headers=None):
+        """
+        Initializes a response formatted once and sent as is, but for its Date
+        header, every time it is returned. Changes made to it afterwards are not
+        sent.
+
+        Args:
+            body (any): The response body.
+            status_code (int): The HTTP status code.
+            content_type (str, optional): The content type, inferred from the body if not given.
+            headers (dict, optional): Any additional headers to include in the response.
+        """
+        super().__init__(
+            body=body,
+            status_code=status_code,
+            content_type=content_type,
+            headers=headers,
+        )
+        self.parts = self.format_parts()
+
+    def format_response(self) -> bytes:
+        """
+        Joins the preformatted parts with the current Date header.
+
+        Returns:
+            bytes: The formatted HTTP response.
+        """
+        return join_response(*self.parts)
+
+
+# Ends a chunked body
+_LAST_CHUNK = b"0\r\n\r\n"
+_CHUNKED_FRAMING = b"Transfer-Encoding: chunked\r\n\r\n"
+_DONE = object()
+
+
+class StreamingResponse(HttpResponse):
+    __slots__ = ()
+
+    compressible = False
+
+    def __init__(self, body, status_code=200, content_type=None, headers=None):
+        """
+        Initializes a response whose body is produced while it is being sent.
+
+        The body is sent with Transfer-Encoding: chunked (or, for HTTP/1.0 clients,
+        delimited by closing the connection), so it never has to be held in memory
+        whole. The writer is drained after every chunk, a slow client slows the
+        iterator down instead of growing the send buffer.
+
+        Args:
+            body (Iterable | AsyncIterable): Yields the body as bytes or str chunks. Sync iterators are advanced in a worker thread so they can't block the event loop.
+            status_code (int): The HTTP status code.
+            content_type (str, optional): The content type. Defaults to "application/octet-stream".
+            headers (dict, optional): Any additional headers to include in the response.
+        """
+        super().__init__(
+            body=body,
+            status_code=status_code,
+            content_type=content_type or ContentType.OCTET_STREAM,
+            headers=headers,
+        )
+
+    def format_head(self, chunked: bool = True) -> bytes:
+        """
+        Format the response line and headers, without the body.
+
+        Args:
+            chunked (bool): Whether the body is sent with chunked transfer encoding.
+
+        Returns:
+            bytes: The formatted response head.
+        """
+        framing = _CHUNKED_FRAMING if chunked else b"\r\n"
+        return join_response(
+            status_line(self.status_code), self._format_headers(framing)
+        )
+
+    def format_parts(self) -> tuple[bytes, bytes, bytes]:
+        raise TypeError("StreamingResponse bodies are sent with write_to().")
+
+    def for_head(self) -> HttpResponse:
+        # write_to() is told not to send the body
+        return self
+
+    async def write_to(
+        self, writer, chunked: bool = True, send_body: bool = True
+    ) -> bool:
+        """
+        Write the response to a StreamWriter-like writer.
+
+        Args:
+            writer: Object with write(), writelines() and awaitable drain().
+            chunked (bool): Whether to use chunked transfer encoding.
+            send_body (bool): False for HEAD requests, only the head is written.
+
+        Returns:
+            bool: Whether the body was delimited in-band, i.e. the connection can be
+            reused for another request.
+        """
+        writer.write(self.format_head(chunked))
+        if send_body:
+            async for chunk in self._iter_chunks():
+                if not chunk:
+                    # An empty chunk would end the chunked body early
+                    continue
+                if chunked:
+                    writer.writelines((b"%x\r\n" % len(chunk), chunk, b"\r\n"))
+                else:
+                    writer.write(chunk)
+                await writer.drain()
+            if chunked:
+                writer.write(_LAST_CHUNK)
+        await writer.drain()
+        return chunked
+
+    async def _iter_chunks(self):
+        body = self.body
+        if hasattr(body, "__aiter__"):
+            async for chunk in body:
+                yield self._encode_chunk(chunk)
+            return
+
+        loop = asyncio.get_running_loop()
+        iterator = iter(body)
+        while True:
+            chunk = await loop.run_in_executor(None, next, iterator, _DONE)
+            if chunk is _DONE:
+                return
+            yield self._encode_chunk(chunk)
+
+    @staticmethod
+    def _encode_chunk(chunk) -> bytes:
+        if isinstance(chunk, str):
+            return chunk.encode("utf-8")
+        return bytes(chunk)
+
+    def __repr__(self):
+        return f"<StreamingResponse status_code={self.status_code} content_type={self.content_type} headers={self.headers}>"
+
+
+class FileResponse(StreamingResponse):
+    # No __slots__, chunk_size can be tuned per instance
+    # Size of the reads used when sendfile isn't available
+    chunk_size = 2**16
+    accept_ranges = True
+
+    def __init__(
+        self,
+        path,
+        status_code=200,
+        content_type=None,
+        headers=None,
+        stat_result=None,
+    ):
+        """
+        Initializes a response that sends a file from disk.
+
+        The body is sent with loop.sendfile (os.sendfile under the hood), so file
+        data never passes through Python. Transports without sendfile support get
+        the file in chunk_size reads done in the default executor. Neither path
+        loads the whole file into memory or blocks the event loop. ETag and
+        Last-Modified are derived from the file's stat, and byte ranges requested
+        through with_range() are sent from their offsets in the file.
+
+        Args:
+            path (str): Path of the file to send.
+            status_code (int): The HTTP status code.
+            content_type (str, optional): The content type. Guessed from the file name if not specified.
+            headers (dict, optional): Any additional headers to include in the response.
+            stat_result (os.stat_result, optional): The file's stat, saves a fstat() when the caller already has it.
+        """
+        if content_type is None:
+            content_type, _ = mimetypes.guess_type(path)
+        super().__init__(
+            body=None,
+            status_code=status_code,
+            content_type=content_type,
+            headers=headers,
+        )
+        self.path = path
+        self.stat_result = stat_result
+        self.range_header = None
+        self.headers["Accept-Ranges"] = "bytes"
+        if stat_result is not None:
+            self._set_validators()
+
+    def _set_validators(self) -> None:
+        # Headers set by the caller win
+        self.headers.setdefault("ETag", file_etag(self.stat_result))
+        self.headers.setdefault("Last-Modified", http_date(self.stat_result.st_mtime))
+
+    def with_range(self, range_header: str) -> "FileResponse":
+        """
+        Restrict the response to the byte ranges of a Range header.
+
+        The header is resolved against the file size when the response is sent,
+        so only the requested bytes are ever read.
+
+        Args:
+            range_header (str): The request's Range header.
+
+        Returns:
+            FileResponse: This response.
+        """
+        self.range_header = range_header
+        return self
+
+    def format_head(self, chunked: bool = True, content_length: int = None) -> bytes:
+        """
+        Format the response line and headers.
+
+        Args:
+            chunked (bool): Ignored, files are always sent with a Content-Length.
+            content_length (int, optional): The body length, defaults to the file size.
+
+        Returns:
+            bytes: The formatted response head.
+        """
+        if content_length is None:
+            content_length = self.stat_result.st_size
+        framing = b"Content-Length: %d\r\n\r\n" % content_length
+        return join_response(
+            status_line(self.status_code), self._format_headers(framing)
+        )
+
+    async def write_to(
+        self, writer, chunked: bool = True, send_body: bool = True
+    ) -> bool:
+        """
+        Write the response to a StreamWriter-like writer.
+
+        Args:
+            writer: Object with write(), awaitable drain() and, for sendfile, a transport attribute.
+            chunked (bool): Ignored, files are always sent with a Content-Length.
+            send_body (bool): False for HEAD requests, only the head is written.
+
+        Returns:
+            bool: False if the file shrank while it was sent, the connection must then
+            be closed since the client still expects the announced length.
+        """
+        loop = asyncio.get_running_loop()
+        file = await loop.run_in_executor(None, open, self.path, "rb")
+        try:
+            if self.stat_result is None:
+                self.stat_result = os.fstat(file.fileno())
+                self._set_validators()
+            size = self.stat_result.st_size
+            ranges = None
+            if self.range_header is not None:
+                ranges = parse_range(self.range_header, size)
+
+            if ranges is None:
+                writer.write(self.format_head())
+                complete = True
+                if send_body and size:
+                    complete = await self._send_file(loop, writer, file, 0, size)
+            elif not ranges:
+                writer.write(self._range_not_satisfiable(size))
+                complete = True
+            elif len(ranges) == 1:
+                start, end = ranges[0]
+                self.status_code = 206
+                self.headers["Content-Range"] = content_range(start, end, size)
+                writer.write(self.format_head(content_length=end - start + 1))
+                complete = True
+                if send_body:
+                    complete = await self._send_file(
+                        loop, writer, file, start, end - start + 1
+                    )
+            else:
+                complete = await self._send_multipart(
+                    loop, writer, file, ranges, size, send_body
+                )
+            await writer.drain()
+        finally:
+            file.close()
+        return complete
+
+    async def _send_multipart(self, loop, writer, file, ranges, size, send_body):
+        multipart = Multipart(ranges, size, self.content_type)
+        self.status_code = 206
+        self.headers["Content-Type"] = multipart.content_type
+        writer.write(self.format_head(content_length=multipart.content_length))
+        if not send_body:
+            return True
+        for head, start, end in multipart.parts:
+            writer.write(head)
+            if not await self._send_file(loop, writer, file, start, end - start + 1):
+                return False
+        writer.write(multipart.tail)
+        return True
+
+    def _range_not_satisfiable(self, size) -> bytes:
+        response = HttpResponse(
+            status_code=416,
+            body=HTTP_STATUS_CODES[416],
+            content_type="text/plain",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+        return response.format_response()
+
+    async def _send_file(self, loop, writer, file, offset, count) -> bool:
+        """
+        Sends count bytes of the file starting at offset.
+
+        Returns:
+            bool: False if the file ended early.
+        """
+        transport = getattr(writer, "transport", None)
+        if isinstance(transport, asyncio.WriteTransport):
+            try:
+                sent = await loop.sendfile(
+                    transport, file, offset, count, fallback=False
+                )
+                return sent == count
+            except asyncio.SendfileNotAvailableError:
+                # e.g. TLS transports, send the file through the buffer instead
+                pass
+
+        file.seek(offset)
+        sent = 0
+        while sent < count:
+            data = await loop.run_in_executor(
+                None, file.read, min(self.chunk_size, count - sent)
+            )
+            if not data:
+                break
+            writer.write(data)
+            sent += len(data)
+            await writer.drain()
+        return sent == count
+
+    def __repr__(self):
+        return f"<FileResponse path={self.path} status_code={self.status_code} content_type={self.content_type} headers={self.headers}>"
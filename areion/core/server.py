@@ -1,8 +1,44 @@
 import asyncio
+import socket
+from functools import partial
 
-from .exceptions import HttpError, MethodNotAllowedError
-from .response import HttpResponse, HTTP_STATUS_CODES
+from .reader import READ_SIZE, ConnectionReader
+from .body import CONTINUE_RESPONSE, RequestBody, read_chunked, read_length
+from .parser import create_parser
+from .exceptions import (
+    HttpError,
+    BadRequestError,
+    MethodNotAllowedError,
+    PayloadTooLargeError,
+    UriTooLongError,
+    RequestHeaderFieldsTooLargeError,
+)
+from .response import (
+    HttpResponse,
+    StreamingResponse,
+    HTTP_STATUS_CODES,
+    join_response,
+)
 from .request import HttpRequest
+from .protocol import (
+    FlushOnSuspend,
+    HttpProtocol,
+    MAX_HEADER_SIZE,
+    PIPELINE_FLUSH_SIZE,
+)
+from .threadpool import HandlerPool, ThreadedHandler
+from .timeouts import TimerWheel, TimeoutEntry
+
+# "stream" uses asyncio.start_server with StreamReader/StreamWriter (default),
+# "protocol" uses the raw asyncio.Protocol implementation in protocol.py.
+TRANSPORTS = ("stream", "protocol")
+
+# What happens once max_conns connections are open: "reject" answers new
+# connections with a 503, "pause" stops accepting until a connection closes.
+OVERLOAD_POLICIES = ("reject", "pause")
+
+# Most seconds a rejected connection's request is drained for before it is closed
+REJECT_LINGER = 1
 
 
 class HttpServer:
@@ -16,6 +52,21 @@ class HttpServer:
         max_conns: int = 1000,
         buffer_size: int = 8192,
         keep_alive_timeout: int = 30,
+        transport: str = "stream",
+        reuse_port: bool = False,
+        overload_policy: str = "reject",
+        retry_after: int = 1,
+        header_timeout: float = 10,
+        body_timeout: float = 30,
+        max_body_size: int = 2**24,
+        max_chunk_size: int = 2**20,
+        compressor=None,
+        parser: str = "auto",
+        max_request_line: int = 8192,
+        max_header_count: int = 100,
+        max_header_size: int = 8192,
+        max_header_bytes: int = MAX_HEADER_SIZE,
+        handler_pool=None,
     ):
         if not isinstance(port, int):
             raise ValueError("Port must be an integer.")
@@ -31,8 +82,31 @@ class HttpServer:
             raise ValueError("Buffer size must be a positive integer.")
         if not isinstance(keep_alive_timeout, int) or keep_alive_timeout <= 0:
             raise ValueError("Keep alive timeout must be a positive integer.")
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Transport must be one of: {', '.join(TRANSPORTS)}.")
+        if overload_policy not in OVERLOAD_POLICIES:
+            raise ValueError(
+                f"Overload policy must be one of: {', '.join(OVERLOAD_POLICIES)}."
+            )
+        if not isinstance(retry_after, int) or retry_after <= 0:
+            raise ValueError("Retry after must be a positive integer.")
+        if not isinstance(header_timeout, (int, float)) or header_timeout <= 0:
+            raise ValueError("Header timeout must be a positive number.")
+        if not isinstance(body_timeout, (int, float)) or body_timeout <= 0:
+            raise ValueError("Body timeout must be a positive number.")
+        if not isinstance(max_body_size, int) or max_body_size <= 0:
+            raise ValueError("Max body size must be a positive integer.")
+        if not isinstance(max_chunk_size, int) or max_chunk_size <= 0:
+            raise ValueError("Max chunk size must be a positive integer.")
+        if not isinstance(max_request_line, int) or max_request_line <= 0:
+            raise ValueError("Max request line must be a positive integer.")
+        if not isinstance(max_header_count, int) or max_header_count <= 0:
+            raise ValueError("Max header count must be a positive integer.")
+        if not isinstance(max_header_size, int) or max_header_size <= 0:
+            raise ValueError("Max header size must be a positive integer.")
+        if not isinstance(max_header_bytes, int) or max_header_bytes <= 0:
+            raise ValueError("Max header bytes must be a positive integer.")
 
-        self.semaphore = asyncio.Semaphore(max_conns)
         self.router = router
         self.max_conns = max_conns
         self.request_factory = request_factory
@@ -40,19 +114,88 @@ class HttpServer:
         self.port = port
         self.buffer_size = buffer_size
         self.keep_alive_timeout = keep_alive_timeout
+        self.header_timeout = header_timeout
+        self.body_timeout = body_timeout
+        self.max_body_size = max_body_size
+        self.max_chunk_size = max_chunk_size
+        # Request head limits, exceeding them is answered with 414 or 431
+        self.max_request_line = max_request_line
+        self.max_header_count = max_header_count
+        self.max_header_size = max_header_size
+        self.max_header_bytes = max_header_bytes
+        # Runs the sync handlers of run_in="threadpool" routes
+        self.handler_pool: HandlerPool = handler_pool or HandlerPool()
+        self.transport = transport
+        self.reuse_port = reuse_port
+        self.overload_policy = overload_policy
+        self.retry_after = retry_after
+        # Compresses responses on the fly when set, see compression.Compressor
+        self.compressor = compressor
+        # Request head parser, see parser.PARSERS
+        self.parser = create_parser(parser)
+        self.active_conns = 0
+        self.idle_conns = 0
+        self.rejected_conns = 0
+        self._accepting_paused = False
+        # Formatted once, a connection flood should not cost a response serialization
+        # each, see _overload_response()
+        self._overload_parts: tuple = HttpResponse(
+            status_code=503,
+            body=HTTP_STATUS_CODES[503],
+            content_type="text/plain",
+            headers={"Retry-After": str(retry_after), "Connection": "close"},
+        ).format_parts()
+        self._timeout_parts: tuple = HttpResponse(
+            status_code=408,
+            body=HTTP_STATUS_CODES[408],
+            content_type="text/plain",
+        ).format_parts()
+        # One shared reaper for every connection instead of a timer per request
+        self._timer_wheel = TimerWheel()
+        # Listening servers, pausing closes them and keeps their sockets listening
+        # in _paused_sockets until a new server takes them over
+        self._servers = []
+        self._paused_sockets = []
         self._shutdown_event = asyncio.Event()
         self.logger = logger
 
     async def _handle_client(self, reader, writer):
+        if not self._admit_connection():
+            await self._reject_connection(reader, writer)
+            return
         try:
             await self._process_request(reader, writer)
         except Exception as e:
             self.log("error", f"{e}")
         finally:
+            self._release_connection()
             if not writer.is_closing():
                 writer.close()
                 await writer.wait_closed()
 
+    async def _reject_connection(self, reader, writer):
+        # Closing with the request unread makes the kernel reset the connection,
+        # which can discard the 503 before the client reads it. The write side is
+        # shut down instead and the request drained until the client closes.
+        linger = TimeoutEntry(writer.close)
+        self._timer_wheel.schedule(linger, REJECT_LINGER, "linger")
+        try:
+            writer.write(self._overload_response())
+            if writer.can_write_eof():
+                writer.write_eof()
+            await writer.drain()
+            drained = 0
+            while drained <= self.max_header_bytes:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                drained += len(data)
+        except OSError:
+            pass
+        finally:
+            self._timer_wheel.cancel(linger)
+            writer.close()
+
     async def _process_request(self, reader, writer):
         try:
             await self._handle_request_logic(reader, writer)
@@ -63,36 +206,61 @@ class HttpServer:
 
     async def _handle_request_logic(self, reader, writer):
         # HttpErrors are NOT handled correctly outside of this method
+        # Formatted responses not yet written, flushed together with writelines
+        pending = []
+        timeout = TimeoutEntry(
+            lambda: self._on_stream_timeout(timeout, writer, pending)
+        )
+        try:
+            await self._read_requests(
+                ConnectionReader(reader, self), writer, timeout, pending
+            )
+            await self._flush_responses(writer, pending)
+        finally:
+            self._timer_wheel.cancel(timeout)
+
+    async def _read_requests(self, reader, writer, timeout, pending):
+        idle = False
+        pending_size = 0
         while True:
             # Handle request reading
-            try:
-                headers_data = await asyncio.wait_for(
-                    reader.readuntil(b"\r\n\r\n"), timeout=self.keep_alive_timeout
-                )
-            except asyncio.TimeoutError:
-                response = HttpResponse(
-                    status_code=408,
-                    body=HTTP_STATUS_CODES[408],
-                    content_type="text/plain",
-                )
-                await self._send_response(writer, response)
+            if idle and self._shutdown_event.is_set():
+                # Connections are not kept alive through a shutdown
                 break
-            except asyncio.IncompleteReadError:
+            try:
+                if idle:
+                    self.idle_conns += 1
+                    self._timer_wheel.schedule(timeout, self.keep_alive_timeout, "idle")
+                    headers_data = await reader.read_head(
+                        partial(self._end_idle, timeout)
+                    )
+                else:
+                    self._timer_wheel.schedule(timeout, self.header_timeout, "header")
+                    headers_data = await reader.read_head()
+            except asyncio.IncompleteReadError as e:
+                # Reaped by the timer wheel, or the client closed between requests
+                if timeout.expired or not e.partial:
+                    break
                 response = HttpResponse(
                     status_code=400,
                     body=HTTP_STATUS_CODES[400],
                     content_type="text/plain",
                 )
-                await self._send_response(writer, response)
+                pending.append(self._format_response(response))
                 break
-            except asyncio.LimitOverrunError:
+            except HttpError as e:
+                # The head broke a limit while it was arriving
                 response = HttpResponse(
-                    status_code=413,
-                    body=HTTP_STATUS_CODES[413],
-                    content_type="text/plain",
+                    status_code=e.status_code, body=e.message, content_type="text/plain"
                 )
-                await self._send_response(writer, response)
+                pending.append(self._format_response(response))
                 break
+            finally:
+                if idle:
+                    if timeout.phase == "idle":
+                        # Closed or reaped before the next head started
+                        self.idle_conns -= 1
+                    idle = False
 
             if not headers_data:
                 break
@@ -101,167 +269,542 @@ class HttpServer:
                 # TODO: Handle http_versions and keep alive better
                 request_line, headers = self._parse_headers(headers_data)
                 method, path, http_version = request_line
+            except HttpError as e:
+                response = HttpResponse(
+                    status_code=e.status_code, body=e.message, content_type="text/plain"
+                )
+                pending.append(self._format_response(response))
+                break
             except Exception as e:
                 response = HttpResponse(
                     status_code=400,
                     body=HTTP_STATUS_CODES[400],
                     content_type="text/plain",
                 )
-                await self._send_response(writer, response)
+                pending.append(self._format_response(response))
                 self.log("error", f"Error parsing headers: {e}")
                 break
 
             # TODO: Break this into specific HTTP version handling
             # TODO: Ensure proper host header
 
-            # TODO: Handle Transfer-Encoding
-            transfer_encoding = headers.get("Transfer-Encoding", "").lower()
-            if "chunked" in transfer_encoding:
-                response = HttpResponse(status_code=501, body="Not Implemented")
-                await self._send_response(writer, response)
+            try:
+                chunked, content_length = self._parse_body_framing(headers)
+            except HttpError as e:
+                response = HttpResponse(
+                    status_code=e.status_code, body=e.message, content_type="text/plain"
+                )
+                pending.append(self._format_response(response))
                 break
 
-            content_length = int(headers.get("Content-Length", 0))
             body = b""
-            if content_length > 0:
-                try:
-                    body = await asyncio.wait_for(
-                        reader.readexactly(content_length),
-                        timeout=self.keep_alive_timeout,
-                    )
-                except asyncio.TimeoutError:
-                    response = HttpResponse(
-                        status_code=408,
-                        body=HTTP_STATUS_CODES[408],
-                        content_type="text/plain",
+            if chunked or content_length > self.buffer_size:
+                # Read before the handler runs, or as it asks for it if the route
+                # streams the body, see _handle_request()
+                if chunked:
+                    chunks = read_chunked(
+                        reader, self.max_chunk_size, self.max_body_size
                     )
-                    await self._send_response(writer, response)
-                    break
+                else:
+                    chunks = read_length(reader, content_length)
+                body = self._stream_body(chunks, headers, writer, timeout)
+                # Earlier responses must go out before a possible 100 Continue
+                await self._flush_responses(writer, pending)
+            elif content_length > 0:
+                if self._expects_continue(headers):
+                    await self._flush_responses(writer, pending)
+                    writer.write(CONTINUE_RESPONSE)
+                self._timer_wheel.schedule(timeout, self.body_timeout, "body")
+                try:
+                    body = await reader.readexactly(content_length)
                 except Exception as e:
+                    if timeout.expired:
+                        break
                     response = HttpResponse(
                         status_code=400,
                         body=HTTP_STATUS_CODES[400],
                         content_type="text/plain",
                     )
-                    await self._send_response(writer, response)
+                    pending.append(self._format_response(response))
                     self.log("error", f"Error reading body: {e}")
                     break
 
-            try:
-                request: HttpRequest = self.request_factory.create(
-                    method, path, headers, body
+            # Handlers may take as long as they need
+            self._timer_wheel.cancel(timeout)
+
+            handling = self._handle_request(method, path, http_version, headers, body)
+            if pending:
+                handling = FlushOnSuspend(
+                    handling, partial(self._write_responses, writer, pending)
                 )
-                # self.log("info", f"[REQUEST] {request}")
-                try:
-                    handler, path_params, is_async = self.router.get_handler(
-                        method, path
-                    )
-                except MethodNotAllowedError:
-                    if hasattr(self.router, "get_allowed_methods"):
-                        allowed_methods = self.router.get_allowed_methods(path)
-                    else:
-                        allowed_methods = []
-                    response = HttpResponse(
-                        status_code=405,
-                        body=HTTP_STATUS_CODES[405],
-                        content_type="text/plain",
-                        headers={"Allow": ", ".join(allowed_methods)},
-                    )
-                    await self._send_response(writer, response)
+            response, keep_alive = await handling
+            if not pending:
+                pending_size = 0
+            if timeout.expired:
+                # The reaper already answered 408 while the handler read the body
+                break
+            if isinstance(response, StreamingResponse):
+                await self._flush_responses(writer, pending)
+                pending_size = 0
+                reusable = await self._send_streaming(
+                    writer, response, method, http_version
+                )
+                if not (keep_alive and reusable):
                     break
+                idle = True
+                continue
+            buffer = self._format_response(response)
+            pending.append(buffer)
 
-                # Handle OPTIONS and HEAD requests
-                if method == "OPTIONS":
-                    response = HttpResponse(status_code=204, body="")
-                    response.set_header(
-                        "Allow", ", ".join(self.router.get_allowed_methods(path))
-                    )
-                elif method == "HEAD":
-                    response = await handler(request, **path_params)
-                    response.body = b""
-                elif request.method == "CONNECT":
-                    response = HttpResponse(
-                        status_code=501,
-                        body=HTTP_STATUS_CODES[501],
-                        content_type="text/plain",
-                    )
-                else:
-                    if is_async:
-                        response = await handler(request, **path_params)
-                    else:
-                        response = handler(request, **path_params)
+            if not keep_alive:
+                break
+            # Pipelined requests already buffered are answered in the same write
+            pending_size += len(buffer)
+            if pending_size >= PIPELINE_FLUSH_SIZE or not reader.head_buffered():
+                await self._flush_responses(writer, pending)
+                pending_size = 0
+            idle = True
 
-            except HttpError as e:
-                # Handles web exceptions raised by route handler
+    def _end_idle(self, timeout):
+        # The next head started arriving, it has header_timeout to complete
+        self.idle_conns -= 1
+        self._timer_wheel.schedule(timeout, self.header_timeout, "header")
+
+    def _timeout_response(self) -> bytes:
+        return join_response(*self._timeout_parts)
+
+    def _on_stream_timeout(self, timeout, writer, pending):
+        # Closing the transport feeds EOF to the reader, which ends the read loop
+        if timeout.phase != "idle":
+            pending.append(self._timeout_response())
+        self._write_responses(writer, pending)
+        writer.close()
+
+    @staticmethod
+    def _write_responses(writer, pending):
+        if len(pending) == 1:
+            writer.write(pending[0])
+        elif pending:
+            # The list is reused for the next batch, hand the writer a copy
+            writer.writelines(pending.copy())
+        pending.clear()
+
+    async def _flush_responses(self, writer, pending):
+        if pending:
+            self._write_responses(writer, pending)
+            await writer.drain()
+
+    async def _handle_request(self, method, path, http_version, headers, body):
+        """
+        Routes a parsed request to its handler and builds the response.
+
+        Shared by every transport so that routing, error handling and keep-alive
+        rules stay identical regardless of how the bytes were read.
+
+        Returns:
+            tuple: (response, keep_alive) where keep_alive tells the transport
+            whether the connection may serve another request.
+        """
+        request = None
+        try:
+            request: HttpRequest = self.request_factory.create(
+                method, path, headers, body
+            )
+            # self.log("info", f"[REQUEST] {request}")
+            try:
+                handler, path_params, is_async = self.router.get_handler(method, path)
+            except MethodNotAllowedError as e:
+                if e.response is not None:
+                    # Preformatted by the router along with its Allow header
+                    return e.response, False
+                if hasattr(self.router, "get_allowed_methods"):
+                    allowed_methods = self.router.get_allowed_methods(path)
+                else:
+                    allowed_methods = []
                 response = HttpResponse(
-                    status_code=e.status_code, body=e.message, content_type="text/plain"
+                    status_code=405,
+                    body=HTTP_STATUS_CODES[405],
+                    content_type="text/plain",
+                    headers={"Allow": ", ".join(allowed_methods)},
                 )
-                self.log("warning", f"[RESPONSE][HTTP-ERROR] {e}")
-            except Exception as e:
-                # Handles all other exceptions
-                # TODO: Return exception details only in debug mode
+                return response, False
+
+            if isinstance(body, RequestBody) and not self._streams_body(method, path):
+                # Handlers get the whole body unless their route streams it
+                await request.read()
+
+            # OPTIONS is answered by the router (a 204 with Allow, unless the
+            # route has its own handler), HEAD runs the GET handler
+            if method == "HEAD":
+                response = await self._call_handler(
+                    handler, is_async, request, path_params
+                )
+                if not isinstance(response, HttpResponse):
+                    response = HttpResponse(body=response)
+                response = self._evaluate_conditional(request.headers, response)
+                if self.compressor is not None:
+                    # Content-Encoding, Vary and the length must match the GET
+                    # response's
+                    response = await self.compressor.compress(
+                        response, request.headers.get("Accept-Encoding")
+                    )
+                # Dropped without being serialized
+                response = response.for_head()
+            elif request.method == "CONNECT":
                 response = HttpResponse(
-                    status_code=500,
-                    body=HTTP_STATUS_CODES[500],
+                    status_code=501,
+                    body=HTTP_STATUS_CODES[501],
                     content_type="text/plain",
                 )
-                self.log("error", f"[RESPONSE][ERROR] {e}")
+            else:
+                # _call_handler() inlined, this is every request's path
+                if is_async:
+                    response = await handler(request, **path_params)
+                elif type(handler) is ThreadedHandler:
+                    response = await self.handler_pool.run(
+                        handler.handler, request, **path_params
+                    )
+                else:
+                    response = handler(request, **path_params)
+                if not isinstance(response, HttpResponse):
+                    # Plain return values are conditional and compressed too
+                    response = HttpResponse(body=response)
+                if method == "GET":
+                    response = self._evaluate_conditional(request.headers, response)
+                    response = self._evaluate_range(request.headers, response)
 
-            await self._send_response(writer=writer, response=response)
+        except HttpError as e:
+            # Handles web exceptions raised by route handler
+            response = HttpResponse(
+                status_code=e.status_code, body=e.message, content_type="text/plain"
+            )
+            self.log("warning", f"[RESPONSE][HTTP-ERROR] {e}")
+        except Exception as e:
+            # Handles all other exceptions
+            # TODO: Return exception details only in debug mode
+            response = HttpResponse(
+                status_code=500,
+                body=HTTP_STATUS_CODES[500],
+                content_type="text/plain",
+            )
+            self.log("error", f"[RESPONSE][ERROR] {e}")
 
-            # Handle keep-alive
-            if http_version == "HTTP/1.1":
-                if (
-                    "Connection" in request.headers
-                    and request.headers["Connection"].lower() == "close"
-                ):
-                    break
+        request_headers = request.headers if request is not None else headers
+        if self.compressor is not None and method != "HEAD":
+            response = await self.compressor.compress(
+                response, request_headers.get("Accept-Encoding")
+            )
+        keep_alive = self._should_keep_alive(http_version, request_headers)
+        if isinstance(body, RequestBody) and not body.complete:
+            # Unread body bytes are still on the wire, the connection can't be reused
+            keep_alive = False
+        return response, keep_alive
+
+    async def _call_handler(self, handler, is_async, request, path_params):
+        if is_async:
+            return await handler(request, **path_params)
+        if type(handler) is ThreadedHandler:
+            return await self.handler_pool.run(handler.handler, request, **path_params)
+        return handler(request, **path_params)
+
+    @staticmethod
+    def _evaluate_conditional(headers, response):
+        """
+        Swaps a 200 response for a bodiless 304 if the client's copy is current.
+
+        Runs before the response body is serialized or read from disk, so a
+        not-modified response costs neither.
+        """
+        if (
+            isinstance(response, HttpResponse)
+            and response.status_code == 200
+            and ("If-None-Match" in headers or "If-Modified-Since" in headers)
+            and response.is_not_modified(headers)
+        ):
+            return response.not_modified()
+        return response
+
+    @staticmethod
+    def _evaluate_range(headers, response):
+        """
+        Narrows a 200 response to the byte ranges the client asked for.
+
+        Only responses that can serve ranges without producing the full body
+        (files) take part. A failing If-Range means the client's partial copy is
+        stale, so the full response is sent instead.
+        """
+        range_header = headers.get("Range")
+        if (
+            range_header is None
+            or not getattr(response, "accept_ranges", False)
+            or response.status_code != 200
+        ):
+            return response
+        if_range = headers.get("If-Range")
+        if if_range is not None and not response.if_range_matches(if_range):
+            return response
+        return response.with_range(range_header)
+
+    def _streams_body(self, method, path) -> bool:
+        streams_body = getattr(self.router, "streams_body", None)
+        return streams_body is not None and streams_body(method, path)
+
+    def _stream_body(self, chunks, headers, writer, timeout) -> RequestBody:
+        on_first_read = None
+        if self._expects_continue(headers):
+            on_first_read = lambda: writer.write(CONTINUE_RESPONSE)
+        return RequestBody(
+            chunks, self._timer_wheel, timeout, self.body_timeout, on_first_read
+        )
+
+    @staticmethod
+    def _expects_continue(headers) -> bool:
+        return headers.get("Expect", "").lower() == "100-continue"
+
+    def _parse_body_framing(self, headers) -> tuple:
+        """
+        Works out how the request body is delimited.
+
+        Args:
+            headers (Headers): The parsed request headers.
+
+        Returns:
+            tuple: (chunked, content_length), content_length is 0 for chunked bodies.
+
+        Raises:
+            BadRequestError: If the framing headers are invalid or conflicting.
+            PayloadTooLargeError: If Content-Length exceeds max_body_size.
+            HttpError: 501 for transfer codings other than chunked.
+        """
+        transfer_encodings = headers.getall("Transfer-Encoding")
+        if transfer_encodings:
+            # Repeated Transfer-Encoding lines are one comma separated list
+            codings = [
+                c.strip() for c in ",".join(transfer_encodings).lower().split(",")
+            ]
+            if codings[-1] != "chunked":
+                raise BadRequestError()
+            if len(codings) > 1:
+                raise HttpError(status_code=501)
+            if "Content-Length" in headers:
+                # Both framings at once is a request smuggling vector, refuse it
+                raise BadRequestError()
+            return True, 0
+
+        content_lengths = headers.getall("Content-Length")
+        if len(set(content_lengths)) > 1:
+            # Framing the body two ways is a request smuggling vector, refuse it
+            raise BadRequestError()
+        content_length = content_lengths[0].strip() if content_lengths else "0"
+        if not (content_length.isascii() and content_length.isdigit()):
+            raise BadRequestError()
+        content_length = int(content_length)
+        if content_length > self.max_body_size:
+            # Rejected before a single body byte is read
+            raise PayloadTooLargeError()
+        return False, content_length
+
+    def _should_keep_alive(self, http_version, headers) -> bool:
+        connection = headers.get("Connection")
+        if http_version == "HTTP/1.1":
+            return connection is None or connection.lower() != "close"
+        # HTTP/1.0 or earlier
+        return connection is not None and connection.lower() == "keep-alive"
+
+    def get_thread_pool_stats(self) -> dict:
+        """
+        Returns the counters of the pool running threaded sync handlers, see
+        HandlerPool.get_stats().
+        """
+        return self.handler_pool.get_stats()
+
+    ### Admission control ###
+
+    def _overload_response(self) -> bytes:
+        return join_response(*self._overload_parts)
+
+    def _admit_connection(self) -> bool:
+        """
+        Registers a new connection, returns False if it must be turned away.
+        """
+        if self.active_conns >= self.max_conns:
+            self.rejected_conns += 1
+            return False
+        self.active_conns += 1
+        if self.overload_policy == "pause" and self.active_conns >= self.max_conns:
+            self._pause_accepting()
+        return True
+
+    def _release_connection(self) -> None:
+        self.active_conns -= 1
+        if self._accepting_paused and self.active_conns < self.max_conns:
+            self._resume_accepting()
+
+    def _pause_accepting(self) -> None:
+        # A listening socket duplicated before its server closes keeps listening,
+        # new connections wait in the kernel backlog until a server accepts again
+        if not self._servers or self._accepting_paused:
+            return
+        try:
+            sockets = [
+                socket.fromfd(sock.fileno(), sock.family, sock.type, sock.proto)
+                for server in self._servers
+                for sock in server.sockets
+            ]
+        except OSError as e:
+            self.log("warning", f"Cannot pause accepting, rejecting instead: {e}")
+            return
+        for server in self._servers:
+            server.close()
+        self._servers = []
+        self._paused_sockets.extend(sockets)
+        self._accepting_paused = True
+
+    def _resume_accepting(self) -> None:
+        self._accepting_paused = False
+        sockets, self._paused_sockets = self._paused_sockets, []
+        if sockets:
+            asyncio.ensure_future(self._serve_sockets(sockets))
+
+    async def _serve_sockets(self, sockets) -> None:
+        for sock in sockets:
+            if self._shutdown_event.is_set():
+                sock.close()
+            elif self._accepting_paused:
+                # Paused again before this socket was served
+                self._paused_sockets.append(sock)
             else:
-                # HTTP/1.0 or earlier
-                if (
-                    "Connection" not in request.headers
-                    or request.headers["Connection"].lower() != "keep-alive"
-                ):
-                    break
+                self._servers.append(await self._create_server(sock=sock))
+
+    async def _create_server(self, **kwargs):
+        if self.transport == "protocol":
+            loop = asyncio.get_running_loop()
+            return await loop.create_server(lambda: HttpProtocol(self), **kwargs)
+        # The StreamReader stops reading from the socket while this many bytes
+        # are buffered, head limits are checked by ConnectionReader
+        return await asyncio.start_server(
+            self._handle_client, limit=self.max_header_bytes, **kwargs
+        )
+
+    def get_connection_stats(self) -> dict:
+        """
+        Returns live connection counters.
+
+        Returns:
+            dict: active (open connections), idle (keep-alive connections waiting
+            for their next request), rejected (connections turned away since
+            startup), max_conns and accepting (False while accepting is paused).
+        """
+        return {
+            "active": self.active_conns,
+            "idle": self.idle_conns,
+            "rejected": self.rejected_conns,
+            "max_conns": self.max_conns,
+            "accepting": not self._accepting_paused,
+        }
 
     def _parse_headers(self, headers_data):
+        self._check_head_limits(headers_data)
         try:
-            headers_text = headers_data.decode("iso-8859-1")
-            header_lines = headers_text.split("\r\n")
-            request_line = header_lines[0]
-            method, path, http_version = request_line.strip().split(" ", 2)
-            headers = {}
-            for line in header_lines[1:]:
-                if line == "":
-                    continue
-                key, value = line.split(":", 1)
-                headers[key.strip()] = value.strip()
-            return (method, path, http_version), headers
+            return self.parser.parse(headers_data)
         except Exception as e:
             raise ValueError(f"Invalid headers: {e}")
 
+    def _check_head_limits(self, headers_data) -> None:
+        """
+        Enforces the request line and header limits on a complete request head.
+
+        Args:
+            headers_data (bytes): The head, ending with the blank line.
+
+        Raises:
+            UriTooLongError: If the request line is longer than max_request_line.
+            RequestHeaderFieldsTooLargeError: If the head is larger than
+                max_header_bytes, has more than max_header_count headers or a
+                header line longer than max_header_size.
+        """
+        size = len(headers_data)
+        line_end = headers_data.find(b"\r\n")
+        if line_end > self.max_request_line:
+            raise UriTooLongError()
+        if size > self.max_header_bytes:
+            raise RequestHeaderFieldsTooLargeError()
+        # Lines are only counted and measured in heads big enough to break a
+        # limit, a header line takes at least 4 bytes ("a:" and CRLF)
+        headers_size = size - line_end
+        if (
+            headers_size > 4 * self.max_header_count
+            and headers_data.count(b"\r\n", line_end) - 2 > self.max_header_count
+        ):
+            raise RequestHeaderFieldsTooLargeError()
+        if headers_size > self.max_header_size and any(
+            len(line) > self.max_header_size
+            for line in headers_data[line_end:].split(b"\r\n")
+        ):
+            raise RequestHeaderFieldsTooLargeError()
+
     async def _send_response(self, writer, response):
+        writer.write(self._format_response(response))
+        await writer.drain()
+
+    async def _send_streaming(self, writer, response, method, http_version) -> bool:
+        """
+        Writes a StreamingResponse (or FileResponse), draining the writer as it goes.
+
+        Returns:
+            bool: False if the connection can't be reused, because the body was
+            delimited by closing it (HTTP/1.0 has no chunked encoding) or a file
+            shrank below its announced Content-Length.
+        """
+        return await response.write_to(
+            writer,
+            chunked=http_version != "HTTP/1.0",
+            send_body=method != "HEAD",
+        )
+
+    def _format_response(self, response) -> bytes:
         if not isinstance(response, HttpResponse):
             response = HttpResponse(body=response)
 
         # TODO: Add interceptor component here
 
-        buffer = response.format_response()
-        writer.write(buffer)
-        await writer.drain()
+        return response.format_response()
 
     async def start(self):
         # Handles server startup
-        self._server = await asyncio.start_server(
-            self._handle_client, self.host, self.port
+        if hasattr(self.router, "compile"):
+            # Build the lookup tables before the first request instead of during it
+            self.router.compile()
+        self._timer_wheel.start()
+        self._servers.append(
+            await self._create_server(
+                host=self.host, port=self.port, reuse_port=self.reuse_port
+            )
         )
-        async with self._server:
+        try:
             await self._shutdown_event.wait()
+        finally:
+            await self._close_servers()
 
     async def stop(self):
-        if self._server:
-            self._server.close()
-            await self._server.wait_closed()
+        self._shutdown_event.set()
+        # Server.wait_closed() waits for every connection on Python 3.12+, idle
+        # keep-alive connections are closed now instead of when they time out and
+        # the reaper keeps timing the ones still busy until they are done
+        self._timer_wheel.expire_phase("idle")
+        await self._close_servers()
+        self._timer_wheel.stop()
+        self.handler_pool.shutdown()
+
+    async def _close_servers(self) -> None:
+        servers, self._servers = self._servers, []
+        sockets, self._paused_sockets = self._paused_sockets, []
+        for sock in sockets:
+            sock.close()
+        for server in servers:
+            server.close()
+        for server in servers:
+            await server.wait_closed()
 
     async def run(self, *args, **kwargs):
         try:
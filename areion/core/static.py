@@ -0,0 +1,430 @@
+"""
+In-memory cache for static files.
+
+Small files are kept as pre-formatted response bytes (and the matching 304), so a
+hot asset is answered without touching the disk or formatting headers, only the
+Date header is added when it is sent. Entries are
+revalidated against the file's mtime and size at most once per check interval.
+Files too large to keep in memory only have their stat cached and are sent with
+FileResponse. Precompressed .br/.gz siblings are negotiated against Accept-Encoding.
+"""
+
+import asyncio
+import mimetypes
+import os
+import stat
+import time
+from collections import OrderedDict
+
+from .compression import negotiate_encoding
+from .ranges import Multipart, content_range, parse_range
+from .response import (
+    HttpResponse,
+    FileResponse,
+    ContentType,
+    HTTP_STATUS_CODES,
+    file_etag,
+    http_date,
+    join_response,
+)
+
+# Precompressed siblings looked up next to every file, most preferred first
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+class PartialResponse(HttpResponse):
+    """
+    A 206 or 416 built from a cached file, its ranges are offsets into the stored
+    bytes and must not be compressed.
+    """
+
+    __slots__ = ()
+
+    compressible = False
+
+
+class CachedResponse(HttpResponse):
+    """
+    Response backed by bytes formatted once when the file was cached.
+
+    Attributes:
+        line (bytes): The formatted response line.
+        head (bytes): The formatted headers following Date.
+    """
+
+    __slots__ = ("line", "head", "_body", "_not_modified")
+
+    accept_ranges = True
+    # Already formatted, compressed variants come from precompressed siblings
+    compressible = False
+
+    def __init__(
+        self,
+        line: bytes,
+        head: bytes,
+        body: bytes,
+        headers: dict,
+        status_code: int = 200,
+        not_modified: tuple = None,
+    ):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers.copy()
+        self.content_type = headers.get("Content-Type")
+        self.etag = False
+        self._formatted = None
+        self.line = line
+        self.head = head
+        self._body = body
+        # (line, head, headers) of the matching 304
+        self._not_modified = not_modified
+
+    def format_response(self) -> bytes:
+        """
+        Joins the cached bytes, just the head if the body was cleared for HEAD.
+
+        Returns:
+            bytes: The formatted HTTP response.
+        """
+        if self.body is self._body:
+            return join_response(self.line, self.head, self._body)
+        return join_response(self.line, self.head)
+
+    def for_head(self) -> HttpResponse:
+        """
+        Clears the body so only the cached head, with its Content-Length, is sent.
+
+        Returns:
+            HttpResponse: This response.
+        """
+        self.body = b""
+        return self
+
+    def with_range(self, range_header: str) -> HttpResponse:
+        """
+        Returns a 206 (or 416) response with the byte ranges of a Range header.
+
+        Args:
+            range_header (str): The request's Range header.
+
+        Returns:
+            PartialResponse: The partial response, or this response if the header
+            must be ignored.
+        """
+        body = self._body
+        size = len(body)
+        ranges = parse_range(range_header, size)
+        if ranges is None:
+            return self
+
+        headers = {
+            name: self.headers[name]
+            for name in (
+                "ETag",
+                "Last-Modified",
+                "Accept-Ranges",
+                "Content-Encoding",
+                "Vary",
+            )
+            if name in self.headers
+        }
+        if not ranges:
+            headers["Content-Range"] = f"bytes */{size}"
+            return PartialResponse(
+                status_code=416,
+                body=HTTP_STATUS_CODES[416],
+                content_type="text/plain",
+                headers=headers,
+            )
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            headers["Content-Range"] = content_range(start, end, size)
+            return PartialResponse(
+                status_code=206,
+                body=body[start : end + 1],
+                content_type=self.content_type,
+                headers=headers,
+            )
+        multipart = Multipart(ranges, size, self.content_type)
+        return PartialResponse(
+            status_code=206,
+            body=multipart.join(body),
+            content_type=multipart.content_type,
+            headers=headers,
+        )
+
+    def not_modified(self) -> HttpResponse:
+        """
+        Returns the 304 for this file, also formatted when the file was cached.
+
+        Returns:
+            HttpResponse: The 304 response.
+        """
+        line, head, headers = self._not_modified
+        return CachedResponse(line, head, b"", headers, status_code=304)
+
+    def __repr__(self):
+        return f"<CachedResponse status_code={self.status_code} content_type={self.content_type} headers={self.headers}>"
+
+
+class _CacheEntry:
+    __slots__ = (
+        "path",
+        "stat_result",
+        "content_type",
+        "encoding",
+        "vary",
+        "variants",
+        "line",
+        "head",
+        "body",
+        "headers",
+        "not_modified",
+        "size",
+        "footprint",
+        "checked_at",
+    )
+
+    def __init__(self, path, stat_result, content_type, encoding=None, vary=False):
+        self.path = path
+        self.stat_result = stat_result
+        self.content_type = content_type
+        # Content-Encoding of a precompressed variant, None for the file itself
+        self.encoding = encoding
+        self.vary = vary
+        # Precompressed siblings by coding, only set on the file's own entry
+        self.variants = {}
+        self.line = None
+        self.head = None
+        self.body = None
+        self.headers = None
+        self.not_modified = None
+        # Bytes held in memory, counted against max_bytes
+        self.size = 0
+        # size plus the variants' sizes, as accounted when the entry was stored
+        self.footprint = 0
+        self.checked_at = None
+
+    def matches(self, stat_result) -> bool:
+        cached = self.stat_result
+        return (
+            cached.st_mtime_ns == stat_result.st_mtime_ns
+            and cached.st_size == stat_result.st_size
+            and cached.st_ino == stat_result.st_ino
+        )
+
+    def extra_headers(self) -> dict:
+        headers = {}
+        if self.encoding is not None:
+            headers["Content-Encoding"] = self.encoding
+        if self.vary:
+            headers["Vary"] = "Accept-Encoding"
+        return headers
+
+    def response(self):
+        if self.body is None:
+            return FileResponse(
+                self.path,
+                content_type=self.content_type,
+                headers=self.extra_headers(),
+                stat_result=self.stat_result,
+            )
+        return CachedResponse(
+            self.line,
+            self.head,
+            self.body,
+            self.headers,
+            not_modified=self.not_modified,
+        )
+
+
+class StaticFileCache:
+    """
+    LRU cache of static file responses, bounded by entry count and total bytes.
+
+    Precompressed siblings of a file (file.br, file.gz) are looked up along with
+    it and sent to clients that accept their coding, with Vary: Accept-Encoding.
+    Their existence is cached and revalidated together with the file, so the
+    lookup costs no extra syscalls on a hit.
+
+    Attributes:
+        max_entries (int): Most files kept in the cache, a file's precompressed
+            variants share its entry.
+        max_bytes (int): Most bytes of file data and headers kept in memory.
+        max_file_size (int): Largest file whose content is cached, bigger files only
+            have their stat cached and are streamed from disk.
+        stat_interval (float): Seconds a cached entry is served without checking
+            the file on disk.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 2**24,
+        max_file_size: int = 2**20,
+        stat_interval: float = 1.0,
+    ):
+        if not isinstance(max_entries, int) or max_entries <= 0:
+            raise ValueError("Max entries must be a positive integer.")
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError("Max bytes must be a positive integer.")
+        if not isinstance(max_file_size, int) or max_file_size < 0:
+            raise ValueError("Max file size must be a non-negative integer.")
+        if not isinstance(stat_interval, (int, float)) or stat_interval < 0:
+            raise ValueError("Stat interval must be a non-negative number.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_file_size = min(max_file_size, max_bytes)
+        self.stat_interval = stat_interval
+        self.size = 0
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, path: str, accept_encoding: str = None):
+        """
+        Gets the response for a static file, loading it on a miss.
+
+        Disk access (stat and read) runs in the default executor so a slow disk
+        can't stall the event loop.
+
+        Args:
+            path (str): Path of the file.
+            accept_encoding (str, optional): The request's Accept-Encoding header,
+                picks a precompressed variant if there is an acceptable one.
+
+        Returns:
+            HttpResponse | None: A CachedResponse or FileResponse, None if the path
+            is not a regular file.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(path)
+        if entry is not None and now - entry.checked_at < self.stat_interval:
+            self._entries.move_to_end(path)
+        else:
+            entry = await self._revalidate(path, entry, now)
+            if entry is None:
+                return None
+
+        variants = entry.variants
+        if variants and accept_encoding:
+            encoding = negotiate_encoding(accept_encoding, variants)
+            if encoding is not None:
+                return variants[encoding].response()
+        return entry.response()
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drops a file and its precompressed variants from the cache.
+        """
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.size -= entry.footprint
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    async def _revalidate(self, path: str, entry: _CacheEntry, now: float):
+        loop = asyncio.get_running_loop()
+        paths = [path] + [path + suffix for _, suffix in PRECOMPRESSED]
+        stats = await loop.run_in_executor(None, _stat_files, paths)
+        if stats[0] is None:
+            self.invalidate(path)
+            return None
+
+        if entry is None:
+            content_type, _ = mimetypes.guess_type(path)
+            content_type = content_type or ContentType.OCTET_STREAM
+            old_variants = {}
+        else:
+            content_type = entry.content_type
+            old_variants = entry.variants
+
+        variants = {}
+        for (encoding, suffix), stat_result in zip(PRECOMPRESSED, stats[1:]):
+            if stat_result is None:
+                continue
+            variant = old_variants.get(encoding)
+            if variant is None or not variant.matches(stat_result):
+                variant = await self._load(
+                    path + suffix, stat_result, content_type, encoding, vary=True
+                )
+            if variant is not None:
+                variants[encoding] = variant
+
+        vary = bool(variants)
+        if entry is None or not entry.matches(stats[0]):
+            entry = await self._load(path, stats[0], content_type, vary=vary)
+            if entry is None:
+                self.invalidate(path)
+                return None
+        elif entry.vary != vary:
+            entry.vary = vary
+            if entry.body is not None:
+                self._fill(entry, entry.body)
+        entry.variants = variants
+        entry.checked_at = now
+        self._store(entry)
+        return entry
+
+    async def _load(self, path, stat_result, content_type, encoding=None, vary=False):
+        entry = _CacheEntry(path, stat_result, content_type, encoding, vary)
+        if stat_result.st_size <= self.max_file_size:
+            loop = asyncio.get_running_loop()
+            try:
+                body = await loop.run_in_executor(None, _read_file, path)
+            except OSError:
+                return None
+            self._fill(entry, body)
+        return entry
+
+    def _fill(self, entry: _CacheEntry, body: bytes) -> None:
+        stat_result = entry.stat_result
+        headers = {
+            "ETag": file_etag(stat_result),
+            "Last-Modified": http_date(stat_result.st_mtime),
+            "Accept-Ranges": "bytes",
+        }
+        headers.update(entry.extra_headers())
+        response = HttpResponse(
+            body=body, content_type=entry.content_type, headers=headers
+        )
+        entry.line, entry.head, entry.body = response.format_parts()
+        entry.headers = response.headers
+        not_modified = response.not_modified()
+        line, head, _ = not_modified.format_parts()
+        entry.not_modified = (line, head, not_modified.headers)
+        entry.size = len(entry.line) + len(entry.head) + len(body)
+
+    def _store(self, entry: _CacheEntry) -> None:
+        self.invalidate(entry.path)
+        entry.footprint = entry.size + sum(
+            variant.size for variant in entry.variants.values()
+        )
+        self._entries[entry.path] = entry
+        self.size += entry.footprint
+        entries = self._entries
+        while len(entries) > self.max_entries or self.size > self.max_bytes:
+            _, evicted = entries.popitem(last=False)
+            self.size -= evicted.footprint
+
+
+def _stat_files(paths: list) -> list:
+    # One executor round trip for a file and all its variants
+    stats = []
+    for path in paths:
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            stat_result = None
+        if stat_result is not None and not stat.S_ISREG(stat_result.st_mode):
+            stat_result = None
+        stats.append(stat_result)
+    return stats
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
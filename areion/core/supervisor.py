@@ -0,0 +1,149 @@
+"""
+Pre-fork worker supervisor.
+
+Used by AreionServer when more than one worker is configured. Every worker binds
+the same host/port with SO_REUSEPORT so the kernel spreads incoming connections
+across processes.
+"""
+
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import wait
+
+
+class WorkerSupervisor:
+    """
+    Starts worker processes running the same target and keeps them alive.
+
+    Crashed workers are restarted, and SIGTERM/SIGINT received by the supervisor are
+    forwarded to every worker before waiting for them to shut down gracefully.
+    Workers are forked so the already configured server (router, handlers,
+    middlewares) does not need to be picklable.
+
+    Attributes:
+        target (callable): Called in each worker process with the worker index.
+        workers (int): Number of worker processes to keep running.
+        logger (object, optional): Logger used for supervisor messages.
+        shutdown_timeout (float): Seconds to wait for workers to exit before killing them.
+        restart_delay (float): Minimum seconds between restarts of the same worker,
+            prevents a crash loop from pinning the CPU.
+    """
+
+    def __init__(
+        self,
+        target: callable,
+        workers: int,
+        logger=None,
+        shutdown_timeout: float = 30.0,
+        restart_delay: float = 1.0,
+    ):
+        if not isinstance(workers, int) or workers <= 0:
+            raise ValueError("Workers must be a positive integer.")
+        self.target = target
+        self.workers = workers
+        self.logger = logger
+        self.shutdown_timeout = shutdown_timeout
+        self.restart_delay = restart_delay
+        self.processes: dict[int, multiprocessing.Process] = {}
+        self._started_at: dict[int, float] = {}
+        self._context = multiprocessing.get_context("fork")
+        self._stop_signal = None
+
+    def run(self) -> None:
+        """
+        Starts all workers and supervises them until SIGTERM or SIGINT is received.
+        """
+        previous_handlers = {
+            signum: signal.signal(signum, self._handle_signal)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            for index in range(self.workers):
+                self._spawn(index)
+            self.log(
+                "info",
+                f"Supervisor (pid {os.getpid()}) started {self.workers} workers.",
+            )
+
+            while self._stop_signal is None:
+                sentinels = {
+                    process.sentinel: index for index, process in self.processes.items()
+                }
+                ready = wait(list(sentinels), timeout=1.0)
+                if self._stop_signal is None:
+                    self._restart_exited([sentinels[sentinel] for sentinel in ready])
+        finally:
+            self.shutdown(self._stop_signal or signal.SIGTERM)
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+    def stop(self, signum: int = signal.SIGTERM) -> None:
+        """
+        Requests shutdown, the supervision loop exits within a second.
+        """
+        self._stop_signal = signum
+
+    def shutdown(self, signum: int = signal.SIGTERM) -> None:
+        """
+        Forwards signum to every live worker and waits for them to exit, killing any
+        worker still running after shutdown_timeout.
+        """
+        for process in self.processes.values():
+            if process.is_alive():
+                try:
+                    os.kill(process.pid, signum)
+                except ProcessLookupError:
+                    pass
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for index, process in self.processes.items():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                self.log("warning", f"Worker {index} did not exit in time, killing it.")
+                process.kill()
+                process.join()
+        self.processes.clear()
+        self.log("info", "All workers stopped.")
+
+    def _handle_signal(self, signum, frame) -> None:
+        self.stop(signum)
+
+    def _spawn(self, index: int) -> None:
+        process = self._context.Process(
+            target=self._worker_main,
+            args=(index,),
+            name=f"areion-worker-{index}",
+            daemon=False,
+        )
+        process.start()
+        self.processes[index] = process
+        self._started_at[index] = time.monotonic()
+
+    def _restart_exited(self, indexes: list[int]) -> None:
+        for index in indexes:
+            process = self.processes[index]
+            process.join()
+            self.log(
+                "warning",
+                f"Worker {index} (pid {process.pid}) exited with code {process.exitcode}, restarting.",
+            )
+            uptime = time.monotonic() - self._started_at.get(index, 0.0)
+            if uptime < self.restart_delay:
+                time.sleep(self.restart_delay - uptime)
+            self._spawn(index)
+
+    def _worker_main(self, index: int) -> None:
+        # Forked workers inherit the supervisor's handlers, the target installs its own
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        self.target(index)
+
+    def log(self, level: str, message: str) -> None:
+        if self.logger:
+            log_method = getattr(self.logger, level, None)
+            if log_method:
+                log_method(message)
+        else:
+            print(f"[{level.upper()}] {message}")
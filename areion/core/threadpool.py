@@ -0,0 +1,139 @@
+"""
+Bounded thread pool for blocking route handlers.
+
+Sync handlers are called on the event loop by default, which is the fastest path
+for handlers that return quickly. Routes registered with run_in="threadpool" get
+their handler wrapped in a ThreadedHandler, and the server runs those in its
+HandlerPool so a blocking call (a database driver, a file API) only holds up
+its own request.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .exceptions import HttpError
+
+# Where a sync route handler runs, async handlers always run on the event loop
+RUN_IN = ("inline", "threadpool")
+
+
+class ThreadedHandler:
+    """
+    Marks a sync route handler (with its middlewares) to run in the HandlerPool.
+
+    Calling it calls the handler directly, so code that invokes route handlers
+    itself keeps working.
+
+    Attributes:
+        handler (callable): The wrapped handler.
+    """
+
+    __slots__ = ("handler",)
+
+    def __init__(self, handler: callable):
+        self.handler = handler
+
+    def __call__(self, *args, **kwargs):
+        return self.handler(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<ThreadedHandler {self.handler!r}>"
+
+
+class HandlerPool:
+    """
+    ThreadPoolExecutor for sync route handlers with a bound on queued calls.
+
+    The executor and its threads are only created on first use, and again after
+    shutdown(), so servers without threaded routes don't start any.
+
+    Attributes:
+        max_workers (int): Most handlers running at once.
+        max_queue (int): Most handlers waiting for a free thread, more calls are
+            answered with 503 right away.
+        completed (int): Calls finished since startup.
+        rejected (int): Calls turned away because the queue was full.
+    """
+
+    def __init__(self, max_workers: int = 32, max_queue: int = 1000):
+        if not isinstance(max_workers, int) or max_workers <= 0:
+            raise ValueError("Max workers must be a positive integer.")
+        if not isinstance(max_queue, int) or max_queue < 0:
+            raise ValueError("Max queue must be a non-negative integer.")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.completed = 0
+        self.rejected = 0
+        # Calls submitted and not finished, running or queued
+        self._in_flight = 0
+        # Counters are updated from worker threads when calls finish
+        self._lock = threading.Lock()
+        self._executor = None
+
+    async def run(self, func: callable, *args, **kwargs):
+        """
+        Runs a function in the pool and waits for its result.
+
+        Args:
+            func (callable): The function to run.
+            *args: Positional arguments for func.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            any: What func returned, exceptions it raised are re-raised here.
+
+        Raises:
+            HttpError: 503 if max_workers calls are running and max_queue more are waiting.
+        """
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise HttpError(status_code=503)
+            self._in_flight += 1
+        executor = self._executor
+        if executor is None:
+            executor = self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="areion-handler"
+            )
+        try:
+            future = executor.submit(func, *args, **kwargs)
+        except BaseException:
+            self._finished(None)
+            raise
+        # Counted down when the call really ends, a cancelled request leaves a
+        # running handler running
+        future.add_done_callback(self._finished)
+        return await asyncio.wrap_future(future)
+
+    def _finished(self, _):
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+
+    def get_stats(self) -> dict:
+        """
+        Returns the pool's live counters.
+
+        Returns:
+            dict: active (handlers running), queued (waiting for a thread),
+            completed, rejected, max_workers and max_queue.
+        """
+        in_flight = self._in_flight
+        return {
+            "active": min(in_flight, self.max_workers),
+            "queued": max(in_flight - self.max_workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+        }
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker threads once the handlers running finish, calls still
+        queued are cancelled.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,175 @@
+"""
+Shared timer wheel for connection timeouts.
+
+A single periodic callback expires idle and slow connections in batches, instead of
+every request arming its own timer handle through asyncio.wait_for or call_later.
+"""
+
+import asyncio
+import time
+
+
+class TimeoutEntry:
+    """
+    A connection's registration in the TimerWheel.
+
+    Created once per connection and re-armed for every phase, so a request costs a
+    couple of attribute writes rather than a timer handle.
+
+    Attributes:
+        callback (callable): Called without arguments when the deadline passes.
+        deadline (float | None): Monotonic deadline, None while disarmed.
+        phase (str | None): What the connection is waiting for when the deadline
+            passes, "idle", "header", "body" or "linger" (a rejected connection
+            being drained).
+        expired (bool): True once the deadline passed, until the entry is re-armed.
+    """
+
+    __slots__ = ("callback", "deadline", "phase", "expired", "slot")
+
+    def __init__(self, callback: callable):
+        self.callback = callback
+        self.deadline = None
+        self.phase = None
+        self.expired = False
+        self.slot = None
+
+
+class TimerWheel:
+    """
+    Coarse-grained timer wheel with one slot per `resolution` seconds.
+
+    Re-arming an entry only moves it to another slot when its deadline got earlier;
+    entries whose deadline moved later are re-filed lazily when their old slot
+    expires. Deadlines therefore fire up to `resolution` seconds late, which is fine
+    for timeouts measured in seconds.
+
+    Attributes:
+        resolution (float): Seconds between ticks.
+    """
+
+    def __init__(self, resolution: float = 1.0):
+        if not isinstance(resolution, (int, float)) or resolution <= 0:
+            raise ValueError("Resolution must be a positive number.")
+        self.resolution = resolution
+        self._slots: dict[int, set] = {}
+        self._handle = None
+        self._last_tick = None
+
+    def start(self) -> None:
+        """
+        Starts ticking on the running event loop.
+        """
+        if self._handle is not None:
+            return
+        self._last_tick = self._slot_for(time.monotonic()) - 1
+        self._handle = asyncio.get_running_loop().call_later(
+            self.resolution, self._tick
+        )
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def schedule(self, entry: TimeoutEntry, timeout: float, phase: str) -> None:
+        """
+        Arms (or re-arms) entry to fire after timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        entry.deadline = deadline
+        entry.phase = phase
+        entry.expired = False
+        slot = self._slot_for(deadline)
+        if entry.slot is None or slot < entry.slot:
+            self._file(entry, slot)
+
+    def cancel(self, entry: TimeoutEntry) -> None:
+        entry.deadline = None
+        entry.phase = None
+        if entry.slot is not None:
+            bucket = self._slots.get(entry.slot)
+            if bucket is not None:
+                bucket.discard(entry)
+            entry.slot = None
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._slots.values())
+
+    def expire(self, now: float = None) -> int:
+        """
+        Fires every entry whose deadline has passed.
+
+        Returns:
+            int: The number of entries that expired.
+        """
+        now = time.monotonic() if now is None else now
+        current = self._slot_for(now)
+        expired = []
+        if self._last_tick is None:
+            self._last_tick = min(self._slots, default=current) - 1
+
+        for slot in range(self._last_tick + 1, current + 1):
+            bucket = self._slots.pop(slot, None)
+            if not bucket:
+                continue
+            for entry in bucket:
+                entry.slot = None
+                if entry.deadline is None:
+                    continue
+                if entry.deadline <= now:
+                    expired.append(entry)
+                else:
+                    self._file(entry, max(self._slot_for(entry.deadline), current + 1))
+        self._last_tick = current
+
+        for entry in expired:
+            entry.deadline = None
+            entry.expired = True
+            entry.callback()
+        return len(expired)
+
+    def expire_phase(self, phase: str) -> int:
+        """
+        Fires every armed entry in phase right away, e.g. to drop idle connections
+        on shutdown.
+
+        Returns:
+            int: The number of entries that expired.
+        """
+        expired = [
+            entry
+            for bucket in self._slots.values()
+            for entry in bucket
+            if entry.deadline is not None and entry.phase == phase
+        ]
+        for entry in expired:
+            self._slots[entry.slot].discard(entry)
+            entry.slot = None
+            entry.deadline = None
+            entry.expired = True
+            entry.callback()
+        return len(expired)
+
+    def _tick(self) -> None:
+        self._handle = asyncio.get_running_loop().call_later(
+            self.resolution, self._tick
+        )
+        self.expire()
+
+    def _file(self, entry: TimeoutEntry, slot: int) -> None:
+        if self._last_tick is not None and slot <= self._last_tick:
+            # Already-processed slot, fire on the next tick instead of never
+            slot = self._last_tick + 1
+        if entry.slot is not None:
+            old_bucket = self._slots.get(entry.slot)
+            if old_bucket is not None:
+                old_bucket.discard(entry)
+        bucket = self._slots.get(slot)
+        if bucket is None:
+            bucket = self._slots[slot] = set()
+        bucket.add(entry)
+        entry.slot = slot
+
+    def _slot_for(self, deadline: float) -> int:
+        return int(deadline / self.resolution)
@@ -1,5 +1,28 @@
 from asyncio import iscoroutinefunction
+from collections import OrderedDict
+from functools import partial
+from uuid import UUID
 from ..core.exceptions import MethodNotAllowedError, NotFoundError
+from ..core.response import HTTP_STATUS_CODES, HttpResponse, PreformattedResponse
+from ..core.threadpool import RUN_IN, ThreadedHandler
+
+
+def _to_int(segment: str) -> int:
+    # int() alone would also take signs, spaces and underscores
+    if not (segment.isascii() and segment.isdigit()):
+        raise ValueError(f"not an integer {segment!r}")
+    return int(segment)
+
+
+# Path parameter types (":id<int>"), converters raise ValueError when a segment
+# does not match. When several typed parameters share a position they are tried
+# in this order, "path" takes the rest of the path and must come last in a route.
+CONVERTERS = {
+    "int": _to_int,
+    "uuid": UUID,
+    "str": str,
+    "path": str,
+}
 
 
 class Router:
@@ -18,20 +41,36 @@ class Router:
         global_middlewares (list): List of global middlewares applied to all routes.
         route_info (list): List of route information for debugging or documentation.
         logger (logging.Logger or None): Logger instance for logging messages.
+        run_in (str): Where sync handlers run unless their route says otherwise,
+            "inline" on the event loop or "threadpool" in the server's HandlerPool.
+        cache_size (int): Most dynamic path lookups kept in the match cache, 0
+            disables it.
 
     Methods:
-        add_route(path, handler, methods=["GET"], middlewares=None):
+        add_route(path, handler, methods=["GET"], middlewares=None, run_in=None, stream_body=False):
             Adds a route to the router with optional middlewares.
 
         group(base_path, middlewares=None) -> "Router":
             Creates a sub-router with a base path and optional group-specific middlewares.
 
-        route(path, methods=["GET"], middlewares=[]):
+        mount(prefix, router) -> "Router":
+            Attaches another router's routes under a path prefix.
+
+        route(path, methods=["GET"], middlewares=[], run_in=None, stream_body=False):
             A decorator to define a route with optional middlewares.
 
         get_handler(method, path):
             Retrieve the handler for a given HTTP method and path.
 
+        compile() -> None:
+            Builds the lookup tables get_handler() matches against.
+
+        streams_body(method, path) -> bool:
+            Tells whether the route for a request reads its body as a stream.
+
+        get_cache_stats() -> dict:
+            Returns the match cache's hit and miss counters.
+
         add_global_middleware(middleware) -> None:
             Adds a middleware that will be applied globally to all routes.
 
@@ -39,7 +78,11 @@ class Router:
             Logs a message with the specified log level.
     """
 
-    def __init__(self):
+    def __init__(self, run_in: str = "inline", cache_size: int = 1024):
+        if run_in not in RUN_IN:
+            raise ValueError(f"Run in must be one of: {', '.join(RUN_IN)}.")
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError("Cache size must be a non-negative integer.")
         self.root = TrieNode()
         self.allowed_methods = [
             "GET",
@@ -55,6 +98,20 @@ class Router:
         self.route_info = []
         self.logger = None
         self.strict_http: bool = False
+        self.run_in: str = run_in
+        # Set by mount(), the routers form a tree sharing one trie
+        self._parent: Router | None = None
+        self._prefix: str = ""
+        self._mounts: list = []
+        # Built by compile(), reset whenever a route is added
+        self._static: dict | None = None
+        self._compiled_root: RadixNode | None = None
+        # (method, path) -> (handler, path_params, is_async), or a callable
+        # creating the exception for paths that did not match
+        self.cache_size: int = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
 
     def add_route(
         self,
@@ -62,6 +119,8 @@ class Router:
         handler: callable,
         methods: list[str] = ["GET"],
         middlewares: list[callable] = None,
+        run_in: str = None,
+        stream_body: bool = False,
     ) -> None:
         """
         Adds a route to the router.
@@ -71,9 +130,12 @@ class Router:
             handler (callable): The function or coroutine that handles requests to this route.
             methods (list, optional): A list of HTTP methods this route should respond to. Defaults to ["GET"].
             middlewares (list, optional): A list of middleware functions to apply to this route. Defaults to None.
+            run_in (str, optional): "threadpool" runs a sync handler in the server's thread pool, for handlers that block. "inline" calls it on the event loop. Defaults to the router's run_in, async handlers always run on the event loop.
+            stream_body (bool, optional): Leaves chunked bodies and bodies larger than the server's buffer_size on the connection until the handler reads them through request.stream() or request.read(). Defaults to False, the whole body is read before the handler runs.
 
         Raises:
             TypeError: If the handler is not callable.
+            ValueError: If run_in is unknown.
 
         Example:
             def my_handler(request):
@@ -93,35 +155,38 @@ class Router:
             raise ValueError("A route already exists with one of these methods.")
         if not callable(handler):
             raise TypeError("Handler must be a callable function.")
+        if run_in is not None and run_in not in RUN_IN:
+            raise ValueError(f"Run in must be one of: {', '.join(RUN_IN)}.")
+        is_async = iscoroutinefunction(handler)
+        threaded = not is_async and (run_in or self.run_in) == "threadpool"
 
         segments: list = self._split_path(path)
+        self._check_path_params(segments)
         current_node: TrieNode = self.root
         for segment in segments:
-            if segment.startswith(":"):
-                if current_node.dynamic_child is None:
-                    current_node.dynamic_child = TrieNode()
-                    current_node.dynamic_child.param_name = segment[1:]
-                current_node = current_node.dynamic_child
-            else:
-                if segment not in current_node.children:
-                    current_node.children[segment] = TrieNode()
-                current_node = current_node.children[segment]
+            current_node = self._child_node(current_node, segment)
+
+        # The chain is built once and shared by the route's methods
+        wrapped_handler: callable = handler
+        for middleware in reversed(middlewares or []):
+            wrapped_handler = middleware(wrapped_handler)
+        for middleware in reversed(self.global_middlewares):
+            wrapped_handler = middleware(wrapped_handler)
+        if threaded:
+            # Middlewares run in the worker thread along with the handler
+            wrapped_handler = ThreadedHandler(wrapped_handler)
 
         for method in methods:
-            combined_middlewares: list = self.global_middlewares + (middlewares or [])
-            wrapped_handler: callable = handler
-            for middleware in reversed(combined_middlewares):
-                wrapped_handler: callable = middleware(wrapped_handler)
-
             current_node.handler[method] = {
                 "handler": wrapped_handler,
-                "is_async": iscoroutinefunction(handler),
+                "is_async": is_async,
                 "middlewares": middlewares,
                 "doc": handler.__doc__,
+                "stream_body": stream_body,
             }
 
             # For generating openapi documentation
-            self.route_info.append(
+            self._record_route(
                 {
                     "path": path,
                     "method": method,
@@ -130,11 +195,18 @@ class Router:
                     "doc": handler.__doc__,
                 }
             )
+        self._invalidate()
 
     def group(self, base_path: str, middlewares: list[callable] = None) -> "Router":
         """
         Creates a sub-router (group) with a base path and optional group-specific middlewares.
 
+        The group is a Router whose root is base_path's node in this router's trie,
+        so grouped routes are matched like any other, and several groups can share
+        a base path. Its middleware chain, this router's global middlewares followed
+        by the group's, is put together once here, global middlewares added to this
+        router later don't apply to the group.
+
         Args:
             base_path (str): The base path for the sub-router.
             middlewares (list, optional): List of middleware functions applied to all routes within this group.
@@ -142,21 +214,91 @@ class Router:
         Returns:
             Router: A sub-router instance with the specified base path.
         """
-        sub_router = Router()
-        group_middlewares: list = middlewares or []
+        sub_router = Router(run_in=self.run_in, cache_size=self.cache_size)
+        sub_router.global_middlewares = self.global_middlewares + (middlewares or [])
+        sub_router.allowed_methods = self.allowed_methods
+        sub_router.strict_http = self.strict_http
+        sub_router.logger = self.logger
+
+        segments = self._split_path(base_path)
+        # Routes follow the prefix, none of its segments may be a <path> parameter
+        self._check_path_params(segments + [""])
+        current_node = self.root
+        for segment in segments:
+            current_node = self._child_node(current_node, segment)
+        sub_router.root = current_node
+        self._link(sub_router, segments)
+        return sub_router
+
+    def mount(self, prefix: str, router: "Router") -> "Router":
+        """
+        Attaches another router's routes under a path prefix.
 
-        def add_sub_route(sub_path, handler, methods=["GET"], middlewares=None):
-            full_path = f"{base_path.rstrip('/')}/{sub_path.lstrip('/')}"
-            combined_middlewares = (middlewares or []) + (group_middlewares or [])
-            self.add_route(
-                full_path, handler, methods, middlewares=combined_middlewares
-            )
+        The router's trie becomes the prefix's node in this router's trie, so its
+        routes, including ones added to it later, are matched in the same walk as
+        this router's. A mounted router keeps its own middlewares and run_in.
 
-        sub_router.add_route = add_sub_route
-        return sub_router
+        Args:
+            prefix (str): The path to mount the router at, may contain dynamic segments.
+            router (Router): The router to mount.
+
+        Returns:
+            Router: The mounted router.
+
+        Raises:
+            ValueError: If the router is already mounted or contains this one, the
+                prefix is the root or has a <path> parameter, or this router has
+                routes under the prefix.
+        """
+        if router._parent is not None:
+            raise ValueError("Router is already mounted.")
+        ancestor = self
+        while ancestor is not None:
+            if ancestor is router:
+                raise ValueError("A router can't be mounted inside itself.")
+            ancestor = ancestor._parent
+        segments = self._split_path(prefix)
+        if not segments:
+            raise ValueError("Mount prefix must not be the root path.")
+        # Routes follow the prefix, none of its segments may be a <path> parameter
+        self._check_path_params(segments + [""])
+        segment = segments[-1]
+        param_name = None
+        if segment.startswith(":"):
+            param_name, param_type = self._parse_param(segment)
+
+        current_node = self.root
+        for parent_segment in segments[:-1]:
+            current_node = self._child_node(current_node, parent_segment)
+        if param_name is None:
+            siblings, key = current_node.children, segment
+        else:
+            siblings, key = current_node.dynamic_children, param_type
+        if key in siblings:
+            raise ValueError("A route already exists under this prefix.")
+        router.root.param_name = param_name
+        siblings[key] = router.root
+        self._link(router, segments)
+        return router
+
+    def _link(self, router: "Router", segments: list) -> None:
+        """
+        Records a router whose root was attached at segments as mounted in this one.
+        """
+        router._parent = self
+        router._prefix = "".join("/" + segment for segment in segments)
+        self._mounts.append(router)
+        for info in router.route_info:
+            self._record_route(info, router)
+        self._invalidate()
 
     def route(
-        self, path: str, methods: list[str] = ["GET"], middlewares: list[callable] = []
+        self,
+        path: str,
+        methods: list[str] = ["GET"],
+        middlewares: list[callable] = [],
+        run_in: str = None,
+        stream_body: bool = False,
     ):
         """
         A decorator to define a route with optional middlewares.
@@ -165,6 +307,8 @@ class Router:
             path (str): The URL path for the route.
             methods (list, optional): HTTP methods allowed for the route. Defaults to ["GET"].
             middlewares (list, optional): List of middleware functions for the route.
+            run_in (str, optional): "threadpool" or "inline", see add_route().
+            stream_body (bool, optional): Streams large request bodies, see add_route().
 
         Returns:
             function: The decorated function with the route added.
@@ -177,7 +321,12 @@ class Router:
 
         def decorator(func):
             self.add_route(
-                path=path, handler=func, methods=methods, middlewares=middlewares
+                path=path,
+                handler=func,
+                methods=methods,
+                middlewares=middlewares,
+                run_in=run_in,
+                stream_body=stream_body,
             )
             return func
 
@@ -201,31 +350,227 @@ class Router:
             - path_params (dict): A dictionary of dynamic path parameters and their values.
             - is_async (bool or None): A flag indicating if the handler is asynchronous, or None if no match is found.
         """
-        path = self._remove_query_params(path)
-        segments = self._split_path(path)
-        current_node = self.root
-        path_params = {}
+        static = self._static
+        if static is None:
+            self.compile()
+            static = self._static
+        query = path.find("?")
+        if query != -1:
+            path = path[:query]
+
+        # Fully static routes are one dict lookup away
+        node = static.get(path)
+        if node is not None:
+            route = node.routes.get(method)
+            if route is None:
+                raise MethodNotAllowedError(response=node.not_allowed)
+            return route[0], {}, route[1]
+
+        if not self.cache_size:
+            return self._match_method(method, path)
+        cache = self._cache
+        key = (method, path)
+        entry = cache.get(key)
+        if entry is not None:
+            self._cache_hits += 1
+            cache.move_to_end(key)
+            if type(entry) is not tuple:
+                raise entry()
+            # Copied so a caller changing its params does not change the cache
+            return entry[0], entry[1].copy(), entry[2]
+
+        self._cache_misses += 1
+        if len(cache) >= self.cache_size:
+            cache.popitem(last=False)
+        try:
+            handler, path_params, is_async = self._match_method(method, path)
+        except NotFoundError:
+            cache[key] = NotFoundError
+            raise
+        except MethodNotAllowedError as e:
+            cache[key] = partial(MethodNotAllowedError, response=e.response)
+            raise
+        cache[key] = (handler, path_params.copy(), is_async)
+        return handler, path_params, is_async
+
+    def streams_body(self, method: str, path: str) -> bool:
+        """
+        Tells whether the route a request is for was added with stream_body=True,
+        the server asks before reading a chunked or large body.
 
-        # TODO: [DESIGN] PASS MORE INFO TO THESE EXCEPTIONS TO GLOBALLY LOG
-        for segment in segments:
-            if segment in current_node.children:
-                current_node = current_node.children[segment]
-            elif current_node.dynamic_child:
-                param_node = current_node.dynamic_child
-                path_params[param_node.param_name] = segment
-                current_node = param_node
-            else:
-                raise NotFoundError()
+        Args:
+            method (str): The HTTP method.
+            path (str): The URL path.
 
-        if not current_node.handler:
-            raise NotFoundError()
+        Returns:
+            bool: True if the handler reads the body itself, False otherwise or if
+            no route matches.
+        """
+        if self._static is None:
+            self.compile()
+        query = path.find("?")
+        if query != -1:
+            path = path[:query]
+        node = self._static.get(path)
+        if node is None:
+            try:
+                node, _ = self._match(path)
+            except NotFoundError:
+                return False
+        return method in node.stream_body
+
+    def get_cache_stats(self) -> dict:
+        """
+        Returns the match cache's counters, lookups of fully static paths skip the
+        cache and are not counted.
 
-        if method in current_node.handler:
-            handler_info = current_node.handler[method]
-            is_async = handler_info["is_async"]
-            return handler_info["handler"], path_params, is_async
-        else:
-            raise MethodNotAllowedError()
+        Returns:
+            dict: hits, misses, hit_rate (0.0 before any lookup), size and max_size.
+        """
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "hit_rate": self._cache_hits / lookups if lookups else 0.0,
+            "size": len(self._cache),
+            "max_size": self.cache_size,
+        }
+
+    def compile(self) -> None:
+        """
+        Builds the lookup tables get_handler() matches against, a dict of the fully
+        static paths and a radix tree for paths with dynamic segments, where chains
+        of static segments are merged into one edge.
+
+        Every route also answers HEAD with its GET handler and OPTIONS with a 204
+        listing its methods, unless it has handlers of its own for them, and its
+        Allow header and 405 response are formatted here once.
+
+        Called when the server starts, and by get_handler() after routes were added.
+        """
+        static = {}
+        self._compiled_root = RadixNode.build(self.root, "", static)
+        self._static = static
+
+    def _match_method(self, method: str, path: str) -> tuple:
+        """
+        Matches a path that is not fully static against the radix tree.
+
+        Returns:
+            tuple: (handler, path_params, is_async).
+
+        Raises:
+            NotFoundError: If no route matches the path.
+            MethodNotAllowedError: If the route has no handler for the method.
+        """
+        node, path_params = self._match(path)
+        route = node.routes.get(method)
+        if route is None:
+            raise MethodNotAllowedError(response=node.not_allowed)
+        return route[0], path_params, route[1]
+
+    def _match(self, path: str) -> tuple:
+        """
+        Walks the radix tree over the path's segments, taking the static child or
+        the first typed parameter that converts the segment. If the path dead-ends
+        after one of those choices had alternatives, the alternatives are searched
+        in the same order with _search().
+
+        Returns:
+            tuple: (RadixNode, path_params), the node's routes are not empty.
+
+        Raises:
+            NotFoundError: If no route matches the path.
+        """
+        segments = path.strip("/").split("/")
+        if "" in segments:
+            # Empty path or repeated slashes
+            segments = [segment for segment in segments if segment]
+        node = self._compiled_root
+        path_params = {}
+        # Whether another child could have taken a segment the walk consumed
+        branched = False
+
+        walk = enumerate(segments)
+        try:
+            for position, segment in walk:
+                dynamic_children = node.dynamic_children
+                child = node.children.get(segment)
+                if child is not None:
+                    if dynamic_children:
+                        branched = True
+                    # A merged edge must match its following segments as well
+                    for expected in child.rest:
+                        if next(walk, (None, None))[1] != expected:
+                            raise NotFoundError()
+                    node = child
+                    continue
+                # Typed parameters in priority order, a segment no converter
+                # takes is a 404
+                for converter, child in dynamic_children:
+                    try:
+                        value = converter(segment)
+                    except ValueError:
+                        continue
+                    break
+                else:
+                    raise NotFoundError()
+                if child is node.catch_all:
+                    path_params[child.param_name] = "/".join(segments[position:])
+                    node = child
+                    break
+                if child is not dynamic_children[-1][1]:
+                    branched = True
+                path_params[child.param_name] = value
+                node = child
+            if not node.routes:
+                raise NotFoundError()
+        except NotFoundError:
+            if not branched:
+                raise
+            found = self._search(self._compiled_root, segments, 0, {})
+            if found is None:
+                raise
+            return found
+        return node, path_params
+
+    def _search(
+        self, node: "RadixNode", segments: list, position: int, path_params: dict
+    ) -> tuple | None:
+        """
+        Matches segments from position on below node, backtracking out of children
+        that dead-end. Children are tried in _match()'s order, so the first match
+        found is the one the walk would have taken.
+
+        Returns:
+            tuple | None: (RadixNode, path_params), or None if nothing matches.
+        """
+        if position == len(segments):
+            return (node, path_params) if node.routes else None
+        segment = segments[position]
+        child = node.children.get(segment)
+        if child is not None:
+            end = position + 1 + len(child.rest)
+            if tuple(segments[position + 1 : end]) == child.rest:
+                found = self._search(child, segments, end, path_params)
+                if found is not None:
+                    return found
+        for converter, child in node.dynamic_children:
+            if child is node.catch_all:
+                if not child.routes:
+                    return None
+                rest = "/".join(segments[position:])
+                return child, {**path_params, child.param_name: rest}
+            try:
+                value = converter(segment)
+            except ValueError:
+                continue
+            found = self._search(
+                child, segments, position + 1, {**path_params, child.param_name: value}
+            )
+            if found is not None:
+                return found
+        return None
 
     def add_global_middleware(self, middleware: callable) -> None:
         """
@@ -240,16 +585,13 @@ class Router:
         """
         Returns a list of allowed methods for a given path.
         """
-        segments = self._split_path(path)
-        current_node = self.root
-        for segment in segments:
-            if segment in current_node.children:
-                current_node = current_node.children[segment]
-            elif current_node.dynamic_child:
-                current_node = current_node.dynamic_child
-            else:
-                return []
-        return list(current_node.handler.keys())
+        if self._static is None:
+            self.compile()
+        try:
+            node, _ = self._match(self._remove_query_params(path))
+        except NotFoundError:
+            return []
+        return list(node.routes)
 
     ### Utility Methods ###
 
@@ -265,6 +607,72 @@ class Router:
         """
         return [segment for segment in path.strip("/").split("/") if segment]
 
+    def _child_node(self, node: "TrieNode", segment: str) -> "TrieNode":
+        """
+        Returns the child of a trie node for a route segment, creating it if needed.
+        """
+        if not segment.startswith(":"):
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = TrieNode()
+            return child
+        param_name, param_type = self._parse_param(segment)
+        child = node.dynamic_children.get(param_type)
+        if child is None:
+            child = node.dynamic_children[param_type] = TrieNode()
+            child.param_name = param_name
+        return child
+
+    def _check_path_params(self, segments: list) -> None:
+        """
+        Raises ValueError if a <path> parameter is followed by more segments.
+        """
+        for segment in segments[:-1]:
+            if segment.startswith(":") and self._parse_param(segment)[1] == "path":
+                raise ValueError("A path parameter must be the last segment.")
+
+    def _record_route(self, info: dict, mounted: "Router" = None) -> None:
+        """
+        Adds a route's information to route_info and, with the mount prefixes, to
+        the route_info of the routers this one is mounted in.
+        """
+        if mounted is not None:
+            info = {**info, "path": mounted._prefix + "/" + info["path"].lstrip("/")}
+        self.route_info.append(info)
+        if self._parent is not None:
+            self._parent._record_route(info, self)
+
+    def _invalidate(self) -> None:
+        """
+        Drops the compiled tables and match caches of every router sharing the trie.
+        """
+        router = self
+        while router._parent is not None:
+            router = router._parent
+        routers = [router]
+        while routers:
+            router = routers.pop()
+            router._static = None
+            router._cache.clear()
+            routers.extend(router._mounts)
+
+    def _parse_param(self, segment: str) -> tuple:
+        """
+        Splits a dynamic segment (":id" or ":id<int>") into its name and type.
+
+        Raises:
+            ValueError: If the type is not one of CONVERTERS.
+        """
+        param_name, _, param_type = segment[1:].partition("<")
+        if not param_type:
+            return param_name, "str"
+        param_type = param_type.rstrip(">")
+        if param_type not in CONVERTERS:
+            raise ValueError(
+                f"Path parameter type must be one of: {', '.join(CONVERTERS)}."
+            )
+        return param_name, param_type
+
     def _check_if_route_and_methods_exists(self, path: str, methods: list[str]) -> bool:
         """
         Checks if a route exists in the router.
@@ -276,14 +684,17 @@ class Router:
             """
             path = self._remove_query_params(path)
 
+            # Walks the route pattern, a parameter only meets one of its own type
             segments = self._split_path(path)
             current_node = self.root
             for segment in segments:
-                if segment in current_node.children:
-                    current_node = current_node.children[segment]
-                elif current_node.dynamic_child:
-                    current_node = current_node.dynamic_child
+                if segment.startswith(":"):
+                    current_node = current_node.dynamic_children.get(
+                        self._parse_param(segment)[1]
+                    )
                 else:
+                    current_node = current_node.children.get(segment)
+                if current_node is None:
                     return False
             return method in current_node.handler
 
@@ -316,12 +727,130 @@ class TrieNode:
     Attributes:
         children (dict): A dictionary mapping child node keys to TrieNode objects.
         handler (dict): A dictionary to store handlers associated with this node.
-        dynamic_child (TrieNode or None): A reference to a dynamic child node, if any.
+        dynamic_children (dict): Maps parameter types (see CONVERTERS) to dynamic child nodes.
         param_name (str or None): The name of the parameter if this node represents a dynamic segment.
     """
 
     def __init__(self):
         self.children = {}
         self.handler = {}
-        self.dynamic_child = None
+        self.dynamic_children = {}
         self.param_name = None
+
+
+class RadixNode:
+    """
+    A node of the compiled routing tree built by Router.compile().
+
+    Attributes:
+        children (dict): Maps the first static segment of an edge to the child node.
+        rest (tuple): The edge's remaining static segments, empty if the edge is a
+            single segment.
+        dynamic_children (tuple): (converter, RadixNode) pairs in CONVERTERS order.
+        param_name (str or None): Name of the parameter this node captures.
+        catch_all (RadixNode or None): The dynamic child taking the rest of the path.
+        routes (dict): Maps methods to (handler, is_async).
+        stream_body (frozenset): Methods whose handlers stream the request body.
+        allow (str or None): The Allow header listing the routes' methods.
+        not_allowed (PreformattedResponse or None): The 405 response for this path.
+    """
+
+    __slots__ = (
+        "children",
+        "rest",
+        "dynamic_children",
+        "param_name",
+        "catch_all",
+        "routes",
+        "stream_body",
+        "allow",
+        "not_allowed",
+    )
+
+    def __init__(self, rest: tuple = (), param_name: str = None):
+        self.children = {}
+        self.rest = rest
+        self.dynamic_children = ()
+        self.param_name = param_name
+        self.catch_all = None
+        self.routes = {}
+        self.stream_body = frozenset()
+        self.allow = None
+        self.not_allowed = None
+
+    @classmethod
+    def build(
+        cls, trie_node: TrieNode, path: str, static: dict, rest: tuple = ()
+    ) -> "RadixNode":
+        """
+        Compiles a TrieNode and its subtree, adding fully static routes to static.
+
+        Args:
+            trie_node (TrieNode): The node to compile.
+            path (str): The node's path, None below a dynamic segment.
+            static (dict): Static path to routes table being filled.
+            rest (tuple): The segments merged into the edge leading here.
+        """
+        node = cls(rest, trie_node.param_name)
+        node.routes = {
+            method: (info["handler"], info["is_async"])
+            for method, info in trie_node.handler.items()
+        }
+        stream_body = {
+            method for method, info in trie_node.handler.items() if info["stream_body"]
+        }
+        if "GET" in stream_body and "HEAD" not in node.routes:
+            stream_body.add("HEAD")
+        node.stream_body = frozenset(stream_body)
+        if node.routes:
+            node._add_method_responses()
+            if path is not None:
+                static[path or "/"] = node
+        for segment, child in trie_node.children.items():
+            merged = []
+            # Follow the chain while a node only leads to one static child
+            while (
+                not child.handler
+                and not child.dynamic_children
+                and len(child.children) == 1
+            ):
+                next_segment, child = next(iter(child.children.items()))
+                merged.append(next_segment)
+            child_path = None
+            if path is not None:
+                child_path = "/".join([path, segment, *merged])
+            node.children[segment] = cls.build(child, child_path, static, tuple(merged))
+        dynamic_children = []
+        for param_type, converter in CONVERTERS.items():
+            child = trie_node.dynamic_children.get(param_type)
+            if child is not None:
+                child = cls.build(child, None, static)
+                if param_type == "path":
+                    node.catch_all = child
+                dynamic_children.append((converter, child))
+        node.dynamic_children = tuple(dynamic_children)
+        return node
+
+    def _add_method_responses(self) -> None:
+        routes = self.routes
+        if "GET" in routes:
+            # The server drops the body, see HttpResponse.for_head()
+            routes.setdefault("HEAD", routes["GET"])
+        automatic_options = "OPTIONS" not in routes
+        allow = self.allow = ", ".join(
+            [*routes, "OPTIONS"] if automatic_options else routes
+        )
+        self.not_allowed = PreformattedResponse(
+            status_code=405,
+            body=HTTP_STATUS_CODES[405],
+            content_type="text/plain",
+            headers={"Allow": allow},
+        )
+        if automatic_options:
+            # A fresh response every time, middlewares may change it
+            routes["OPTIONS"] = (
+                lambda request, **path_params: HttpResponse(
+                    status_code=204, body="", headers={"Allow": allow}
+                ),
+                False,
+            )
@@ -78,7 +78,9 @@ class SwaggerHandler:
             # Get dynamic segments from path
             path_segments = self._split_path(path)
             path_params = [
-                segment[1:] for segment in path_segments if segment.startswith(":")
+                segment[1:].partition("<")[0]
+                for segment in path_segments
+                if segment.startswith(":")
             ]
 
             # Get handler signature
@@ -1,8 +1,15 @@
-import mimetypes
 import os
 import asyncio
+import signal
+import socket
 import threading
 from .core import HttpServer, HttpRequestFactory, HttpResponse
+from .core.static import StaticFileCache
+from .core.compression import Compressor, DEFAULT_CONTENT_TYPES
+from .core.parser import create_parser
+from .core.threadpool import HandlerPool
+from .core.server import TRANSPORTS, OVERLOAD_POLICIES
+from .core.supervisor import WorkerSupervisor
 
 # Constants
 DEFAULT_PORT = 8080
@@ -40,13 +47,30 @@ class AreionServer:
         http_server (HttpServer | None): Instance of the HTTP server.
         request_factory: Factory for creating HTTP requests.
         global_middlewares: List of global middlewares to be applied to requests.
+        transport (str): HTTP transport used by the server, "stream" or "protocol".
+        workers (int): Number of worker processes. Values above 1 enable pre-fork mode.
+        worker_id (int | None): Index of the current worker process, None outside of pre-fork mode.
+        max_conns (int): Maximum number of concurrent connections per process.
+        buffer_size (int): Request bodies up to this many bytes are read as they arrive with the head, larger and chunked ones are read before the handler runs, or streamed on demand on routes added with stream_body=True.
+        keep_alive_timeout (int): Seconds an idle keep-alive connection is kept open.
+        header_timeout (int | float): Seconds a client has to send the request line and headers.
+        body_timeout (int | float): Seconds a client has to send the request body.
+        max_body_size (int): Largest request body in bytes.
+        max_chunk_size (int): Largest chunk in bytes a client may send in a chunked request body.
+        static_cache (StaticFileCache): LRU cache of static files, bounded by static_cache_entries files and static_cache_bytes bytes, revalidated against the disk every static_stat_interval seconds.
+        compressor (Compressor | None): Compresses response bodies on the fly, None to send them uncompressed.
+        parser (str): Request head parser, "auto" (httptools when installed), "httptools" or "python".
+        handler_pool (HandlerPool): Bounded thread pool running the sync handlers of run_in="threadpool" routes.
+        head_limits (dict): max_request_line, max_header_count, max_header_size and max_header_bytes of a request head, requests over them get a 414 or 431.
+        overload_policy (str): "reject" (503 with Retry-After) or "pause" (stop accepting) once max_conns is reached.
 
     Methods:
-        __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, router=None, orchestrator=None, logger=None, engine=None, static_dir=None, request_factory=None, global_middlewares=None):
+        __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, router=None, orchestrator=None, logger=None, engine=None, static_dir=None, request_factory=None, global_middlewares=None, transport="stream", workers=1, max_conns=1000, buffer_size=8192, keep_alive_timeout=30, overload_policy="reject", header_timeout=10, body_timeout=30, max_body_size=2**24, max_chunk_size=2**20, static_cache_entries=256, static_cache_bytes=2**24, static_stat_interval=1.0, compressor=None, parser="auto", head_limits=None, handler_pool=None):
             Initializes the AreionServer with the given parameters.
 
         run(self) -> None:
             Starts the server synchronously. This is a simplified entry point for users to start the server without dealing with asyncio directly.
+            With more than one worker, forks the workers and supervises them instead.
 
         async start(self) -> None:
             Starts the Areion server asynchronously.
@@ -56,6 +80,12 @@ class AreionServer:
 
         stop(self):
             Initiates server shutdown.
+
+        get_connection_stats(self) -> dict:
+            Returns live connection counters of the running HTTP server.
+
+        get_thread_pool_stats(self) -> dict:
+            Returns the counters of the thread pool running blocking handlers.
     """
 
     def __init__(
@@ -69,6 +99,23 @@ class AreionServer:
         static_dir=None,
         request_factory=None,
         global_middlewares=None,
+        transport="stream",
+        workers=1,
+        max_conns=1000,
+        buffer_size=8192,
+        keep_alive_timeout=30,
+        overload_policy="reject",
+        header_timeout=10,
+        body_timeout=30,
+        max_body_size=2**24,
+        max_chunk_size=2**20,
+        static_cache_entries=256,
+        static_cache_bytes=2**24,
+        static_stat_interval=1.0,
+        compressor=None,
+        parser="auto",
+        head_limits=None,
+        handler_pool=None,
     ):
         self.orchestrator: any | None = orchestrator
         self.router: any | None = router
@@ -82,6 +129,26 @@ class AreionServer:
         self.http_server: HttpServer | None = None
         self.request_factory = request_factory
         self.global_middlewares = global_middlewares or []
+        self.transport: str = transport
+        self.workers: int = workers
+        self.worker_id: int | None = None
+        self.max_conns: int = max_conns
+        self.buffer_size: int = buffer_size
+        self.keep_alive_timeout: int = keep_alive_timeout
+        self.overload_policy: str = overload_policy
+        self.header_timeout: int | float = header_timeout
+        self.body_timeout: int | float = body_timeout
+        self.max_body_size: int = max_body_size
+        self.max_chunk_size: int = max_chunk_size
+        self.static_cache: StaticFileCache = StaticFileCache(
+            max_entries=static_cache_entries,
+            max_bytes=static_cache_bytes,
+            stat_interval=static_stat_interval,
+        )
+        self.compressor: Compressor | None = compressor
+        self.parser: str = parser
+        self.head_limits: dict = head_limits or {}
+        self.handler_pool: HandlerPool = handler_pool or HandlerPool()
 
     def run(self) -> None:
         """
@@ -94,15 +161,36 @@ class AreionServer:
         If a `KeyboardInterrupt` or `SystemExit` exception is raised, it will
         call the `stop` method to perform any necessary cleanup.
 
+        When more than one worker is configured, this process becomes a supervisor
+        that forks the workers, restarts crashed ones and forwards SIGTERM/SIGINT to
+        them for a graceful shutdown.
+
         Raises:
             KeyboardInterrupt: If the user interrupts the program execution.
             SystemExit: If a system exit is triggered.
         """
+        if self.workers > 1:
+            print(AREION_LOGO)
+            self.logger.info(
+                f"Starting {self.workers} workers on {self.host}:{self.port}"
+            )
+            WorkerSupervisor(
+                target=self._run_worker, workers=self.workers, logger=self.logger
+            ).run()
+            return
+
         try:
             asyncio.run(self.start())
         except (KeyboardInterrupt, SystemExit):
             self.stop()
 
+    def _run_worker(self, worker_id: int) -> None:
+        """
+        Entry point of a forked worker process.
+        """
+        self.worker_id = worker_id
+        asyncio.run(self.start())
+
     async def start(self) -> None:
         """
         Start the Areion server asynchronously
@@ -112,13 +200,22 @@ class AreionServer:
                 "/static/:filename", self._static_file_handler, methods=["GET"]
             )
 
-        print(AREION_LOGO)
-
-        self.logger.info(f"Starting server on {self.host}:{self.port}")
+        if self.worker_id is None:
+            print(AREION_LOGO)
+            self.logger.info(f"Starting server on {self.host}:{self.port}")
+        else:
+            self.logger.info(
+                f"Worker {self.worker_id} (pid {os.getpid()}) serving on {self.host}:{self.port}"
+            )
+            # Supervisor forwards SIGTERM/SIGINT, shut down gracefully on either
+            loop = asyncio.get_running_loop()
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                loop.add_signal_handler(signum, self._shutdown_event.set)
 
-        self._start_orchestrator_in_thread()
+        # Scheduled tasks must only run once, so only the first worker starts the orchestrator
+        if not self.worker_id:
+            self._start_orchestrator_in_thread()
 
-        # TODO: Allow setting of max_conns, buffer_size, and keep_alive_timeout in builder and pass through here
         # Add the HTTP Server
         self.http_server = HttpServer(
             router=self.router,
@@ -126,6 +223,20 @@ class AreionServer:
             port=self.port,
             request_factory=self.request_factory,
             logger=self.logger,
+            transport=self.transport,
+            reuse_port=self.workers > 1,
+            max_conns=self.max_conns,
+            buffer_size=self.buffer_size,
+            keep_alive_timeout=self.keep_alive_timeout,
+            overload_policy=self.overload_policy,
+            header_timeout=self.header_timeout,
+            body_timeout=self.body_timeout,
+            max_body_size=self.max_body_size,
+            max_chunk_size=self.max_chunk_size,
+            compressor=self.compressor,
+            parser=self.parser,
+            handler_pool=self.handler_pool,
+            **self.head_limits,
         )
 
         # Start the HTTP server
@@ -167,6 +278,22 @@ class AreionServer:
         self.logger.info("Shutdown initiated.")
         self.loop.call_soon_threadsafe(self._shutdown_event.set)
 
+    def get_connection_stats(self) -> dict:
+        """
+        Returns live connection counters (active, idle, rejected, max_conns, accepting)
+        of the running HTTP server, or an empty dict before the server has started.
+        """
+        if not self.http_server:
+            return {}
+        return self.http_server.get_connection_stats()
+
+    def get_thread_pool_stats(self) -> dict:
+        """
+        Returns the counters (active, queued, completed, rejected, max_workers,
+        max_queue) of the thread pool running blocking sync handlers.
+        """
+        return self.handler_pool.get_stats()
+
     def _start_orchestrator_in_thread(self):
         """
         Start orchestrator tasks in a separate thread.
@@ -187,21 +314,20 @@ class AreionServer:
     async def _static_file_handler(self, request, filename):
         """
         Handles serving static files from the static directory.
+
+        Responses come from the static file cache, so hot files are served from
+        memory and only re-checked on disk every static_stat_interval seconds.
+        Precompressed file.br / file.gz siblings are served to clients that accept
+        them.
         """
         file_path = os.path.join(self.static_dir, filename)
 
-        if not os.path.exists(file_path) or not os.path.isfile(file_path):
-            return HttpResponse(status_code=404, body="File Not Found")
-
-        mime_type, _ = mimetypes.guess_type(file_path)
-        mime_type = mime_type or "application/octet-stream"
-
-        with open(file_path, "rb") as file:
-            content = file.read()
-
-        return HttpResponse(
-            status_code=200, body=content, headers={"Content-Type": mime_type}
+        response = await self.static_cache.get(
+            file_path, request.get_header("Accept-Encoding")
         )
+        if response is None:
+            return HttpResponse(status_code=404, body="File Not Found")
+        return response
 
 
 class AreionServerBuilder:
@@ -225,6 +351,40 @@ class AreionServerBuilder:
             Sets the template engine for the server. Validates that the engine has the required methods. Raises ValueError if validation fails.
         with_static_dir(static_dir: str):
             Sets the static directory for the server. Raises ValueError if the static directory is not a string or does not exist.
+        with_transport(transport: str):
+            Sets the HTTP transport, "stream" (default) or "protocol". Raises ValueError if the transport is unknown.
+        with_workers(workers: int):
+            Sets the number of worker processes. Raises ValueError if workers is not a positive integer or SO_REUSEPORT is unavailable.
+        with_max_conns(max_conns: int):
+            Sets the maximum number of concurrent connections. Raises ValueError if max_conns is not a positive integer.
+        with_buffer_size(buffer_size: int):
+            Sets the largest request body read before the handler runs. Raises ValueError if buffer_size is not a positive integer.
+        with_keep_alive_timeout(keep_alive_timeout: int):
+            Sets the keep-alive timeout in seconds. Raises ValueError if keep_alive_timeout is not a positive integer.
+        with_header_timeout(header_timeout: int | float):
+            Sets how long a client has to send the request headers. Raises ValueError if header_timeout is not a positive number.
+        with_body_timeout(body_timeout: int | float):
+            Sets how long a client has to send the request body. Raises ValueError if body_timeout is not a positive number.
+        with_max_body_size(max_body_size: int):
+            Sets the largest accepted request body in bytes. Raises ValueError if max_body_size is not a positive integer.
+        with_max_chunk_size(max_chunk_size: int):
+            Sets the largest accepted chunk of a chunked request body in bytes. Raises ValueError if max_chunk_size is not a positive integer.
+        with_static_cache_entries(static_cache_entries: int):
+            Sets how many static files are cached. Raises ValueError if static_cache_entries is not a positive integer.
+        with_static_cache_bytes(static_cache_bytes: int):
+            Sets how many bytes of static files are cached in memory. Raises ValueError if static_cache_bytes is not a positive integer.
+        with_static_stat_interval(static_stat_interval: int | float):
+            Sets how many seconds a cached static file is served before it is checked for changes. Raises ValueError if static_stat_interval is not a non-negative number.
+        with_compression(min_size: int = 1024, level: int = 6, content_types: tuple = None, thread_size: int = 2**16):
+            Compresses responses on the fly with the best coding the client accepts. Raises ValueError if a setting is invalid.
+        with_head_limits(max_request_line: int = 8192, max_header_count: int = 100, max_header_size: int = 8192, max_header_bytes: int = 65536):
+            Sets the request line and header limits, requests over them are answered with 414 (request line) or 431 (headers). Raises ValueError if a limit is not a positive integer.
+        with_thread_pool(max_workers: int = 32, max_queue: int = 1000):
+            Sizes the thread pool running the sync handlers of run_in="threadpool" routes, calls beyond max_queue waiting ones get a 503. Raises ValueError if a setting is invalid.
+        with_parser(parser: str):
+            Sets the request head parser, "auto" (default, httptools when installed), "httptools" or "python". Raises ValueError if the parser is unknown or httptools is not installed.
+        with_overload_policy(overload_policy: str):
+            Sets what happens once max_conns is reached, "reject" (default) or "pause". Raises ValueError if the policy is unknown.
         _validate_component(component, required_methods, component_name):
             Validates that the component has the required methods. Raises ValueError if validation fails.
         _initialize_logger():
@@ -241,6 +401,23 @@ class AreionServerBuilder:
         self.logger = None
         self.engine = None
         self.static_dir = None
+        self.transport = "stream"
+        self.workers = 1
+        self.max_conns = 1000
+        self.buffer_size = 8192
+        self.keep_alive_timeout = 30
+        self.overload_policy = "reject"
+        self.header_timeout = 10
+        self.body_timeout = 30
+        self.max_body_size = 2**24
+        self.max_chunk_size = 2**20
+        self.static_cache_entries = 256
+        self.static_cache_bytes = 2**24
+        self.static_stat_interval = 1.0
+        self.compressor = None
+        self.parser = "auto"
+        self.head_limits = {}
+        self.handler_pool = None
         # Development Only
         self.development_mode = False
         self.swagger_handler = None
@@ -291,6 +468,137 @@ class AreionServerBuilder:
         self.static_dir = static_dir
         return self
 
+    def with_transport(self, transport: str):
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Transport must be one of: {', '.join(TRANSPORTS)}.")
+        self.transport = transport
+        return self
+
+    def with_workers(self, workers: int):
+        if not isinstance(workers, int) or workers <= 0:
+            raise ValueError("Workers must be a positive integer.")
+        if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+            raise ValueError("Multiple workers require SO_REUSEPORT support.")
+        self.workers = workers
+        return self
+
+    def with_max_conns(self, max_conns: int):
+        if not isinstance(max_conns, int) or max_conns <= 0:
+            raise ValueError("Max connections must be a positive integer.")
+        self.max_conns = max_conns
+        return self
+
+    def with_buffer_size(self, buffer_size: int):
+        if not isinstance(buffer_size, int) or buffer_size <= 0:
+            raise ValueError("Buffer size must be a positive integer.")
+        self.buffer_size = buffer_size
+        return self
+
+    def with_keep_alive_timeout(self, keep_alive_timeout: int):
+        if not isinstance(keep_alive_timeout, int) or keep_alive_timeout <= 0:
+            raise ValueError("Keep alive timeout must be a positive integer.")
+        self.keep_alive_timeout = keep_alive_timeout
+        return self
+
+    def with_header_timeout(self, header_timeout: int | float):
+        if not isinstance(header_timeout, (int, float)) or header_timeout <= 0:
+            raise ValueError("Header timeout must be a positive number.")
+        self.header_timeout = header_timeout
+        return self
+
+    def with_body_timeout(self, body_timeout: int | float):
+        if not isinstance(body_timeout, (int, float)) or body_timeout <= 0:
+            raise ValueError("Body timeout must be a positive number.")
+        self.body_timeout = body_timeout
+        return self
+
+    def with_max_body_size(self, max_body_size: int):
+        if not isinstance(max_body_size, int) or max_body_size <= 0:
+            raise ValueError("Max body size must be a positive integer.")
+        self.max_body_size = max_body_size
+        return self
+
+    def with_max_chunk_size(self, max_chunk_size: int):
+        if not isinstance(max_chunk_size, int) or max_chunk_size <= 0:
+            raise ValueError("Max chunk size must be a positive integer.")
+        self.max_chunk_size = max_chunk_size
+        return self
+
+    def with_static_cache_entries(self, static_cache_entries: int):
+        if not isinstance(static_cache_entries, int) or static_cache_entries <= 0:
+            raise ValueError("Static cache entries must be a positive integer.")
+        self.static_cache_entries = static_cache_entries
+        return self
+
+    def with_static_cache_bytes(self, static_cache_bytes: int):
+        if not isinstance(static_cache_bytes, int) or static_cache_bytes <= 0:
+            raise ValueError("Static cache bytes must be a positive integer.")
+        self.static_cache_bytes = static_cache_bytes
+        return self
+
+    def with_static_stat_interval(self, static_stat_interval: int | float):
+        if (
+            not isinstance(static_stat_interval, (int, float))
+            or static_stat_interval < 0
+        ):
+            raise ValueError("Static stat interval must be a non-negative number.")
+        self.static_stat_interval = static_stat_interval
+        return self
+
+    def with_compression(
+        self,
+        min_size: int = 1024,
+        level: int = 6,
+        content_types: tuple = None,
+        thread_size: int = 2**16,
+    ):
+        self.compressor = Compressor(
+            min_size=min_size,
+            level=level,
+            content_types=content_types or DEFAULT_CONTENT_TYPES,
+            thread_size=thread_size,
+        )
+        return self
+
+    def with_head_limits(
+        self,
+        max_request_line: int = 8192,
+        max_header_count: int = 100,
+        max_header_size: int = 8192,
+        max_header_bytes: int = 2**16,
+    ):
+        head_limits = {
+            "max_request_line": max_request_line,
+            "max_header_count": max_header_count,
+            "max_header_size": max_header_size,
+            "max_header_bytes": max_header_bytes,
+        }
+        for name, limit in head_limits.items():
+            if not isinstance(limit, int) or limit <= 0:
+                raise ValueError(
+                    f"{name.replace('_', ' ').capitalize()} must be a positive integer."
+                )
+        self.head_limits = head_limits
+        return self
+
+    def with_thread_pool(self, max_workers: int = 32, max_queue: int = 1000):
+        self.handler_pool = HandlerPool(max_workers=max_workers, max_queue=max_queue)
+        return self
+
+    def with_parser(self, parser: str):
+        # Fails here rather than at startup if httptools is missing
+        create_parser(parser)
+        self.parser = parser
+        return self
+
+    def with_overload_policy(self, overload_policy: str):
+        if overload_policy not in OVERLOAD_POLICIES:
+            raise ValueError(
+                f"Overload policy must be one of: {', '.join(OVERLOAD_POLICIES)}."
+            )
+        self.overload_policy = overload_policy
+        return self
+
     def with_development_mode(self, development_mode: bool = False):
         if not isinstance(development_mode, bool):
             raise ValueError("Development mode flag must be a boolean.")
@@ -347,4 +655,21 @@ class AreionServerBuilder:
             engine=self.engine,
             static_dir=self.static_dir,
             request_factory=request_factory,
+            transport=self.transport,
+            workers=self.workers,
+            max_conns=self.max_conns,
+            buffer_size=self.buffer_size,
+            keep_alive_timeout=self.keep_alive_timeout,
+            overload_policy=self.overload_policy,
+            header_timeout=self.header_timeout,
+            body_timeout=self.body_timeout,
+            max_body_size=self.max_body_size,
+            max_chunk_size=self.max_chunk_size,
+            static_cache_entries=self.static_cache_entries,
+            static_cache_bytes=self.static_cache_bytes,
+            static_stat_interval=self.static_stat_interval,
+            compressor=self.compressor,
+            parser=self.parser,
+            head_limits=self.head_limits,
+            handler_pool=self.handler_pool,
         )
@@ -2,6 +2,8 @@ import unittest
 import asyncio
 from unittest.mock import MagicMock, AsyncMock
 from ... import DefaultRouter as Router, NotFoundError, MethodNotAllowedError, HttpResponse, HttpRequest, HttpError
+from ...core.threadpool import ThreadedHandler
+from uuid import UUID
 
 
 class TestRouter(unittest.TestCase):
@@ -174,7 +176,7 @@ class TestRouter(unittest.TestCase):
         handler = MagicMock()
         self.router.add_route("/test", handler, methods=["GET", "POST"])
         allowed_methods = self.router.get_allowed_methods("/test")
-        self.assertEqual(allowed_methods, ["GET", "POST"])
+        self.assertEqual(allowed_methods, ["GET", "POST", "HEAD", "OPTIONS"])
 
     def test_get_allowed_methods_no_methods(self):
         # TODO: Change behavior to throw error in add_route when no methods are provided
@@ -333,5 +335,416 @@ class TestRouter(unittest.TestCase):
         self.assertEqual(request.query_params, {"param1": ["value1"], "param2": ["value2"]})
         
 
+    def test_threadpool_route_wraps_sync_handler(self):
+        def handler(request):
+            return "blocking"
+
+        async def async_handler(request):
+            return "async"
+
+        self.router.add_route("/sync", handler, run_in="threadpool")
+        self.router.add_route("/async", async_handler, run_in="threadpool")
+        self.router.add_route("/inline", handler)
+
+        route_handler, _, is_async = self.router.get_handler("GET", "/sync")
+        self.assertIsInstance(route_handler, ThreadedHandler)
+        self.assertIs(route_handler.handler, handler)
+        self.assertEqual(route_handler(None), "blocking")
+        self.assertFalse(is_async)
+        route_handler, _, is_async = self.router.get_handler("GET", "/async")
+        self.assertIs(route_handler, async_handler)
+        self.assertTrue(is_async)
+        route_handler, _, _ = self.router.get_handler("GET", "/inline")
+        self.assertIs(route_handler, handler)
+
+    def test_router_wide_run_in(self):
+        router = Router(run_in="threadpool")
+        handler = MagicMock(__doc__=None)
+        router.add_route("/a", handler)
+        router.add_route("/b", handler, run_in="inline")
+        router.group("/api").add_route("/c", handler)
+
+        self.assertIsInstance(router.get_handler("GET", "/a")[0], ThreadedHandler)
+        self.assertIs(router.get_handler("GET", "/b")[0], handler)
+        self.assertIsInstance(
+            router.get_handler("GET", "/api/c")[0], ThreadedHandler
+        )
+
+    def test_run_in_invalid(self):
+        with self.assertRaises(ValueError):
+            Router(run_in="process")
+        with self.assertRaises(ValueError):
+            self.router.add_route("/a", MagicMock(), run_in="process")
+
+    def test_compile_static_table(self):
+        handler = MagicMock()
+        self.router.add_route("/", handler)
+        self.router.add_route("/api/v1/users", handler, methods=["GET", "POST"])
+        self.router.add_route("/api/v1/users/:id", handler)
+        self.router.compile()
+
+        self.assertEqual(set(self.router._static), {"/", "/api/v1/users"})
+        self.assertEqual(
+            set(self.router._static["/api/v1/users"].routes),
+            {"GET", "POST", "HEAD", "OPTIONS"},
+        )
+        self.assertEqual(self.router.get_handler("GET", "/")[0], handler)
+        self.assertEqual(
+            self.router.get_handler("POST", "/api/v1/users?page=2")[:2],
+            (handler, {}),
+        )
+        with self.assertRaises(MethodNotAllowedError):
+            self.router.get_handler("DELETE", "/api/v1/users")
+
+    def test_compile_merges_static_chains(self):
+        handler = MagicMock()
+        self.router.add_route("/api/v1/users/:id/posts", handler)
+        self.router.add_route("/api/v1/users/:id/posts/:post", handler)
+        self.router.compile()
+
+        api = self.router._compiled_root.children["api"]
+        self.assertEqual(api.rest, ("v1", "users"))
+        self.assertEqual(api.dynamic_children[0][1].param_name, "id")
+        self.assertEqual(
+            self.router.get_handler("GET", "/api/v1/users/7/posts/9")[1],
+            {"id": "7", "post": "9"},
+        )
+        for path in ("/api", "/api/v1", "/api/v2/users/7/posts", "/api/v1/usersx/7/posts"):
+            with self.subTest(path=path):
+                with self.assertRaises(NotFoundError):
+                    self.router.get_handler("GET", path)
+
+    def test_compiled_path_normalization(self):
+        handler = MagicMock()
+        self.router.add_route("/users/:id", handler)
+        self.router.add_route("/static/page", handler)
+
+        for path in ("/users/5/", "//users//5", "/users/5?x=/y", "users/5"):
+            with self.subTest(path=path):
+                self.assertEqual(self.router.get_handler("GET", path)[1], {"id": "5"})
+        self.assertEqual(self.router.get_handler("GET", "/static/page/")[1], {})
+
+    def test_static_child_preferred_over_dynamic(self):
+        static, dynamic = MagicMock(), MagicMock()
+        self.router.add_route("/users/me", static)
+        self.router.add_route("/users/:id", dynamic)
+
+        self.assertEqual(self.router.get_handler("GET", "/users/me")[0], static)
+        self.assertEqual(self.router.get_handler("GET", "/users/you")[0], dynamic)
+
+    def test_add_route_after_compile(self):
+        handler = MagicMock()
+        self.router.add_route("/a", handler)
+        self.router.get_handler("GET", "/a")
+        self.router.add_route("/b/:id", handler)
+
+        self.assertIsNone(self.router._static)
+        self.assertEqual(self.router.get_handler("GET", "/b/1")[1], {"id": "1"})
+
+
+    def test_match_cache_hits(self):
+        handler = MagicMock()
+        self.router.add_route("/users/:id", handler)
+
+        first = self.router.get_handler("GET", "/users/7")
+        first[1]["id"] = "changed"
+        second = self.router.get_handler("GET", "/users/7?page=2")
+
+        self.assertEqual(second, (handler, {"id": "7"}, False))
+        stats = self.router.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertEqual(stats["size"], 1)
+
+    def test_match_cache_negative_results(self):
+        self.router.add_route("/users/:id", MagicMock())
+        for _ in range(2):
+            with self.assertRaises(NotFoundError):
+                self.router.get_handler("GET", "/missing/1")
+            with self.assertRaises(MethodNotAllowedError):
+                self.router.get_handler("POST", "/users/1")
+        self.assertEqual(self.router.get_cache_stats()["hits"], 2)
+
+    def test_match_cache_bounded_lru(self):
+        router = Router(cache_size=2)
+        router.add_route("/users/:id", MagicMock())
+        router.get_handler("GET", "/users/1")
+        router.get_handler("GET", "/users/2")
+        router.get_handler("GET", "/users/1")
+        router.get_handler("GET", "/users/3")
+
+        self.assertEqual(
+            list(router._cache), [("GET", "/users/1"), ("GET", "/users/3")]
+        )
+
+    def test_match_cache_cleared_by_add_route(self):
+        handler = MagicMock()
+        self.router.add_route("/users/:id", handler)
+        with self.assertRaises(MethodNotAllowedError):
+            self.router.get_handler("POST", "/users/1")
+
+        self.router.add_route("/users/:id", handler, methods=["POST"])
+        self.assertEqual(self.router.get_handler("POST", "/users/1")[0], handler)
+
+    def test_match_cache_disabled(self):
+        router = Router(cache_size=0)
+        router.add_route("/users/:id", MagicMock())
+        router.get_handler("GET", "/users/1")
+        router.get_handler("GET", "/users/1")
+
+        self.assertEqual(router._cache, {})
+        self.assertEqual(router.get_cache_stats()["misses"], 0)
+        with self.assertRaises(ValueError):
+            Router(cache_size=-1)
+
+
+    def test_typed_params_converted(self):
+        handler = MagicMock()
+        self.router.add_route("/users/:id<int>", handler)
+        self.router.add_route("/orders/:order_id<uuid>", handler)
+        self.router.add_route("/files/:rest<path>", handler)
+
+        self.assertEqual(self.router.get_handler("GET", "/users/42")[1], {"id": 42})
+        order_id = "12345678-1234-5678-1234-567812345678"
+        self.assertEqual(
+            self.router.get_handler("GET", f"/orders/{order_id}")[1],
+            {"order_id": UUID(order_id)},
+        )
+        self.assertEqual(
+            self.router.get_handler("GET", "/files/css/site/main.css/")[1],
+            {"rest": "css/site/main.css"},
+        )
+
+    def test_typed_param_mismatch_is_not_found(self):
+        self.router.add_route("/users/:id<int>", MagicMock())
+        self.router.add_route("/orders/:order_id<uuid>", MagicMock())
+        self.router.add_route("/files/:rest<path>", MagicMock())
+
+        for path in ("/users/abc", "/users/-1", "/users/1_0", "/users/٣", "/orders/42", "/files"):
+            with self.subTest(path=path):
+                with self.assertRaises(NotFoundError):
+                    self.router.get_handler("GET", path)
+        self.assertEqual(self.router.get_allowed_methods("/users/abc"), [])
+
+    def test_typed_params_priority(self):
+        static, by_id, by_uuid, by_name, rest = (MagicMock() for _ in range(5))
+        self.router.add_route("/items/:rest<path>", rest)
+        self.router.add_route("/items/:name", by_name)
+        self.router.add_route("/items/:key<uuid>", by_uuid)
+        self.router.add_route("/items/:id<int>", by_id)
+        self.router.add_route("/items/new", static)
+
+        cases = (
+            ("/items/new", static, {}),
+            ("/items/7", by_id, {"id": 7}),
+            ("/items/" + "a" * 32, by_uuid, {"key": UUID("a" * 32)}),
+            ("/items/lamp", by_name, {"name": "lamp"}),
+            ("/items/lamp/shade", rest, {"rest": "lamp/shade"}),
+            ("/items/new/draft", rest, {"rest": "new/draft"}),
+            ("/items/7/parts", rest, {"rest": "7/parts"}),
+        )
+        for path, handler, params in cases:
+            with self.subTest(path=path):
+                self.assertEqual(
+                    self.router.get_handler("GET", path)[:2], (handler, params)
+                )
+
+    def test_match_backtracks_to_sibling(self):
+        by_id, by_name, me, user_post = (MagicMock() for _ in range(4))
+        self.router.add_route("/items/:id<int>/a", by_id)
+        self.router.add_route("/items/:name/b", by_name)
+        self.router.add_route("/users/me/settings", me)
+        self.router.add_route("/users/:id/posts", user_post)
+
+        cases = (
+            ("/items/5/a", by_id, {"id": 5}),
+            ("/items/5/b", by_name, {"name": "5"}),
+            ("/items/lamp/b", by_name, {"name": "lamp"}),
+            ("/users/me/settings", me, {}),
+            ("/users/me/posts", user_post, {"id": "me"}),
+        )
+        for path, handler, params in cases:
+            with self.subTest(path=path):
+                self.assertEqual(
+                    self.router.get_handler("GET", path)[:2], (handler, params)
+                )
+        with self.assertRaises(NotFoundError):
+            self.router.get_handler("GET", "/items/5/c")
+
+    def test_typed_params_conflicts(self):
+        self.router.add_route("/users/:id<int>", MagicMock())
+        self.router.add_route("/users/:name<str>", MagicMock())
+        with self.assertRaises(ValueError):
+            self.router.add_route("/users/:user_id<int>", MagicMock())
+        with self.assertRaises(ValueError):
+            self.router.add_route("/users/:id<float>", MagicMock())
+        with self.assertRaises(ValueError):
+            self.router.add_route("/files/:rest<path>/raw", MagicMock())
+
+
+    def test_head_mapped_to_get(self):
+        get, head = MagicMock(), MagicMock()
+        self.router.add_route("/a", get)
+        self.router.add_route("/b/:id", get)
+        self.router.add_route("/b/:id", head, methods=["HEAD"])
+
+        self.assertEqual(self.router.get_handler("HEAD", "/a")[0], get)
+        self.assertEqual(self.router.get_handler("HEAD", "/b/1")[0], head)
+
+    def test_streams_body(self):
+        self.router.add_route("/upload", MagicMock(), methods=["POST"], stream_body=True)
+        self.router.add_route("/upload", MagicMock(), methods=["PUT"])
+        self.router.add_route("/files/:name", MagicMock(), methods=["GET", "POST"], stream_body=True)
+
+        self.assertTrue(self.router.streams_body("POST", "/upload"))
+        self.assertTrue(self.router.streams_body("POST", "/upload?part=1"))
+        self.assertFalse(self.router.streams_body("PUT", "/upload"))
+        self.assertTrue(self.router.streams_body("POST", "/files/a"))
+        self.assertTrue(self.router.streams_body("HEAD", "/files/a"))
+        self.assertFalse(self.router.streams_body("POST", "/missing"))
+
+    def test_automatic_options(self):
+        handler = MagicMock()
+        self.router.add_route("/a/:id", handler, methods=["GET", "PUT"])
+
+        options, params, is_async = self.router.get_handler("OPTIONS", "/a/1")
+        response = options(None, **params)
+        self.assertFalse(is_async)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.headers["Allow"], "GET, PUT, HEAD, OPTIONS")
+        handler.assert_not_called()
+
+    def test_automatic_options_response_not_shared(self):
+        self.router.add_route("/a", MagicMock())
+        options = self.router.get_handler("OPTIONS", "/a")[0]
+
+        first = options(None)
+        first.headers["Access-Control-Allow-Origin"] = "*"
+        second = options(None)
+        self.assertIsNot(second, first)
+        self.assertNotIn("Access-Control-Allow-Origin", second.headers)
+        self.assertIn(b"Allow: GET, HEAD, OPTIONS\r\n", second.format_response())
+
+    def test_own_options_handler_kept(self):
+        handler = MagicMock()
+        self.router.add_route("/a", handler, methods=["OPTIONS", "POST"])
+
+        self.assertEqual(self.router.get_handler("OPTIONS", "/a")[0], handler)
+        self.assertEqual(self.router.get_allowed_methods("/a"), ["OPTIONS", "POST"])
+
+    def test_method_not_allowed_response(self):
+        self.router.add_route("/static", MagicMock(), methods=["POST"])
+        self.router.add_route("/dynamic/:id", MagicMock())
+
+        for path, allow in (
+            ("/static", "POST, OPTIONS"),
+            ("/dynamic/1", "GET, HEAD, OPTIONS"),
+            ("/dynamic/1", "GET, HEAD, OPTIONS"),
+        ):
+            with self.subTest(path=path):
+                with self.assertRaises(MethodNotAllowedError) as context:
+                    self.router.get_handler("DELETE", path)
+                response = context.exception.response
+                self.assertEqual(response.status_code, 405)
+                self.assertEqual(response.headers["Allow"], allow)
+        self.assertEqual(self.router.get_cache_stats()["hits"], 1)
+
+
+    def test_group_decorator_and_nesting(self):
+        api = self.router.group("/api")
+        v1 = api.group("/v1")
+
+        @v1.route("/users/:id<int>")
+        def user(request, id):
+            return id
+
+        self.assertEqual(self.router.get_handler("GET", "/api/v1/users/3")[:2], (user, {"id": 3}))
+        self.assertEqual(api.get_handler("GET", "/v1/users/3")[0], user)
+        self.assertEqual(v1.get_handler("GET", "/users/3")[0], user)
+        self.assertEqual(
+            [info["path"] for info in self.router.route_info], ["/api/v1/users/:id<int>"]
+        )
+
+    def test_group_shares_trie(self):
+        handler = MagicMock()
+        self.router.add_route("/api/health", handler)
+        self.router.group("/api").add_route("/users", handler)
+        self.router.group("/api/").add_route("/posts", handler)
+        self.router.compile()
+
+        api = self.router._compiled_root.children["api"]
+        self.assertEqual(set(api.children), {"health", "users", "posts"})
+        self.assertEqual(
+            set(self.router._static), {"/api/health", "/api/users", "/api/posts"}
+        )
+
+    def test_group_middleware_order(self):
+        calls = []
+
+        def middleware(name):
+            def wrap(handler):
+                calls.append(name)
+                return lambda *args: [name, *handler(*args)]
+
+            return wrap
+
+        self.router.add_global_middleware(middleware("global"))
+        group = self.router.group("/api", middlewares=[middleware("group")])
+        group.add_route(
+            "/a", lambda request: [], methods=["GET", "POST"], middlewares=[middleware("route")]
+        )
+
+        handler = self.router.get_handler("GET", "/api/a")[0]
+        self.assertEqual(handler(None), ["global", "group", "route"])
+        self.assertIs(self.router.get_handler("POST", "/api/a")[0], handler)
+        self.assertEqual(calls, ["route", "group", "global"])
+
+    def test_group_routes_added_after_lookup(self):
+        group = self.router.group("/api")
+        with self.assertRaises(NotFoundError):
+            self.router.get_handler("GET", "/api/late")
+
+        handler = MagicMock()
+        group.add_route("/late", handler)
+        self.assertEqual(self.router.get_handler("GET", "/api/late")[0], handler)
+
+    def test_mount(self):
+        handler = MagicMock()
+        users = Router()
+        users.add_route("/", handler)
+        users.add_route("/:id<int>", handler, methods=["PUT"])
+        self.router.mount("/orgs/:org/users", users)
+        users.add_route("/me", handler)
+
+        self.assertEqual(
+            self.router.get_handler("GET", "/orgs/acme/users")[:2], (handler, {"org": "acme"})
+        )
+        self.assertEqual(
+            self.router.get_handler("PUT", "/orgs/acme/users/5")[1], {"org": "acme", "id": 5}
+        )
+        self.assertEqual(self.router.get_handler("GET", "/orgs/acme/users/me")[0], handler)
+        self.assertEqual(users.get_handler("PUT", "/5")[1], {"id": 5})
+        self.assertEqual(
+            [info["path"] for info in self.router.route_info],
+            ["/orgs/:org/users/", "/orgs/:org/users/:id<int>", "/orgs/:org/users/me"],
+        )
+
+    def test_mount_invalid(self):
+        self.router.add_route("/taken/a", MagicMock())
+        sub = Router()
+        with self.assertRaises(ValueError):
+            self.router.mount("/taken", sub)
+        with self.assertRaises(ValueError):
+            self.router.mount("/", sub)
+        with self.assertRaises(ValueError):
+            self.router.mount("/files/:rest<path>", sub)
+
+        self.router.mount("/sub", sub)
+        with self.assertRaises(ValueError):
+            Router().mount("/other", sub)
+        with self.assertRaises(ValueError):
+            sub.mount("/loop", self.router)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,111 @@
+import time
+import unittest
+
+import asyncio
+from ... import BadRequestError, PayloadTooLargeError, RequestTimeoutError
+from ...core.body import RequestBody, read_chunked
+from ...core.timeouts import TimerWheel, TimeoutEntry
+
+
+def make_reader(data, eof=True):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    if eof:
+        reader.feed_eof()
+    return reader
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class TestReadChunked(unittest.IsolatedAsyncioTestCase):
+    async def test_decodes_chunks(self):
+        reader = make_reader(
+            b"4\r\nWiki\r\n5\r\npedia\r\nE\r\n in\r\n\r\nchunks.\r\n0\r\n\r\n"
+        )
+
+        chunks = await collect(read_chunked(reader, 1024, 1024))
+
+        self.assertEqual(b"".join(chunks), b"Wikipedia in\r\n\r\nchunks.")
+
+    async def test_leaves_following_bytes_unread(self):
+        reader = make_reader(b"3\r\nabc\r\n0\r\nExpires: never\r\n\r\nGET / HTTP/1.1")
+
+        self.assertEqual(await collect(read_chunked(reader, 1024, 1024)), [b"abc"])
+        self.assertEqual(await reader.read(), b"GET / HTTP/1.1")
+
+    async def test_large_chunk_split_into_pieces(self):
+        size = 3 * 2**16 + 5
+        reader = make_reader(b"%x\r\n" % size + b"a" * size + b"\r\n0\r\n\r\n")
+
+        chunks = await collect(read_chunked(reader, size, size))
+
+        self.assertTrue(all(len(chunk) <= 2**16 for chunk in chunks))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), size)
+
+    async def test_invalid_chunk_size(self):
+        for data in (b"xyz\r\n", b"-5\r\n", b"0x5\r\n", b"\r\n", b"1_0\r\n"):
+            with self.subTest(data=data):
+                with self.assertRaises(BadRequestError):
+                    await collect(read_chunked(make_reader(data), 1024, 1024))
+
+    async def test_missing_chunk_terminator(self):
+        reader = make_reader(b"3\r\nabcXX0\r\n\r\n")
+        with self.assertRaises(BadRequestError):
+            await collect(read_chunked(reader, 1024, 1024))
+
+    async def test_chunk_too_large_rejected_before_reading_data(self):
+        reader = make_reader(b"400\r\n", eof=False)
+        with self.assertRaises(PayloadTooLargeError):
+            await collect(read_chunked(reader, 1023, 4096))
+
+    async def test_body_too_large(self):
+        reader = make_reader(b"8\r\naaaaaaaa\r\n8\r\n", eof=False)
+        with self.assertRaises(PayloadTooLargeError):
+            await collect(read_chunked(reader, 8, 12))
+
+    async def test_truncated_body(self):
+        reader = make_reader(b"8\r\naaaa")
+        with self.assertRaises(asyncio.IncompleteReadError):
+            await collect(read_chunked(reader, 1024, 1024))
+
+
+class TestRequestBody(unittest.IsolatedAsyncioTestCase):
+    async def test_complete_after_exhausted(self):
+        body = RequestBody(read_chunked(make_reader(b"2\r\nhi\r\n0\r\n\r\n"), 8, 8))
+
+        self.assertFalse(body.complete)
+        self.assertEqual(await collect(body), [b"hi"])
+        self.assertTrue(body.complete)
+
+    async def test_streamed_once(self):
+        body = RequestBody(read_chunked(make_reader(b"0\r\n\r\n"), 8, 8))
+        await collect(body)
+        with self.assertRaises(RuntimeError):
+            body.__aiter__()
+
+    async def test_truncated_body_is_bad_request(self):
+        body = RequestBody(read_chunked(make_reader(b"8\r\naaaa"), 8, 8))
+        with self.assertRaises(BadRequestError):
+            await collect(body)
+
+    async def test_timeout_raises_request_timeout(self):
+        wheel = TimerWheel()
+        reader = make_reader(b"8\r\naaaa", eof=False)
+        entry = TimeoutEntry(reader.feed_eof)
+        body = RequestBody(read_chunked(reader, 8, 8), wheel, entry, 5)
+
+        iterator = body.__aiter__()
+        self.assertEqual(await iterator.__anext__(), b"aaaa")
+        pending = asyncio.ensure_future(iterator.__anext__())
+        await asyncio.sleep(0)
+        self.assertEqual(entry.phase, "body")
+        wheel.expire(time.monotonic() + 3600)
+
+        with self.assertRaises(RequestTimeoutError):
+            await pending
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import asyncio
+import gzip
+import unittest
+import zlib
+from unittest import mock
+
+from ...core.compression import (
+    Compressor,
+    negotiate_encoding,
+    parse_accept_encoding,
+)
+from ...core.response import HttpResponse, StreamingResponse
+
+
+class TestNegotiateEncoding(unittest.TestCase):
+    def test_parse_accept_encoding(self):
+        self.assertEqual(
+            parse_accept_encoding("gzip, BR;q=0.5, identity; q=0, *;q=bad"),
+            {"gzip": 1.0, "br": 0.5, "identity": 0.0, "*": 0.0},
+        )
+
+    def test_negotiate(self):
+        available = ("br", "gzip")
+        cases = {
+            None: None,
+            "": None,
+            "gzip, deflate, br": "br",
+            "gzip": "gzip",
+            "br;q=0.5, gzip": "gzip",
+            "br;q=0, gzip;q=0": None,
+            "*": "br",
+            "*;q=0.1, br;q=0": "gzip",
+            "identity": None,
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(negotiate_encoding(header, available), expected)
+
+    def test_only_available_codings(self):
+        self.assertEqual(negotiate_encoding("br, gzip", ("gzip",)), "gzip")
+        self.assertIsNone(negotiate_encoding("br", ()))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class TestCompressor(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.compressor = Compressor(min_size=100, thread_size=2**20)
+        self.body = "hello world " * 100
+
+    def response(self, **kwargs):
+        kwargs.setdefault("body", self.body)
+        kwargs.setdefault("content_type", "text/plain")
+        return HttpResponse(**kwargs)
+
+    async def test_gzip(self):
+        response = await self.compressor.compress(self.response(), "gzip")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.body), self.body.encode())
+        data = response.format_response()
+        self.assertIn(f"Content-Length: {len(response.body)}".encode(), data)
+        self.assertTrue(data.endswith(response.body))
+
+    async def test_deflate(self):
+        response = await self.compressor.compress(self.response(), "deflate")
+        self.assertEqual(response.headers["Content-Encoding"], "deflate")
+        self.assertEqual(zlib.decompress(response.body), self.body.encode())
+
+    async def test_json_body(self):
+        response = self.response(body={"items": list(range(200))}, content_type=None)
+        await self.compressor.compress(response, "gzip")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(response.body),
+            b'{"items":[' + b",".join(str(i).encode() for i in range(200)) + b"]}",
+        )
+
+    async def test_below_min_size(self):
+        response = await self.compressor.compress(self.response(body="tiny"), "gzip")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertNotIn("Vary", response.headers)
+        self.assertEqual(response.body, "tiny")
+
+    async def test_content_type_not_allowed(self):
+        response = self.response(content_type="image/png")
+        await self.compressor.compress(response, "gzip")
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    async def test_content_type_parameters_ignored(self):
+        self.assertTrue(self.compressor.is_compressible("text/html; charset=utf-8"))
+        self.assertTrue(self.compressor.is_compressible("Application/JSON"))
+        self.assertFalse(self.compressor.is_compressible("application/octet-stream"))
+        self.assertFalse(self.compressor.is_compressible(None))
+
+    async def test_no_acceptable_coding_still_varies(self):
+        response = self.response(headers={"Vary": "Cookie"})
+        await self.compressor.compress(response, "identity")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.headers["Vary"], "Cookie, Accept-Encoding")
+
+    async def test_already_encoded(self):
+        response = self.response(headers={"Content-Encoding": "br"})
+        await self.compressor.compress(response, "gzip")
+        self.assertEqual(response.headers["Content-Encoding"], "br")
+        self.assertEqual(response.body, self.body)
+
+    async def test_bodiless_status(self):
+        response = self.response(status_code=204)
+        await self.compressor.compress(response, "gzip")
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    async def test_partial_responses(self):
+        for response in (
+            self.response(status_code=206),
+            self.response(status_code=416),
+            self.response(headers={"Content-Range": "bytes 0-9/100"}),
+        ):
+            with self.subTest(status_code=response.status_code):
+                await self.compressor.compress(response, "gzip")
+                self.assertNotIn("Content-Encoding", response.headers)
+                self.assertEqual(response.body, self.body)
+
+    async def test_not_compressible_responses(self):
+        response = StreamingResponse(iter([b"x" * 1000]), content_type="text/plain")
+        await self.compressor.compress(response, "gzip")
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    async def test_etag_made_weak(self):
+        response = await self.compressor.compress(self.response(etag=True), "gzip")
+        self.assertTrue(response.headers["ETag"].startswith('W/"'))
+        response = self.response(headers={"ETag": 'W/"abc"'})
+        await self.compressor.compress(response, "gzip")
+        self.assertEqual(response.headers["ETag"], 'W/"abc"')
+
+    async def test_large_body_compressed_in_executor(self):
+        compressor = Compressor(min_size=100, thread_size=500)
+        loop = asyncio.get_running_loop()
+        with mock.patch.object(
+            loop, "run_in_executor", wraps=loop.run_in_executor
+        ) as run_in_executor:
+            response = await compressor.compress(self.response(), "gzip")
+        run_in_executor.assert_called_once()
+        self.assertEqual(gzip.decompress(response.body), self.body.encode())
+
+    def test_invalid_settings(self):
+        for kwargs in (
+            {"level": 0},
+            {"level": 10},
+            {"min_size": -1},
+            {"thread_size": "1"},
+        ):
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(ValueError):
+                    Compressor(**kwargs)
@@ -0,0 +1,121 @@
+import unittest
+
+from ...core.headers import Headers
+
+
+class TestHeaders(unittest.TestCase):
+    def setUp(self):
+        self.headers = Headers.from_raw(
+            [
+                (b"Host", b"example.com"),
+                (b"cookie", b"a=1"),
+                (b"X-Forwarded-For", b"10.0.0.1"),
+                (b"Cookie", b"b=2"),
+                (b"x-forwarded-for", b"10.0.0.2"),
+            ]
+        )
+
+    def test_case_insensitive_lookup(self):
+        self.assertEqual(self.headers["host"], "example.com")
+        self.assertEqual(self.headers["HOST"], "example.com")
+        self.assertIn("x-FORWARDED-for", self.headers)
+        self.assertNotIn("Accept", self.headers)
+        self.assertNotIn(1, self.headers)
+        self.assertEqual(self.headers.get("Accept", "*/*"), "*/*")
+        with self.assertRaises(KeyError):
+            self.headers["Accept"]
+
+    def test_repeated_headers_kept(self):
+        self.assertEqual(self.headers["Cookie"], "a=1")
+        self.assertEqual(self.headers.getall("COOKIE"), ["a=1", "b=2"])
+        self.assertEqual(
+            self.headers.getall("X-Forwarded-For"), ["10.0.0.1", "10.0.0.2"]
+        )
+        self.assertEqual(self.headers.getall("Accept"), [])
+        self.assertEqual(len(self.headers.raw), 5)
+
+    def test_bytes_names(self):
+        headers = Headers([(b"Content-Type", b"text/plain")])
+
+        self.assertIn(b"content-type", headers)
+        self.assertEqual(headers.get(b"CONTENT-TYPE"), "text/plain")
+        self.assertEqual(self.headers[b"Host"], "example.com")
+        self.assertEqual(self.headers.getall(b"cookie"), ["a=1", "b=2"])
+
+    def test_names_iterated_once(self):
+        self.assertEqual(list(self.headers), ["Host", "cookie", "X-Forwarded-For"])
+        self.assertEqual(len(self.headers), 3)
+        self.assertEqual(list(self.headers.keys()), list(self.headers))
+
+        self.headers.add("Accept", "*/*")
+        self.headers.add("cookie", "c=3")
+        self.assertEqual(len(self.headers), 4)
+        self.assertEqual(list(self.headers)[-1], "Accept")
+
+    def test_raw_access(self):
+        self.assertEqual(self.headers.get_raw("HOST"), b"example.com")
+        self.assertIsNone(self.headers.get_raw("Accept"))
+        self.assertEqual(self.headers.raw[1], (b"cookie", b"a=1"))
+
+    def test_index_built_lazily(self):
+        self.assertIsNone(self.headers._index)
+        self.headers.get("Host")
+        self.assertIsNotNone(self.headers._index)
+
+    def test_set_replaces_every_value(self):
+        self.headers["COOKIE"] = "c=3"
+
+        self.assertEqual(self.headers.getall("Cookie"), ["c=3"])
+        # The first occurrence keeps its place
+        self.assertEqual(list(self.headers)[1], "COOKIE")
+        self.assertEqual(self.headers["X-Forwarded-For"], "10.0.0.1")
+
+    def test_set_after_lookup_on_empty_headers(self):
+        headers = Headers()
+        self.assertNotIn("X-Test", headers)
+        headers["X-Test"] = "1"
+
+        self.assertEqual(headers["x-test"], "1")
+        self.assertIn("X-Test", headers)
+
+    def test_add_and_delete(self):
+        self.headers.get("Host")
+        self.headers.add("Cookie", "c=3")
+        self.assertEqual(self.headers.getall("cookie"), ["a=1", "b=2", "c=3"])
+
+        del self.headers["cookie"]
+        self.assertNotIn("Cookie", self.headers)
+        self.assertEqual(self.headers.getall("X-Forwarded-For")[1], "10.0.0.2")
+        with self.assertRaises(KeyError):
+            del self.headers["Cookie"]
+
+    def test_dict_compatibility(self):
+        headers = Headers({"Content-Type": "text/plain", "Content-Length": 5})
+
+        self.assertEqual(headers, {"Content-Type": "text/plain", "Content-Length": "5"})
+        self.assertEqual(headers.setdefault("ETag", '"x"'), '"x"')
+        self.assertEqual(headers.pop("content-length"), "5")
+        headers.update({"Vary": "Accept"})
+        self.assertEqual(
+            headers.items(),
+            [("Content-Type", "text/plain"), ("ETag", '"x"'), ("Vary", "Accept")],
+        )
+        self.assertEqual(
+            dict(self.headers),
+            {"Host": "example.com", "cookie": "a=1", "X-Forwarded-For": "10.0.0.1"},
+        )
+
+    def test_copy_is_independent(self):
+        copy = self.headers.copy()
+        copy["Host"] = "other"
+
+        self.assertEqual(self.headers["Host"], "example.com")
+        self.assertEqual(Headers(self.headers), self.headers)
+
+    def test_non_latin1_values(self):
+        headers = Headers({"X-Name": "日本"})
+        self.assertEqual(headers.get_raw("X-Name"), "日本".encode("utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+from unittest import mock
+
+from ...core.parser import (
+    PythonParser,
+    HttptoolsParser,
+    create_parser,
+    httptools,
+)
+
+
+class ParserConformance:
+    """
+    Behavior every parser backend must share, run once per backend.
+    """
+
+    parser_name = None
+
+    def setUp(self):
+        self.parser = create_parser(self.parser_name)
+
+    def test_request_line(self):
+        (method, path, http_version), headers = self.parser.parse(
+            b"GET /users/42?x=1&y=%20 HTTP/1.1\r\nHost: example.com\r\n\r\n"
+        )
+        self.assertEqual(method, "GET")
+        self.assertEqual(path, "/users/42?x=1&y=%20")
+        self.assertEqual(http_version, "HTTP/1.1")
+        self.assertEqual(headers["Host"], "example.com")
+
+    def test_http_10(self):
+        (method, _, http_version), headers = self.parser.parse(
+            b"POST /form HTTP/1.0\r\n\r\n"
+        )
+        self.assertEqual(method, "POST")
+        self.assertEqual(http_version, "HTTP/1.0")
+        self.assertEqual(len(headers), 0)
+
+    def test_headers_kept_as_sent(self):
+        _, headers = self.parser.parse(
+            b"GET / HTTP/1.1\r\n"
+            b"host: example.com:8080\r\n"
+            b"X-Padded:  \t value \t\r\n"
+            b"X-Empty:\r\n"
+            b"Cookie: a=1\r\n"
+            b"cookie: b=2\r\n\r\n"
+        )
+        self.assertEqual(
+            headers.raw,
+            [
+                (b"host", b"example.com:8080"),
+                (b"X-Padded", b"value"),
+                (b"X-Empty", b""),
+                (b"Cookie", b"a=1"),
+                (b"cookie", b"b=2"),
+            ],
+        )
+        self.assertEqual(headers["Host"], "example.com:8080")
+        self.assertEqual(headers.getall("Cookie"), ["a=1", "b=2"])
+
+    def test_latin1_values(self):
+        _, headers = self.parser.parse(b"GET / HTTP/1.1\r\nX-Name: caf\xe9\r\n\r\n")
+        self.assertEqual(headers["X-Name"], "café")
+
+    def test_leading_blank_line_ignored(self):
+        (method, path, _), _ = self.parser.parse(b"\r\nGET /a HTTP/1.1\r\n\r\n")
+        self.assertEqual((method, path), ("GET", "/a"))
+
+    def test_malformed_heads_rejected(self):
+        cases = (
+            b"GET /\r\n\r\n",
+            b"GET / HTTP/x\r\n\r\n",
+            b"GET / HTTP/0.9\r\n\r\n",
+            b"GET / HTTP/2.0\r\n\r\n",
+            b"GET / HTTP/1.1 extra\r\n\r\n",
+            b"GET / HTTP/1.1\r\nNoColon\r\n\r\n",
+            b"GET / HTTP/1.1\r\nHost : example.com\r\n\r\n",
+            b"GET / HTTP/1.1\r\n: value\r\n\r\n",
+        )
+        for data in cases:
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    self.parser.parse(data)
+
+
+class TestPythonParser(ParserConformance, unittest.TestCase):
+    parser_name = "python"
+
+    def test_obs_fold_rejected(self):
+        with self.assertRaises(ValueError):
+            self.parser.parse(b"GET / HTTP/1.1\r\nX-A: 1\r\n 2\r\n\r\n")
+
+    def test_repeated_lines_cached(self):
+        data = b"GET / HTTP/1.1\r\nHost: a\r\nX-Long: " + b"x" * 300 + b"\r\n\r\n"
+        _, first = self.parser.parse(data)
+        _, second = self.parser.parse(data)
+
+        self.assertIs(first.raw[0], second.raw[0])
+        self.assertEqual(list(self.parser._lines), [b"Host: a"])
+        self.assertEqual(second["X-Long"], "x" * 300)
+
+    def test_cache_bounded(self):
+        parser = PythonParser(cache_size=2)
+        for value in range(5):
+            parser.parse(b"GET / HTTP/1.1\r\nX-Id: %d\r\n\r\n" % value)
+        self.assertLessEqual(len(parser._lines), 2)
+
+        parser = PythonParser(cache_size=0)
+        parser.parse(b"GET / HTTP/1.1\r\nHost: a\r\n\r\n")
+        self.assertEqual(parser._lines, {})
+
+        with self.assertRaises(ValueError):
+            PythonParser(cache_size=-1)
+
+
+@unittest.skipIf(httptools is None, "httptools is not installed")
+class TestHttptoolsParser(ParserConformance, unittest.TestCase):
+    parser_name = "httptools"
+
+
+class TestCreateParser(unittest.TestCase):
+    def test_python(self):
+        self.assertIsInstance(create_parser("python"), PythonParser)
+
+    def test_auto_falls_back_to_python(self):
+        with mock.patch("areion.core.parser.httptools", None):
+            self.assertIsInstance(create_parser("auto"), PythonParser)
+
+    @unittest.skipIf(httptools is None, "httptools is not installed")
+    def test_auto_prefers_httptools(self):
+        self.assertIsInstance(create_parser("auto"), HttptoolsParser)
+
+    def test_httptools_missing(self):
+        with mock.patch("areion.core.parser.httptools", None):
+            with self.assertRaises(ValueError):
+                create_parser("httptools")
+
+    def test_unknown_parser(self):
+        with self.assertRaises(ValueError):
+            create_parser("fast")
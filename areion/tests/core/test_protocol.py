@@ -0,0 +1,514 @@
+import time
+import unittest
+from unittest import mock
+from unittest.mock import MagicMock
+
+import asyncio
+from ... import (
+    HttpServer,
+    HttpResponse,
+    HttpRequest,
+    StreamingResponse,
+    HTTP_STATUS_CODES,
+)
+from ...core.protocol import HttpProtocol, MAX_HEADER_SIZE
+
+
+class TestHttpProtocol(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # Responses formatted in a test and by the server must agree on the date
+        date_patcher = mock.patch(
+            "areion.core.response.date_header", return_value=b"Date: now\r\n"
+        )
+        date_patcher.start()
+        self.addCleanup(date_patcher.stop)
+        self.mock_router = MagicMock()
+        # Bodies are read before the handler runs unless a test opts in
+        self.mock_router.streams_body.return_value = False
+        self.mock_request_factory = MagicMock()
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        self.server = HttpServer(
+            router=self.mock_router,
+            request_factory=self.mock_request_factory,
+            logger=MagicMock(),
+            transport="protocol",
+            keep_alive_timeout=5,
+        )
+
+    def make_protocol(self):
+        protocol = HttpProtocol(self.server)
+        transport = MagicMock()
+        transport.is_closing.return_value = False
+        protocol.connection_made(transport)
+        return protocol, transport
+
+    def written(self, transport):
+        chunks = []
+        for name, args, _ in transport.method_calls:
+            if name == "write":
+                chunks.append(args[0])
+            elif name == "writelines":
+                chunks.extend(args[0])
+        return b"".join(chunks)
+
+    async def settle(self):
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    async def test_request_split_across_packets(self):
+        handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (handler, {}, False)
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(b"POST /test HTTP/1.1\r\nHost: local")
+        protocol.data_received(b"host\r\nContent-Length: 4\r\n\r\nda")
+        await self.settle()
+        handler.assert_not_called()
+
+        protocol.data_received(b"ta")
+        await self.settle()
+
+        request = handler.call_args.args[0]
+        self.assertEqual(request.method, "POST")
+        self.assertEqual(request.body, b"data")
+        self.assertEqual(
+            self.written(transport), HttpResponse(body=b"OK").format_response()
+        )
+        transport.close.assert_not_called()
+
+    async def test_head_trickled_byte_by_byte(self):
+        handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (handler, {}, False)
+        protocol, transport = self.make_protocol()
+
+        for byte in b"GET /test HTTP/1.1\r\nHost: localhost\r\n\r\n":
+            protocol.data_received(bytes([byte]))
+        await self.settle()
+
+        self.assertEqual(handler.call_args.args[0].headers["Host"], "localhost")
+        self.assertEqual(protocol._head._scanned, 0)
+
+    async def test_pipelined_requests_answered_in_order(self):
+        async def handler(request):
+            await asyncio.sleep(0)
+            return HttpResponse(body=request.path.encode())
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(
+            b"GET /one HTTP/1.1\r\nHost: localhost\r\n\r\n"
+            b"GET /two HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        )
+        await self.settle()
+
+        expected = (
+            HttpResponse(body=b"/one").format_response()
+            + HttpResponse(body=b"/two").format_response()
+        )
+        self.assertEqual(self.written(transport), expected)
+
+    async def test_pipelined_responses_coalesced_into_one_write(self):
+        handler = MagicMock(
+            side_effect=lambda request: HttpResponse(body=request.path.encode())
+        )
+        self.mock_router.get_handler.return_value = (handler, {}, False)
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(
+            b"GET /one HTTP/1.1\r\nHost: localhost\r\n\r\n"
+            b"GET /two HTTP/1.1\r\nHost: localhost\r\n\r\n"
+            b"GET /three HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        )
+        await self.settle()
+
+        transport.write.assert_not_called()
+        transport.writelines.assert_called_once_with(
+            [
+                HttpResponse(body=b"/one").format_response(),
+                HttpResponse(body=b"/two").format_response(),
+                HttpResponse(body=b"/three").format_response(),
+            ]
+        )
+        transport.close.assert_not_called()
+
+    async def test_pipelined_response_not_held_by_suspended_handler(self):
+        release = asyncio.Event()
+
+        async def handler(request):
+            if request.path == "/slow":
+                await release.wait()
+            return HttpResponse(body=request.path.encode())
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(
+            b"GET /fast HTTP/1.1\r\nHost: localhost\r\n\r\n"
+            b"GET /slow HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        )
+        await self.settle()
+        self.assertEqual(
+            self.written(transport), HttpResponse(body=b"/fast").format_response()
+        )
+
+        release.set()
+        await self.settle()
+
+        expected = (
+            HttpResponse(body=b"/fast").format_response()
+            + HttpResponse(body=b"/slow").format_response()
+        )
+        self.assertEqual(self.written(transport), expected)
+        transport.close.assert_not_called()
+
+    async def test_pipelined_responses_flushed_before_error(self):
+        handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (handler, {}, False)
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(
+            b"GET /one HTTP/1.1\r\nHost: localhost\r\n\r\nINVALID HEADER\r\n\r\n"
+        )
+        await self.settle()
+
+        expected = (
+            HttpResponse(body=b"OK").format_response()
+            + HttpResponse(
+                status_code=400, body=HTTP_STATUS_CODES[400]
+            ).format_response()
+        )
+        self.assertEqual(self.written(transport), expected)
+        transport.close.assert_called()
+
+    async def test_chunked_request_streamed_across_packets(self):
+        self.mock_router.streams_body.return_value = True
+        received = []
+
+        async def handler(request):
+            async for chunk in request.stream():
+                received.append(chunk)
+            return HttpResponse(body=b"".join(received))
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n4\r\nWi"
+        )
+        await self.settle()
+        self.assertEqual(received, [b"Wi"])
+        transport.write.assert_not_called()
+
+        protocol.data_received(b"ki\r\n5\r\npedia\r\n0\r\n\r\n")
+        await self.settle()
+
+        self.assertEqual(
+            self.written(transport),
+            HttpResponse(body=b"Wikipedia").format_response(),
+        )
+        transport.close.assert_not_called()
+
+    async def test_chunked_body_timeout_while_streaming(self):
+        self.mock_router.streams_body.return_value = True
+
+        async def handler(request):
+            async for chunk in request.stream():
+                pass
+            return HttpResponse(body=b"OK")
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        protocol, transport = self.make_protocol()
+        protocol.data_received(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n4\r\nWi"
+        )
+        await self.settle()
+
+        self.server._timer_wheel.expire(time.monotonic() + 31)
+        await self.settle()
+
+        response = HttpResponse(status_code=408, body=HTTP_STATUS_CODES[408])
+        self.assertEqual(self.written(transport), response.format_response())
+        transport.close.assert_called()
+
+    async def test_large_body_read_before_sync_handler(self):
+        self.server.buffer_size = 4
+        received = []
+
+        def handler(request):
+            received.append(request.body)
+            return HttpResponse(body=b"OK")
+
+        self.mock_router.get_handler.return_value = (handler, {}, False)
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n4\r\nWi"
+        )
+        await self.settle()
+        self.assertEqual(received, [])
+
+        protocol.data_received(
+            b"ki\r\n0\r\n\r\n"
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nContent-Length: 10\r\n\r\n"
+            b"0123456789"
+        )
+        await self.settle()
+
+        self.assertEqual(received, [b"Wiki", b"0123456789"])
+        self.assertEqual(
+            self.written(transport), HttpResponse(body=b"OK").format_response() * 2
+        )
+        transport.close.assert_not_called()
+
+    async def test_large_body_streamed_lazily(self):
+        self.mock_router.streams_body.return_value = True
+        self.server.buffer_size = 4
+        received = []
+
+        async def handler(request):
+            async for chunk in request.stream():
+                received.append(chunk)
+            return HttpResponse(body=b"OK")
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nContent-Length: 10\r\n"
+            b"Expect: 100-continue\r\n\r\n"
+        )
+        await self.settle()
+        self.assertEqual(self.written(transport), b"HTTP/1.1 100 Continue\r\n\r\n")
+
+        protocol.data_received(b"01234")
+        protocol.data_received(b"56789GET /next HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await self.settle()
+
+        self.assertEqual(b"".join(received), b"0123456789")
+        self.assertEqual(self.mock_router.get_handler.call_count, 2)
+        transport.close.assert_not_called()
+
+    async def test_content_length_over_max_body_size(self):
+        self.server.max_body_size = 10
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nContent-Length: 11\r\n\r\n"
+        )
+
+        self.assertTrue(self.written(transport).startswith(b"HTTP/1.1 413 "))
+        transport.close.assert_called()
+
+    async def test_unsupported_transfer_encoding(self):
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(
+            b"POST /test HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: gzip\r\n\r\n"
+        )
+
+        self.assertTrue(self.written(transport).startswith(b"HTTP/1.1 400 "))
+        transport.close.assert_called()
+
+    async def test_streaming_response_waits_for_resume_writing(self):
+        async def produce():
+            yield b"first"
+            yield b"second"
+
+        async def handler(request):
+            return StreamingResponse(produce())
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        protocol, transport = self.make_protocol()
+        protocol.pause_writing()
+
+        protocol.data_received(b"GET /export HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await self.settle()
+        self.assertIn(b"5\r\nfirst\r\n", self.written(transport))
+        self.assertNotIn(b"second", self.written(transport))
+
+        protocol.resume_writing()
+        await self.settle()
+        self.assertTrue(self.written(transport).endswith(b"6\r\nsecond\r\n0\r\n\r\n"))
+        transport.close.assert_not_called()
+
+    async def test_connection_close_closes_transport(self):
+        handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (handler, {}, False)
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(
+            b"GET /test HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n"
+        )
+        await self.settle()
+
+        transport.close.assert_called()
+
+    async def test_invalid_headers(self):
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(b"INVALID HEADER\r\n\r\n")
+
+        response = HttpResponse(status_code=400, body=HTTP_STATUS_CODES[400])
+        self.assertEqual(self.written(transport), response.format_response())
+        transport.close.assert_called()
+
+    async def test_invalid_content_length(self):
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(
+            b"POST /test HTTP/1.1\r\nHost: localhost\r\nContent-Length: abc\r\n\r\n"
+        )
+
+        response = HttpResponse(status_code=400, body=HTTP_STATUS_CODES[400])
+        self.assertEqual(self.written(transport), response.format_response())
+
+    async def test_headers_too_large(self):
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(b"GET / HTTP/1.1\r\nX: " + b"a" * MAX_HEADER_SIZE)
+
+        response = HttpResponse(status_code=431, body=HTTP_STATUS_CODES[431])
+        self.assertEqual(self.written(transport), response.format_response())
+        transport.close.assert_called()
+
+    async def test_request_line_too_long_rejected_early(self):
+        self.server.max_request_line = 100
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(b"GET /" + b"a" * 90)
+        transport.close.assert_not_called()
+        protocol.data_received(b"a" * 10)
+
+        response = HttpResponse(status_code=414, body=HTTP_STATUS_CODES[414])
+        self.assertEqual(self.written(transport), response.format_response())
+        transport.close.assert_called()
+
+    async def test_header_limits_checked_while_trickling(self):
+        self.server.max_header_count = 2
+        self.server.max_header_size = 20
+        cases = (
+            # Third header line completes before the head does
+            [b"GET / HTTP/1.1\r\nA: 1\r", b"\nB: 2\r\nC: 3\r\n"],
+            # A header line grows past max_header_size
+            [b"GET / HTTP/1.1\r\nA: 1\r\nB: ", b"0123456789", b"0123456789"],
+        )
+        for chunks in cases:
+            with self.subTest(chunks=chunks):
+                protocol, transport = self.make_protocol()
+                for chunk in chunks:
+                    transport.close.assert_not_called()
+                    protocol.data_received(chunk)
+
+                self.assertTrue(self.written(transport).startswith(b"HTTP/1.1 431 "))
+                transport.close.assert_called()
+
+    async def test_keep_alive_timeout(self):
+        protocol, transport = self.make_protocol()
+
+        protocol._on_timeout()
+
+        response = HttpResponse(status_code=408, body=HTTP_STATUS_CODES[408])
+        self.assertEqual(self.written(transport), response.format_response())
+        transport.close.assert_called()
+
+    async def test_header_timeout_via_timer_wheel(self):
+        protocol, transport = self.make_protocol()
+        protocol.data_received(b"GET /slow HTTP/1.1\r\n")
+
+        self.server._timer_wheel.expire(time.monotonic() + 11)
+
+        response = HttpResponse(status_code=408, body=HTTP_STATUS_CODES[408])
+        self.assertEqual(self.written(transport), response.format_response())
+        transport.close.assert_called()
+
+    async def test_body_timeout_via_timer_wheel(self):
+        protocol, transport = self.make_protocol()
+        protocol.data_received(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nContent-Length: 10\r\n\r\n"
+        )
+        self.assertEqual(protocol._timeout.phase, "body")
+
+        self.server._timer_wheel.expire(time.monotonic() + 31)
+
+        self.assertTrue(self.written(transport).startswith(b"HTTP/1.1 408 "))
+        self.mock_router.get_handler.assert_not_called()
+
+    async def test_idle_timeout_closes_without_response(self):
+        handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (handler, {}, False)
+        protocol, transport = self.make_protocol()
+        protocol.data_received(b"GET /test HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await self.settle()
+        self.assertEqual(protocol._timeout.phase, "idle")
+        transport.write.reset_mock()
+
+        self.server._timer_wheel.expire(time.monotonic() + 6)
+
+        transport.write.assert_not_called()
+        transport.close.assert_called()
+
+    async def test_drain_waits_for_resume_writing(self):
+        protocol, transport = self.make_protocol()
+
+        protocol.pause_writing()
+        drain = asyncio.ensure_future(protocol.drain())
+        await self.settle()
+        self.assertFalse(drain.done())
+
+        protocol.resume_writing()
+        await drain
+
+    async def test_connection_rejected_over_max_conns(self):
+        self.server.active_conns = self.server.max_conns
+        protocol, transport = self.make_protocol()
+
+        self.assertTrue(self.written(transport).startswith(b"HTTP/1.1 503 "))
+        transport.close.assert_called()
+
+        protocol.connection_lost(None)
+        self.assertEqual(self.server.active_conns, self.server.max_conns)
+        self.assertEqual(self.server.rejected_conns, 1)
+
+    async def test_connection_counts(self):
+        handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (handler, {}, False)
+        protocol, transport = self.make_protocol()
+        self.assertEqual(self.server.active_conns, 1)
+
+        protocol.data_received(b"GET /test HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await self.settle()
+        self.assertEqual(self.server.idle_conns, 1)
+
+        protocol.connection_lost(None)
+        self.assertEqual(self.server.active_conns, 0)
+        self.assertEqual(self.server.idle_conns, 0)
+
+    async def test_connection_lost_cancels_in_flight_request(self):
+        started = asyncio.Event()
+
+        async def handler(request):
+            started.set()
+            await asyncio.sleep(10)
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        protocol, transport = self.make_protocol()
+
+        protocol.data_received(b"GET /slow HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await started.wait()
+        task = protocol._task
+
+        protocol.connection_lost(None)
+        await self.settle()
+
+        self.assertTrue(task.cancelled())
+        transport.write.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
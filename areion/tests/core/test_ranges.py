@@ -0,0 +1,56 @@
+import unittest
+
+from ...core.ranges import MAX_RANGES, Multipart, parse_range
+
+
+class TestParseRange(unittest.TestCase):
+    def test_satisfiable_ranges(self):
+        cases = {
+            "bytes=0-499": [(0, 499)],
+            "bytes=500-": [(500, 999)],
+            "bytes=-200": [(800, 999)],
+            "bytes=-5000": [(0, 999)],
+            "bytes=900-5000": [(900, 999)],
+            "bytes=0-0, -1": [(0, 0), (999, 999)],
+            "Bytes = 1-2": [(1, 2)],
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 1000), expected)
+
+    def test_unsatisfiable_ranges(self):
+        for header in ("bytes=1000-", "bytes=1000-2000", "bytes=-0"):
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 1000), [])
+        self.assertEqual(parse_range("bytes=-10", 0), [])
+
+    def test_ignored_ranges(self):
+        for header in (
+            "items=0-1",
+            "bytes=",
+            "bytes=5-1",
+            "bytes=-",
+            "bytes=a-b",
+            "bytes=0-1;2-3",
+            "bytes=²-3",
+            "bytes=" + ",".join(["0-1"] * (MAX_RANGES + 1)),
+        ):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 1000))
+
+
+class TestMultipart(unittest.TestCase):
+    def test_content_length_matches_body(self):
+        body = bytes(range(100))
+        multipart = Multipart([(0, 9), (50, 50), (90, 99)], 100, "video/mp4")
+
+        data = multipart.join(body)
+
+        self.assertEqual(len(data), multipart.content_length)
+        self.assertTrue(data.endswith(multipart.tail))
+        self.assertIn(b"Content-Range: bytes 50-50/100\r\n\r\n2\r\n", data)
+        self.assertIn("boundary=", multipart.content_type)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import MagicMock
+
+import asyncio
+from ... import HttpServer, RequestHeaderFieldsTooLargeError, UriTooLongError
+from ...core.body import read_chunked
+from ...core.reader import ConnectionReader, HeadScanner
+
+
+def make_server(**kwargs):
+    return HttpServer(router=MagicMock(), request_factory=MagicMock(), **kwargs)
+
+
+def make_reader(data, eof=True):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    if eof:
+        reader.feed_eof()
+    return ConnectionReader(reader, make_server())
+
+
+class TestHeadScanner(unittest.TestCase):
+    def test_head_found_across_pieces(self):
+        scanner = HeadScanner(make_server())
+        buffer = bytearray()
+        for piece in (b"GET / HTTP/1.1\r\nHost: a\r", b"\n\r", b"\nBODY"):
+            end = scanner.find_end(buffer)
+            self.assertEqual(end, -1)
+            buffer += piece
+
+        self.assertEqual(scanner.find_end(buffer), len(buffer) - 4)
+
+    def test_limits_checked_before_head_ends(self):
+        server = make_server(max_request_line=20, max_header_count=2)
+        cases = (
+            (b"GET /" + b"a" * 20, UriTooLongError),
+            (
+                b"GET / HTTP/1.1\r\nA: 1\r\nB: 2\r\nC: 3\r\n",
+                RequestHeaderFieldsTooLargeError,
+            ),
+        )
+        for data, error in cases:
+            with self.subTest(error=error):
+                with self.assertRaises(error):
+                    HeadScanner(server).find_end(bytearray(data))
+
+
+class TestConnectionReader(unittest.IsolatedAsyncioTestCase):
+    async def test_read_head_keeps_what_follows(self):
+        reader = make_reader(
+            b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"3\r\nabc\r\n0\r\n\r\nGET /next HTTP/1.1\r\n\r\n"
+        )
+
+        head = await reader.read_head()
+        body = [chunk async for chunk in read_chunked(reader, 1024, 1024)]
+
+        self.assertTrue(head.endswith(b"chunked\r\n\r\n"))
+        self.assertEqual(body, [b"abc"])
+        self.assertTrue(reader.head_buffered())
+        self.assertEqual(await reader.read_head(), b"GET /next HTTP/1.1\r\n\r\n")
+        self.assertFalse(reader.head_buffered())
+
+    async def test_readexactly_past_buffer(self):
+        reader = make_reader(b"GET / HTTP/1.1\r\n\r\n0123")
+        await reader.read_head()
+
+        self.assertEqual(await reader.readexactly(2), b"01")
+        self.assertEqual(await reader.read(), b"23")
+        with self.assertRaises(asyncio.IncompleteReadError):
+            await reader.readexactly(1)
+
+    async def test_read_head_incomplete(self):
+        for data in (b"", b"GET / HTTP/1.1\r\n"):
+            with self.subTest(data=data):
+                with self.assertRaises(asyncio.IncompleteReadError) as context:
+                    await make_reader(data).read_head()
+                self.assertEqual(context.exception.partial, data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
 import unittest
+from unittest import mock
 from unittest.mock import Mock
+import asyncio
 from ... import HttpRequest, HttpRequestFactory, HttpResponse
+from ...core.body import RequestBody, read_chunked, read_length
 
 
 class TestHttpRequest(unittest.TestCase):
@@ -28,10 +31,45 @@ class TestHttpRequest(unittest.TestCase):
         self.assertEqual(self.request.get_header("Content-Type"), "application/json")
         self.assertIsNone(self.request.get_header("Non-Existent-Header"))
 
+    def test_path_and_query_parsed_lazily(self):
+        with mock.patch("areion.core.request.urlparse") as urlparse:
+            request = HttpRequest("GET", "/plain/path", {})
+            self.assertEqual(request.path, "/plain/path")
+            self.assertEqual(request.query_params, {})
+        urlparse.assert_not_called()
+
+        request = HttpRequest("GET", "/search?q=a&q=b&page=2#top", {})
+        self.assertEqual(request.path, "/search")
+        self.assertEqual(request.query_params, {"q": ["a", "b"], "page": ["2"]})
+        self.assertIs(request.query_params, request.query_params)
+
+    def test_path_and_query_assignable(self):
+        self.request.path = "/rewritten"
+        self.request.query_params = {"a": ["1"]}
+        self.assertEqual(self.request.path, "/rewritten")
+        self.assertEqual(self.request.get_query_param("a"), ["1"])
+
+    def test_cookies(self):
+        request = HttpRequest(
+            "GET", "/", {"Cookie": 'session=abc; theme="dark"; session=old; flag'}
+        )
+        self.assertEqual(request.cookies, {"session": "abc", "theme": "dark"})
+        self.assertEqual(self.request.cookies, {})
+
+    def test_no_instance_dict(self):
+        with self.assertRaises(AttributeError):
+            self.request.unknown = 1
+
     def test_add_metadata(self):
         self.request.add_metadata("user_id", 123)
         self.assertEqual(self.request.get_metadata("user_id"), 123)
 
+    def test_set_metadata(self):
+        self.request.metadata = {"user_id": 123}
+        self.assertEqual(self.request.get_metadata("user_id"), 123)
+        self.request.add_metadata("role", "admin")
+        self.assertEqual(self.request.metadata, {"user_id": 123, "role": "admin"})
+
     def test_get_metadata(self):
         self.assertIsNone(self.request.get_metadata("non_existent_key"))
         self.request.add_metadata("session_id", "abc123")
@@ -231,6 +269,52 @@ class TestHttpRequest(unittest.TestCase):
     # TODO: Add integration tests with server
 
 
+class TestHttpRequestStream(unittest.IsolatedAsyncioTestCase):
+    async def test_stream_buffered_body(self):
+        request = HttpRequest("POST", "/upload", {}, b"payload")
+        chunks = [chunk async for chunk in request.stream()]
+        self.assertEqual(chunks, [b"payload"])
+
+    async def test_stream_empty_body(self):
+        request = HttpRequest("GET", "/", {}, b"")
+        self.assertEqual([chunk async for chunk in request.stream()], [])
+
+    async def test_stream_request_body(self):
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"3\r\nabc\r\n2\r\nde\r\n0\r\n\r\n")
+        body = RequestBody(read_chunked(reader, 1024, 1024))
+        request = HttpRequest("POST", "/upload", {}, body)
+
+        self.assertIsNone(request.body)
+        chunks = [chunk async for chunk in request.stream()]
+        self.assertEqual(chunks, [b"abc", b"de"])
+
+    async def test_read_request_body(self):
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"0123456789")
+        body = RequestBody(read_length(reader, 10))
+        request = HttpRequest("POST", "/upload", {}, body)
+
+        self.assertEqual(await request.read(), b"0123456789")
+        self.assertEqual(request.body, b"0123456789")
+        self.assertEqual(await request.read(), b"0123456789")
+
+    async def test_read_buffered_body(self):
+        request = HttpRequest("GET", "/", {})
+        self.assertEqual(await request.read(), b"")
+        request = HttpRequest("POST", "/", {}, b"data")
+        self.assertEqual(await request.read(), b"data")
+
+    async def test_read_after_stream_fails(self):
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"abc")
+        request = HttpRequest("POST", "/", {}, RequestBody(read_length(reader, 3)))
+        async for _ in request.stream():
+            break
+        with self.assertRaises(RuntimeError):
+            await request.read()
+
+
 class TestHttpRequestFactory(unittest.TestCase):
 
     def setUp(self):
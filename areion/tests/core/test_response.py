@@ -1,5 +1,21 @@
+import asyncio
+import os
+import tempfile
 import unittest
-from ... import HttpResponse, HTTP_STATUS_CODES
+from unittest import mock
+from unittest.mock import AsyncMock, MagicMock
+
+from ... import HttpResponse, StreamingResponse, FileResponse, HTTP_STATUS_CODES
+from ...core.response import (
+    HeadResponse,
+    NotModifiedResponse,
+    PreformattedResponse,
+    date_header,
+    file_etag,
+    http_date,
+    join_response,
+    status_line,
+)
 
 
 class TestHttpResponse(unittest.TestCase):
@@ -120,6 +136,80 @@ class TestHttpResponse(unittest.TestCase):
                     f"Status {status_code}".encode("utf-8"), formatted_response
                 )
 
+    def test_status_line(self):
+        self.assertEqual(status_line(404), b"HTTP/1.1 404 Not Found\r\n")
+        self.assertIs(status_line(200), status_line(200))
+        self.assertEqual(status_line(299), b"HTTP/1.1 299 \r\n")
+
+    @mock.patch("time.time")
+    def test_date_header_formatted_once_per_second(self, time):
+        time.return_value = 1445412480.2
+        first = date_header()
+        time.return_value = 1445412480.9
+        self.assertIs(date_header(), first)
+        self.assertEqual(first, b"Date: Wed, 21 Oct 2015 07:28:00 GMT\r\n")
+        time.return_value = 1445412481.0
+        self.assertEqual(date_header(), b"Date: Wed, 21 Oct 2015 07:28:01 GMT\r\n")
+
+    @mock.patch("areion.core.response.date_header", return_value=b"Date: now\r\n")
+    def test_format_response_layout(self, _):
+        response = HttpResponse(
+            body="hi",
+            headers={"Server": "nginx", "Content-Length": "99", "X-Custom": "1"},
+        )
+
+        self.assertEqual(
+            response.format_response(),
+            b"HTTP/1.1 200 OK\r\nDate: now\r\nX-Custom: 1\r\n"
+            b"Content-Type: text/plain\r\nServer: Areion\r\n"
+            b"Content-Length: 2\r\n\r\nhi",
+        )
+        # Formatting leaves the handler's headers alone
+        self.assertEqual(response.headers["Content-Length"], "99")
+
+    @mock.patch("areion.core.response.date_header", return_value=b"Date: now\r\n")
+    def test_repeated_headers_formatted(self, _):
+        response = HttpResponse(body="hi", headers=[("set-cookie", "a=1")])
+        response.headers.add("Set-Cookie", "b=2")
+
+        self.assertEqual(
+            response.format_response(),
+            b"HTTP/1.1 200 OK\r\nDate: now\r\nset-cookie: a=1\r\n"
+            b"Content-Type: text/plain\r\nSet-Cookie: b=2\r\nServer: Areion\r\n"
+            b"Content-Length: 2\r\n\r\nhi",
+        )
+        self.assertEqual(response.headers.getall("Set-Cookie"), ["a=1", "b=2"])
+
+    @mock.patch("areion.core.response.date_header", return_value=b"Date: now\r\n")
+    def test_format_parts_leave_out_date(self, _):
+        line, head, body = HttpResponse(body="hi").format_parts()
+
+        self.assertEqual(line, b"HTTP/1.1 200 OK\r\n")
+        self.assertNotIn(b"Date:", head)
+        self.assertTrue(head.endswith(b"Content-Length: 2\r\n\r\n"))
+        self.assertEqual(body, b"hi")
+        self.assertEqual(
+            join_response(line, head, body), line + b"Date: now\r\n" + head + body
+        )
+
+    def test_format_body_types(self):
+        cases = {
+            "text": b"text",
+            b"raw": b"raw",
+            42: b"42",
+            None: b"None",
+        }
+        for body, expected in cases.items():
+            with self.subTest(body=body):
+                self.assertEqual(HttpResponse(body=body)._format_body(), expected)
+        self.assertEqual(HttpResponse(body={"a": [1]})._format_body(), b'{"a":[1]}')
+
+    def test_no_instance_dict(self):
+        for response in (HttpResponse(), StreamingResponse([])):
+            with self.subTest(response=type(response).__name__):
+                with self.assertRaises(AttributeError):
+                    response.unknown = 1
+
     def test_infer_content_type(self):
         self.assertEqual(
             HttpResponse()._infer_content_type({"key": "value"}), "application/json"
@@ -160,5 +250,392 @@ class TestHttpResponse(unittest.TestCase):
             response.set_status_code(999)
 
 
+class TestConditionalResponse(unittest.TestCase):
+    LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+    def test_content_hash_etag(self):
+        first = HttpResponse(body={"a": 1}, etag=True)
+        second = HttpResponse(body={"a": 1}, etag=True)
+        other = HttpResponse(body={"a": 2}, etag=True)
+
+        self.assertEqual(first.get_etag(), second.get_etag())
+        self.assertNotEqual(first.get_etag(), other.get_etag())
+        self.assertRegex(first.get_etag(), r'^"[0-9a-f]{32}"$')
+        self.assertIn(b"ETag: " + first.get_etag().encode(), first.format_response())
+
+    def test_etag_set_on_format_without_conditional_request(self):
+        response = HttpResponse(body="hello", etag=True)
+
+        data = response.format_response()
+
+        self.assertIn(b"ETag: ", data)
+        self.assertEqual(response.headers["ETag"], response.get_etag())
+
+    def test_body_serialized_once_for_etag(self):
+        response = HttpResponse(body={"a": 1}, etag=True)
+        response.get_etag()
+
+        with mock.patch.object(HttpResponse, "_format_body") as format_body:
+            data = response.format_response()
+
+        format_body.assert_not_called()
+        self.assertTrue(data.endswith(b'{"a":1}'))
+
+    def test_cleared_body_not_sent_after_etag(self):
+        response = HttpResponse(body=b"payload", etag=True)
+        response.get_etag()
+        response.body = b""
+
+        self.assertTrue(response.format_response().endswith(b"\r\n\r\n"))
+
+    def test_no_etag_by_default(self):
+        response = HttpResponse(body="hello")
+
+        self.assertIsNone(response.get_etag())
+        self.assertFalse(response.is_not_modified({"If-None-Match": '"x"'}))
+
+    def test_if_none_match(self):
+        response = HttpResponse(body="hello", headers={"ETag": '"v1"'})
+        cases = {
+            '"v1"': True,
+            '"v0", "v1"': True,
+            'W/"v1"': True,
+            "*": True,
+            '"v2"': False,
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(
+                    response.is_not_modified({"If-None-Match": value}), expected
+                )
+
+    def test_if_modified_since(self):
+        response = HttpResponse(
+            body="hello", headers={"Last-Modified": self.LAST_MODIFIED}
+        )
+        cases = {
+            self.LAST_MODIFIED: True,
+            "Thu, 22 Oct 2015 07:28:00 GMT": True,
+            "Tue, 20 Oct 2015 07:28:00 GMT": False,
+            "not a date": False,
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(
+                    response.is_not_modified({"If-Modified-Since": value}), expected
+                )
+
+    def test_if_none_match_takes_precedence(self):
+        response = HttpResponse(
+            body="hello",
+            headers={"ETag": '"v1"', "Last-Modified": self.LAST_MODIFIED},
+        )
+
+        self.assertFalse(
+            response.is_not_modified(
+                {"If-None-Match": '"v2"', "If-Modified-Since": self.LAST_MODIFIED}
+            )
+        )
+
+    @mock.patch("areion.core.response.date_header", return_value=b"Date: now\r\n")
+    def test_not_modified_keeps_validators_only(self, _):
+        response = HttpResponse(
+            body="hello",
+            headers={
+                "ETag": '"v1"',
+                "Cache-Control": "max-age=60",
+                "X-Custom": "1",
+            },
+        )
+
+        not_modified = response.not_modified()
+
+        self.assertIsInstance(not_modified, NotModifiedResponse)
+        self.assertEqual(
+            not_modified.format_response(),
+            b'HTTP/1.1 304 Not Modified\r\nDate: now\r\nETag: "v1"\r\n'
+            b"Cache-Control: max-age=60\r\nServer: Areion\r\n\r\n",
+        )
+
+    def test_http_date(self):
+        self.assertEqual(http_date(1445412480), self.LAST_MODIFIED)
+
+
+class TestHeadResponse(unittest.TestCase):
+    @mock.patch("areion.core.response.date_header", return_value=b"Date: now\r\n")
+    def test_bytes_body_length_kept(self, _):
+        response = HttpResponse(body=b"hello", content_type="text/plain").for_head()
+
+        self.assertIsInstance(response, HeadResponse)
+        self.assertEqual(response.body, b"")
+        self.assertEqual(
+            response.format_response(),
+            b"HTTP/1.1 200 OK\r\nDate: now\r\nContent-Type: text/plain\r\n"
+            b"Server: Areion\r\nContent-Length: 5\r\n\r\n",
+        )
+
+    def test_body_not_serialized(self):
+        response = HttpResponse(body={"a": 1})
+        with mock.patch.object(HttpResponse, "_format_body") as format_body:
+            head = response.for_head().format_response()
+
+        format_body.assert_not_called()
+        self.assertNotIn(b"Content-Length", head)
+        self.assertTrue(head.endswith(b"Server: Areion\r\n\r\n"))
+
+    def test_etag_matches_get(self):
+        get = HttpResponse(body={"a": 1}, etag=True)
+        get.format_response()
+        head = HttpResponse(body={"a": 1}, etag=True).for_head()
+
+        self.assertEqual(head.headers["ETag"], get.headers["ETag"])
+        self.assertIn(b"Content-Length: 7\r\n", head.format_response())
+
+    def test_bodiless_responses_returned_as_is(self):
+        not_modified = NotModifiedResponse()
+        streaming = StreamingResponse(iter([b"a"]))
+
+        self.assertIs(not_modified.for_head(), not_modified)
+        self.assertIs(streaming.for_head(), streaming)
+
+
+class TestPreformattedResponse(unittest.TestCase):
+    @mock.patch("areion.core.response.date_header", return_value=b"Date: now\r\n")
+    def test_formatted_once(self, _):
+        response = PreformattedResponse(
+            status_code=405, body="No", headers={"Allow": "GET"}
+        )
+        expected = HttpResponse(
+            status_code=405, body="No", headers={"Allow": "GET"}
+        ).format_response()
+
+        with mock.patch.object(HttpResponse, "format_parts") as format_parts:
+            self.assertEqual(response.format_response(), expected)
+            self.assertEqual(response.format_response(), expected)
+        format_parts.assert_not_called()
+        self.assertFalse(response.compressible)
+
+
+class TestStreamingResponse(unittest.IsolatedAsyncioTestCase):
+    def make_writer(self):
+        writer = MagicMock()
+        writer.drain = AsyncMock()
+        return writer
+
+    def written(self, writer):
+        chunks = []
+        for name, args, _ in writer.method_calls:
+            if name == "write":
+                chunks.append(args[0])
+            elif name == "writelines":
+                chunks.extend(args[0])
+        return b"".join(chunks)
+
+    @mock.patch("areion.core.response.date_header", return_value=b"Date: now\r\n")
+    async def test_async_iterator_chunked(self, _):
+        async def produce():
+            yield b"hello "
+            yield ""
+            yield "world"
+
+        response = StreamingResponse(produce(), content_type="text/plain")
+        writer = self.make_writer()
+
+        await response.write_to(writer)
+
+        self.assertEqual(
+            self.written(writer),
+            b"HTTP/1.1 200 OK\r\nDate: now\r\nContent-Type: text/plain\r\n"
+            b"Server: Areion\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"6\r\nhello \r\n5\r\nworld\r\n0\r\n\r\n",
+        )
+        # Drained after every non-empty chunk and once at the end
+        self.assertEqual(writer.drain.await_count, 3)
+
+    async def test_sync_iterator(self):
+        response = StreamingResponse(iter([b"a,b\n", b"c,d\n"]))
+        writer = self.make_writer()
+
+        await response.write_to(writer)
+
+        self.assertTrue(
+            self.written(writer).endswith(b"4\r\na,b\n\r\n4\r\nc,d\n\r\n0\r\n\r\n")
+        )
+        self.assertEqual(response.content_type, "application/octet-stream")
+
+    async def test_not_chunked_for_http10(self):
+        response = StreamingResponse([b"abc", b"def"])
+        writer = self.make_writer()
+
+        await response.write_to(writer, chunked=False)
+
+        data = self.written(writer)
+        self.assertNotIn(b"Transfer-Encoding", data)
+        self.assertTrue(data.endswith(b"\r\n\r\nabcdef"))
+
+    async def test_head_only(self):
+        response = StreamingResponse([b"abc"])
+        writer = self.make_writer()
+
+        await response.write_to(writer, send_body=False)
+
+        self.assertTrue(self.written(writer).endswith(b"chunked\r\n\r\n"))
+
+    def test_format_response_not_supported(self):
+        with self.assertRaises(TypeError):
+            StreamingResponse([b"abc"]).format_response()
+
+
+class TestFileResponse(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        file = tempfile.NamedTemporaryFile(suffix=".txt", delete=False)
+        file.write(b"0123456789" * 10)
+        file.close()
+        self.path = file.name
+        self.addCleanup(os.unlink, self.path)
+
+    def make_writer(self):
+        # No transport attribute, so the executor fallback is used
+        writer = MagicMock(spec=["write", "drain"])
+        writer.drain = AsyncMock()
+        return writer
+
+    def written(self, writer):
+        return b"".join(
+            args[0] for name, args, _ in writer.method_calls if name == "write"
+        )
+
+    async def test_sends_file_with_content_length(self):
+        response = FileResponse(self.path)
+        response.chunk_size = 32
+        writer = self.make_writer()
+
+        self.assertTrue(await response.write_to(writer))
+
+        data = self.written(writer)
+        head, body = data.split(b"\r\n\r\n", 1)
+        self.assertIn(b"Content-Type: text/plain", head)
+        self.assertIn(b"Content-Length: 100", head)
+        self.assertNotIn(b"Transfer-Encoding", head)
+        self.assertEqual(body, b"0123456789" * 10)
+        # Head plus four reads of at most chunk_size bytes
+        self.assertEqual(writer.write.call_count, 5)
+
+    async def test_head_only(self):
+        response = FileResponse(self.path)
+        writer = self.make_writer()
+
+        self.assertTrue(await response.write_to(writer, send_body=False))
+
+        self.assertTrue(self.written(writer).endswith(b"Content-Length: 100\r\n\r\n"))
+
+    async def test_file_shrunk_while_sending(self):
+        stat_result = os.stat(self.path)
+        with open(self.path, "wb") as file:
+            file.write(b"short")
+        response = FileResponse(self.path, stat_result=stat_result)
+        writer = self.make_writer()
+
+        self.assertFalse(await response.write_to(writer))
+        self.assertTrue(self.written(writer).endswith(b"\r\n\r\nshort"))
+
+    async def test_sendfile_on_transport(self):
+        response = FileResponse(self.path)
+        writer = self.make_writer()
+        writer.transport = MagicMock(spec=asyncio.WriteTransport)
+        loop = asyncio.get_running_loop()
+
+        with mock.patch.object(
+            loop, "sendfile", AsyncMock(return_value=100)
+        ) as sendfile:
+            self.assertTrue(await response.write_to(writer))
+
+        sendfile.assert_awaited_once()
+        self.assertIs(sendfile.await_args.args[0], writer.transport)
+        self.assertEqual(sendfile.await_args.args[2:], (0, 100))
+        self.assertEqual(writer.write.call_count, 1)
+
+    async def test_validators_from_stat(self):
+        stat_result = os.stat(self.path)
+        response = FileResponse(self.path, stat_result=stat_result)
+
+        self.assertEqual(response.get_etag(), file_etag(stat_result))
+        self.assertEqual(
+            response.headers["Last-Modified"], http_date(stat_result.st_mtime)
+        )
+        self.assertTrue(
+            response.is_not_modified({"If-None-Match": response.get_etag()})
+        )
+
+    async def test_validators_set_after_fstat(self):
+        response = FileResponse(self.path)
+        writer = self.make_writer()
+
+        await response.write_to(writer)
+
+        self.assertIn(b"ETag: ", self.written(writer))
+        self.assertIn(b"Last-Modified: ", self.written(writer))
+
+    async def test_single_range(self):
+        response = FileResponse(self.path).with_range("bytes=10-14")
+        writer = self.make_writer()
+
+        self.assertTrue(await response.write_to(writer))
+
+        head, body = self.written(writer).split(b"\r\n\r\n", 1)
+        self.assertTrue(head.startswith(b"HTTP/1.1 206 Partial Content"))
+        self.assertIn(b"Content-Range: bytes 10-14/100", head)
+        self.assertIn(b"Content-Length: 5", head)
+        self.assertEqual(body, b"01234")
+
+    async def test_multiple_ranges(self):
+        response = FileResponse(self.path).with_range("bytes=0-1,-3")
+        writer = self.make_writer()
+
+        self.assertTrue(await response.write_to(writer))
+
+        head, body = self.written(writer).split(b"\r\n\r\n", 1)
+        self.assertIn(b"Content-Type: multipart/byteranges; boundary=", head)
+        self.assertIn(f"Content-Length: {len(body)}".encode(), head)
+        self.assertIn(b"Content-Range: bytes 0-1/100\r\n\r\n01\r\n--", body)
+        self.assertIn(b"Content-Range: bytes 97-99/100\r\n\r\n789\r\n--", body)
+
+    async def test_unsatisfiable_range(self):
+        response = FileResponse(self.path).with_range("bytes=500-")
+        writer = self.make_writer()
+
+        await response.write_to(writer)
+
+        data = self.written(writer)
+        self.assertTrue(data.startswith(b"HTTP/1.1 416 Range Not Satisfiable"))
+        self.assertIn(b"Content-Range: bytes */100", data)
+
+    async def test_range_sent_with_sendfile_offset(self):
+        response = FileResponse(self.path).with_range("bytes=40-")
+        writer = self.make_writer()
+        writer.transport = MagicMock(spec=asyncio.WriteTransport)
+        loop = asyncio.get_running_loop()
+
+        with mock.patch.object(
+            loop, "sendfile", AsyncMock(return_value=60)
+        ) as sendfile:
+            self.assertTrue(await response.write_to(writer))
+
+        self.assertEqual(sendfile.await_args.args[2:], (40, 60))
+
+    def test_if_range(self):
+        stat_result = os.stat(self.path)
+        response = FileResponse(self.path, stat_result=stat_result)
+
+        self.assertTrue(response.if_range_matches(response.headers["ETag"]))
+        self.assertTrue(response.if_range_matches(response.headers["Last-Modified"]))
+        self.assertFalse(response.if_range_matches('"stale"'))
+        self.assertFalse(response.if_range_matches("W/" + response.headers["ETag"]))
+
+    def test_unknown_type_defaults_to_octet_stream(self):
+        response = FileResponse("data.unknownext")
+        self.assertEqual(response.content_type, "application/octet-stream")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,8 @@
+import gzip
+import os
+import tempfile
+import threading
+import time
 import unittest
 from io import BytesIO
 from unittest import mock
@@ -7,17 +12,36 @@ import asyncio
 from ... import (
     HttpServer,
     HttpResponse,
+    StreamingResponse,
     HttpRequest,
+    HttpRequestFactory,
     HTTP_STATUS_CODES,
     MethodNotAllowedError,
     HttpError,
+    BadRequestError,
+    PayloadTooLargeError,
+    UriTooLongError,
+    RequestHeaderFieldsTooLargeError,
 )
+from ...default.router import Router
+from ...core.compression import Compressor
+from ...core.static import StaticFileCache
+from ...core.headers import Headers
+from ...core.threadpool import HandlerPool, ThreadedHandler
 
 
 class TestHttpServer(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
+        # Responses formatted in a test and by the server must agree on the date
+        date_patcher = mock.patch(
+            "areion.core.response.date_header", return_value=b"Date: now\r\n"
+        )
+        date_patcher.start()
+        self.addCleanup(date_patcher.stop)
         # Mock dependencies
         self.mock_router = MagicMock()
+        # Bodies are read before the handler runs unless a test opts in
+        self.mock_router.streams_body.return_value = False
         self.mock_request_factory = MagicMock()
         self.mock_logger = MagicMock()
 
@@ -38,7 +62,17 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(self.server.max_conns, 10)
         self.assertEqual(self.server.buffer_size, 1024)
         self.assertEqual(self.server.keep_alive_timeout, 5)
-        self.assertIsNotNone(self.server.semaphore)
+        self.assertEqual(self.server.overload_policy, "reject")
+        self.assertEqual(
+            self.server.get_connection_stats(),
+            {
+                "active": 0,
+                "idle": 0,
+                "rejected": 0,
+                "max_conns": 10,
+                "accepting": True,
+            },
+        )
         self.assertEqual(self.server.router, self.mock_router)
         self.assertEqual(self.server.request_factory, self.mock_request_factory)
         self.assertEqual(self.server.logger, self.mock_logger)
@@ -122,13 +156,24 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
             str(context.exception), "Keep alive timeout must be a positive integer."
         )
 
+    def test_initialization_invalid_transport(self):
+        with self.assertRaises(ValueError) as context:
+            HttpServer(
+                router=self.mock_router,
+                request_factory=self.mock_request_factory,
+                transport="carrier-pigeon",
+            )
+        self.assertEqual(
+            str(context.exception), "Transport must be one of: stream, protocol."
+        )
+
     async def test_handle_client_normal_request(self):
         mock_reader = AsyncMock()
         mock_writer = MagicMock()
 
         # Simulate reading headers and body
         request_line = b"GET /test HTTP/1.1\r\nHost: localhost\r\n\r\n"
-        mock_reader.readuntil = AsyncMock(return_value=request_line)
+        mock_reader.read = AsyncMock(side_effect=[request_line, b""])
         mock_reader.readexactly = AsyncMock(return_value=b"")
 
         # Mock request_factory
@@ -152,30 +197,12 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
         expected_response = HttpResponse(status_code=200, body=b"OK")
         mock_writer.write.assert_called_with(expected_response.format_response())
 
-    async def test_handle_client_timeout_on_headers(self):
-        mock_reader = AsyncMock()
-        mock_writer = MagicMock()
-
-        # Simulate timeout when reading headers
-        mock_reader.readuntil = AsyncMock(side_effect=asyncio.TimeoutError())
-
-        await self.server._handle_client(mock_reader, mock_writer)
-
-        # Verify that a 408 response was sent
-        response = HttpResponse(status_code=408, body=HTTP_STATUS_CODES[408])
-        mock_writer.write.assert_called_with(response.format_response())
-
-        # Verify that connection was closed
-        mock_writer.is_closing.assert_called()
-
     async def test_handle_client_incomplete_read(self):
         mock_reader = AsyncMock()
         mock_writer = MagicMock()
 
         # Simulate incomplete read
-        mock_reader.readuntil = AsyncMock(
-            side_effect=asyncio.IncompleteReadError(partial=b"GET /", expected=10)
-        )
+        mock_reader.read = AsyncMock(side_effect=[b"GET /", b""])
 
         await self.server._handle_client(mock_reader, mock_writer)
 
@@ -187,22 +214,85 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
         mock_writer.is_closing.assert_called()
 
     async def test_handle_client_limit_overrun(self):
-        mock_reader = AsyncMock()
-        mock_writer = MagicMock()
+        cases = {
+            b"GET /" + b"a" * 9000: 414,
+            b"GET / HTTP/1.1\r\nX-Big: " + b"a" * 9000: 431,
+        }
+        for buffered, status_code in cases.items():
+            with self.subTest(status_code=status_code):
+                mock_reader = AsyncMock()
+                mock_writer = MagicMock()
 
-        # Simulate limit overrun
-        mock_reader.readuntil = AsyncMock(
-            side_effect=asyncio.LimitOverrunError(consumed=10, message=b"")
+                # The limit is broken before the end of the head arrives
+                mock_reader.read = AsyncMock(side_effect=[buffered])
+
+                await self.server._handle_client(mock_reader, mock_writer)
+
+                response = HttpResponse(
+                    status_code=status_code, body=HTTP_STATUS_CODES[status_code]
+                )
+                mock_writer.write.assert_called_with(response.format_response())
+                mock_writer.is_closing.assert_called()
+
+    def test_check_head_limits(self):
+        server = HttpServer(
+            router=self.mock_router,
+            request_factory=self.mock_request_factory,
+            max_request_line=20,
+            max_header_count=3,
+            max_header_size=16,
+            max_header_bytes=60,
         )
 
-        await self.server._handle_client(mock_reader, mock_writer)
+        def head(*lines):
+            return b"\r\n".join((b"GET /path HTTP/1.1",) + lines) + b"\r\n\r\n"
 
-        # Verify that a 413 response was sent
-        response = HttpResponse(status_code=413, body=HTTP_STATUS_CODES[413])
-        mock_writer.write.assert_called_with(response.format_response())
+        server._check_head_limits(head(b"A: 1", b"B: 2", b"C: 0123456789ab"))
+        cases = {
+            b"GET /" + b"a" * 20 + b" HTTP/1.1\r\n\r\n": UriTooLongError,
+            head(b"A: 1", b"B: 2", b"C: 3", b"D: 4"): RequestHeaderFieldsTooLargeError,
+            head(b"A: 0123456789abcd"): RequestHeaderFieldsTooLargeError,
+            head(*[b"A: 0123456789ab"] * 3): RequestHeaderFieldsTooLargeError,
+        }
+        for data, error in cases.items():
+            with self.subTest(data=data):
+                with self.assertRaises(error):
+                    server._check_head_limits(data)
+
+    async def test_head_limits_answered(self):
+        self.server.max_header_count = 1
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(b"GET / HTTP/1.1\r\nA: 1\r\nB: 2\r\n\r\n")
+
+        await self.server._handle_client(reader, writer)
+
+        self.assertTrue(writer.write.call_args.args[0].startswith(b"HTTP/1.1 431 "))
+        self.mock_router.get_handler.assert_not_called()
+
+    async def test_head_limits_checked_while_arriving(self):
+        self.server.max_request_line = 100
+        self.server.max_header_count = 2
+        self.server.max_header_size = 20
+        cases = {
+            b"GET /" + b"a" * 100: 414,
+            # Third header line completes before the head does
+            b"GET / HTTP/1.1\r\nA: 1\r\nB: 2\r\nC: 3\r\n": 431,
+            # A header line grows past max_header_size
+            b"GET / HTTP/1.1\r\nA: 1\r\nB: 01234567890123456789": 431,
+        }
+        for data, status_code in cases.items():
+            with self.subTest(status_code=status_code):
+                reader, writer = self.make_stream_connection()
+                reader.feed_data(data)
 
-        # Verify that connection was closed
-        mock_writer.is_closing.assert_called()
+                # Answered without waiting for the rest of the head
+                await self.server._handle_client(reader, writer)
+
+                response = HttpResponse(
+                    status_code=status_code, body=HTTP_STATUS_CODES[status_code]
+                )
+                writer.write.assert_called_once_with(response.format_response())
+                self.mock_router.get_handler.assert_not_called()
 
     async def test_handle_client_invalid_headers(self):
         mock_reader = AsyncMock()
@@ -210,7 +300,7 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
 
         # Malformed headers
         malformed_headers = b"INVALID HEADER\r\n\r\n"
-        mock_reader.readuntil = AsyncMock(return_value=malformed_headers)
+        mock_reader.read = AsyncMock(side_effect=[malformed_headers, b""])
 
         await self.server._handle_client(mock_reader, mock_writer)
 
@@ -221,28 +311,106 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
         # Verify that connection was closed
         mock_writer.is_closing.assert_called()
 
-    async def test_handle_client_chunked_transfer_encoding(self):
+    async def test_handle_client_unsupported_transfer_encoding(self):
         mock_reader = AsyncMock()
         mock_writer = MagicMock()
 
-        # Headers with Transfer-Encoding: chunked
-        headers = b"GET /test HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n"
-        mock_reader.readuntil = AsyncMock(return_value=headers)
+        # Only the chunked coding is decoded
+        headers = b"POST /test HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: gzip, chunked\r\n\r\n"
+        mock_reader.read = AsyncMock(side_effect=[headers, b""])
 
         await self.server._handle_client(mock_reader, mock_writer)
 
         # Verify that a 501 response was sent
-        response = HttpResponse(status_code=501, body="Not Implemented")
+        response = HttpResponse(
+            status_code=501, body="Not Implemented", content_type="text/plain"
+        )
         mock_writer.write.assert_called_with(response.format_response())
 
         # Verify that connection was closed
         mock_writer.is_closing.assert_called()
 
+    async def test_handle_client_chunked_request_streamed(self):
+        self.mock_router.streams_body.return_value = True
+        received = []
+
+        async def handler(request):
+            self.assertIsNone(request.body)
+            async for chunk in request.stream():
+                received.append(chunk)
+            return HttpResponse(body=b"OK")
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"4\r\nWiki\r\n6;ext=1\r\npedia \r\n0\r\nX-Trailer: 1\r\n\r\n"
+            b"GET /next HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        )
+        reader.feed_eof()
+
+        await self.server._handle_client(reader, writer)
+
+        self.assertEqual(b"".join(received), b"Wikipedia ")
+        # The connection stays usable for the pipelined request after the body
+        self.assertEqual(self.mock_router.get_handler.call_count, 2)
+
+    async def test_handle_client_chunked_unread_body_closes_connection(self):
+        self.mock_router.streams_body.return_value = True
+        mock_handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (mock_handler, {}, False)
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"4\r\nWiki\r\n"
+        )
+
+        await self.server._handle_client(reader, writer)
+
+        writer.write.assert_called_once_with(HttpResponse(body=b"OK").format_response())
+        self.mock_router.get_handler.assert_called_once()
+
+    async def test_handle_client_chunked_and_content_length_rejected(self):
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nContent-Length: 4\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+
+        await self.server._handle_client(reader, writer)
+
+        self.assertTrue(writer.write.call_args.args[0].startswith(b"HTTP/1.1 400 "))
+        self.mock_router.get_handler.assert_not_called()
+
+    async def test_handle_client_chunk_too_large(self):
+        self.server.max_chunk_size = 8
+
+        async def handler(request):
+            async for chunk in request.stream():
+                pass
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"10\r\n"
+        )
+
+        await self.server._handle_client(reader, writer)
+
+        self.assertTrue(writer.write.call_args.args[0].startswith(b"HTTP/1.1 413 "))
+
     async def test_handle_client_method_not_allowed(self):
         mock_reader = AsyncMock()
         mock_writer = AsyncMock()
         request_headers = b"POST /test HTTP/1.1\r\nHost: localhost\r\n\r\n"
-        mock_reader.readuntil = AsyncMock(return_value=request_headers)
+        mock_reader.read = AsyncMock(side_effect=[request_headers, b""])
         mock_reader.readexactly = AsyncMock(return_value=b"")
 
         # Mock request_factory
@@ -269,25 +437,54 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
         # Verify that connection was closed
         mock_writer.is_closing.assert_called()
 
+    async def test_method_not_allowed_preformatted(self):
+        response = HttpResponse(status_code=405, headers={"Allow": "GET"})
+        self.mock_router.get_handler.side_effect = MethodNotAllowedError(
+            response=response
+        )
+
+        sent, keep_alive = await self.server._handle_request(
+            "POST", "/test", "HTTP/1.1", Headers(), b""
+        )
+
+        self.assertIs(sent, response)
+        self.assertFalse(keep_alive)
+        self.mock_router.get_allowed_methods.assert_not_called()
+
+    async def test_handle_request_head_non_response(self):
+        self.mock_router.get_handler.return_value = (
+            lambda request: {"a": 1},
+            {},
+            False,
+        )
+
+        response, _ = await self.server._handle_request(
+            "HEAD", "/", "HTTP/1.1", Headers(), b""
+        )
+
+        formatted = response.format_response()
+        self.assertIn(b"Content-Type: application/json", formatted)
+        self.assertTrue(formatted.endswith(b"\r\n\r\n"))
+
     async def test_handle_client_options_method(self):
         mock_reader = AsyncMock()
         mock_writer = MagicMock()
         request_headers = b"OPTIONS /test HTTP/1.1\r\nHost: localhost\r\n\r\n"
-        mock_reader.readuntil = AsyncMock(return_value=request_headers)
+        mock_reader.read = AsyncMock(side_effect=[request_headers, b""])
 
         # Mock request_factory
         mock_request = HttpRequest("OPTIONS", "/test", {"Host": "localhost"}, b"")
         self.mock_request_factory.create.return_value = mock_request
 
-        # Mock router
-        mock_handler = AsyncMock()
-        self.mock_router.get_handler.return_value = (mock_handler, {}, True)
-        self.mock_router.get_allowed_methods.return_value = ["GET", "POST", "OPTIONS"]
+        # The router answers OPTIONS for routes without an OPTIONS handler
+        mock_handler = MagicMock()
+        self.server.router = Router()
+        self.server.router.add_route("/test", mock_handler, methods=["GET", "POST"])
 
         await self.server._handle_client(mock_reader, mock_writer)
 
         expected_headers = {
-            "Allow": "GET, POST, OPTIONS",
+            "Allow": "GET, POST, HEAD, OPTIONS",
             "Content-Type": "text/plain",
             "Server": "Areion",
             "Content-Length": "0",
@@ -324,14 +521,14 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
 
         mock_writer.close.assert_not_called()
 
-        # Assert that the handler was not called since OPTIONS is handled directly
+        # Assert that the handler was not called since OPTIONS is answered directly
         mock_handler.assert_not_called()
 
     async def test_handle_client_head_method(self):
         mock_reader = AsyncMock()
         mock_writer = MagicMock()
         request_headers = b"HEAD /test HTTP/1.1\r\nHost: localhost\r\n\r\n"
-        mock_reader.readuntil = AsyncMock(return_value=request_headers)
+        mock_reader.read = AsyncMock(side_effect=[request_headers, b""])
 
         # Mock request_factory
         mock_request = HttpRequest("HEAD", "/test", {"Host": "localhost"}, b"")
@@ -347,16 +544,81 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
 
         # Verify that handler was called
         mock_handler.assert_awaited_with(mock_request, **{})
-        # Verify that response body was cleared for HEAD
-        sent_response = mock_handler.return_value
-        sent_response.body = b""
-        mock_writer.write.assert_called_with(sent_response.format_response())
+        # Verify that the head was sent with the body's length, without the body
+        sent = mock_writer.write.call_args.args[0]
+        self.assertIn(b"Content-Length: 13\r\n", sent)
+        self.assertTrue(sent.endswith(b"\r\n\r\n"))
+
+    async def test_handle_request_threaded_handler(self):
+        loop_thread = threading.get_ident()
+        threads = []
+
+        def blocking(request, id):
+            threads.append(threading.get_ident())
+            return HttpResponse(body=id)
+
+        self.server.handler_pool = HandlerPool(max_workers=1, max_queue=0)
+        self.addCleanup(self.server.handler_pool.shutdown)
+        self.mock_router.get_handler.return_value = (
+            ThreadedHandler(blocking),
+            {"id": "7"},
+            False,
+        )
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+
+        for method in ("GET", "HEAD"):
+            response, keep_alive = await self.server._handle_request(
+                method, "/items/7", "HTTP/1.1", Headers(), b""
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(keep_alive)
+        self.assertEqual(response.body, b"")
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(loop_thread, threads)
+        self.assertEqual(self.server.get_thread_pool_stats()["completed"], 2)
+
+    async def test_handle_request_thread_pool_full(self):
+        release = threading.Event()
+        self.server.handler_pool = HandlerPool(max_workers=1, max_queue=0)
+        self.addCleanup(self.server.handler_pool.shutdown)
+        self.mock_router.get_handler.return_value = (
+            ThreadedHandler(lambda request: release.wait() and HttpResponse()),
+            {},
+            False,
+        )
+
+        first = asyncio.ensure_future(
+            self.server._handle_request("GET", "/", "HTTP/1.1", Headers(), b"")
+        )
+        await asyncio.sleep(0.05)
+        response, _ = await self.server._handle_request(
+            "GET", "/", "HTTP/1.1", Headers(), b""
+        )
+        self.assertEqual(response.status_code, 503)
+
+        release.set()
+        response, _ = await first
+        self.assertEqual(response.status_code, 200)
+
+    async def test_handle_request_head_sync_handler(self):
+        self.mock_router.get_handler.return_value = (
+            lambda request: HttpResponse(body="hi"),
+            {},
+            False,
+        )
+        response, _ = await self.server._handle_request(
+            "HEAD", "/", "HTTP/1.1", Headers(), b""
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, b"")
 
     async def test_handle_client_connect_method_not_implemented(self):
         mock_reader = AsyncMock()
         mock_writer = MagicMock()
         request_headers = b"CONNECT /test HTTP/1.1\r\nHost: localhost\r\n\r\n"
-        mock_reader.readuntil = AsyncMock(return_value=request_headers)
+        mock_reader.read = AsyncMock(side_effect=[request_headers, b""])
 
         # Mock request_factory
         mock_request = HttpRequest("CONNECT", "/test", {"Host": "localhost"}, b"")
@@ -375,7 +637,7 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
         mock_reader = AsyncMock()
         mock_writer = AsyncMock()
         request_headers = b"GET /error HTTP/1.1\r\nHost: localhost\r\n\r\n"
-        mock_reader.readuntil = AsyncMock(return_value=request_headers)
+        mock_reader.read = AsyncMock(side_effect=[request_headers, b""])
         mock_reader.readexactly = AsyncMock(return_value=b"")
 
         # Mock request_factory
@@ -399,7 +661,7 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
         mock_reader = AsyncMock()
         mock_writer = MagicMock()
         request_headers = b"GET /exception HTTP/1.1\r\nHost: localhost\r\n\r\n"
-        mock_reader.readuntil = AsyncMock(return_value=request_headers)
+        mock_reader.read = AsyncMock(side_effect=[request_headers, b""])
         mock_reader.readexactly = AsyncMock(return_value=b"")
 
         # Mock request_factory
@@ -423,7 +685,7 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
         request_headers = (
             b"GET /test HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n"
         )
-        mock_reader.readuntil = AsyncMock(return_value=request_headers)
+        mock_reader.read = AsyncMock(side_effect=[request_headers, b""])
         mock_reader.readexactly = AsyncMock(return_value=b"")
 
         # Mock request_factory
@@ -463,6 +725,31 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(request_line, ("GET", "/path", "HTTP/1.1"))
         self.assertEqual(headers, {"Host": "localhost", "Content-Length": "10"})
 
+    def test_parse_headers_keeps_repeated_headers(self):
+        headers_data = (
+            b"GET / HTTP/1.1\r\nhost: localhost\r\nCookie: a=1\r\n"
+            b"Cookie: b=2\r\n\r\n"
+        )
+        _, headers = self.server._parse_headers(headers_data)
+        self.assertEqual(headers["Host"], "localhost")
+        self.assertEqual(headers.getall("cookie"), ["a=1", "b=2"])
+        self.assertEqual(headers.raw[0], (b"host", b"localhost"))
+
+    async def test_lowercase_connection_close_honored(self):
+        handler = AsyncMock(return_value=HttpResponse(body="OK"))
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"GET /a HTTP/1.1\r\nconnection: close\r\n\r\n" b"GET /b HTTP/1.1\r\n\r\n"
+        )
+
+        await self.server._handle_client(reader, writer)
+
+        handler.assert_awaited_once()
+
     def test_parse_headers_invalid(self):
         headers_data = b"INVALID HEADER\r\n\r\n"
         with self.assertRaises(ValueError) as context:
@@ -470,27 +757,93 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
         self.assertIn("Invalid headers", str(context.exception))
 
     async def test_start_and_stop_server(self):
-        mock_server = AsyncMock()
-        mock_server.__aenter__.return_value = mock_server
+        mock_server = MagicMock()
         mock_server.wait_closed = AsyncMock()
         with mock.patch("asyncio.start_server", return_value=mock_server):
             start_task = asyncio.create_task(self.server.start())
             await asyncio.sleep(0.1)
             asyncio.start_server.assert_called_with(
-                self.server._handle_client, self.server.host, self.server.port
+                self.server._handle_client,
+                limit=self.server.max_header_bytes,
+                host=self.server.host,
+                port=self.server.port,
+                reuse_port=False,
             )
+            self.mock_router.compile.assert_called_once_with()
+            mock_server.close.assert_not_called()
             self.server._shutdown_event.set()
             await start_task
-            mock_server.__aenter__.assert_called()
-            mock_server.wait_closed.assert_not_called()
+            mock_server.close.assert_called_once_with()
+            mock_server.wait_closed.assert_awaited_once()
+
+    async def test_start_protocol_transport(self):
+        server = HttpServer(
+            router=self.mock_router,
+            request_factory=self.mock_request_factory,
+            transport="protocol",
+        )
+        mock_server = MagicMock()
+        mock_server.wait_closed = AsyncMock()
+        loop = asyncio.get_running_loop()
+        with (
+            mock.patch.object(
+                loop, "create_server", AsyncMock(return_value=mock_server)
+            ) as create_server,
+            mock.patch("asyncio.start_server") as start_server,
+        ):
+            start_task = asyncio.create_task(server.start())
+            await asyncio.sleep(0.1)
+            create_server.assert_awaited_once()
+            start_server.assert_not_called()
+            server._shutdown_event.set()
+            await start_task
 
     async def test_stop_server(self):
-        self.server._server = AsyncMock()
-        self.server._server.close = MagicMock()
-        self.server._server.wait_closed = AsyncMock()
+        mock_server = MagicMock()
+        mock_server.wait_closed = AsyncMock()
+        paused = MagicMock()
+        self.server._servers = [mock_server]
+        self.server._paused_sockets = [paused]
 
         await self.server.stop()
-        self.server._server.close.assert_called()
+        mock_server.close.assert_called()
+        mock_server.wait_closed.assert_awaited_once()
+        paused.close.assert_called_once_with()
+
+    async def start_listening(self, **kwargs):
+        router = Router()
+        router.add_route("/", lambda request: "ok")
+        server = HttpServer(
+            router=router,
+            request_factory=HttpRequestFactory(),
+            logger=self.mock_logger,
+            host="127.0.0.1",
+            port=0,
+            **kwargs,
+        )
+        task = asyncio.create_task(server.start())
+        while not server._servers:
+            await asyncio.sleep(0.01)
+        port = server._servers[0].sockets[0].getsockname()[1]
+        return server, task, port
+
+    async def test_stop_closes_idle_keep_alive_connections(self):
+        # Server.wait_closed() waits for them on Python 3.12+
+        for transport in ("stream", "protocol"):
+            with self.subTest(transport=transport):
+                server, task, port = await self.start_listening(
+                    transport=transport, keep_alive_timeout=30
+                )
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b"GET / HTTP/1.1\r\nHost: a\r\n\r\n")
+                await reader.readuntil(b"ok")
+                self.assertEqual(server.get_connection_stats()["idle"], 1)
+
+                await asyncio.wait_for(server.stop(), 2)
+                await asyncio.wait_for(task, 2)
+
+                self.assertEqual(await asyncio.wait_for(reader.read(), 2), b"")
+                writer.close()
 
     async def test_run_server(self):
         self.server.start = AsyncMock()
@@ -544,69 +897,702 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
             server.log("error", "Error message")
             mock_print.assert_called_with("ERROR: Error message")
 
-    async def test_semaphore_limit(self):
-        # Set max_conns to 2 for testing
-        self.server.semaphore = asyncio.Semaphore(2)
+    async def test_max_conns_rejects_with_503(self):
+        server, task, port = await self.start_listening(max_conns=1)
+        self.addAsyncCleanup(server.stop)
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET / HTTP/1.1\r\nHost: a\r\n\r\n")
+        await reader.readuntil(b"ok")
 
-        async def client_handler(reader, writer):
-            async with self.server.semaphore:
-                await asyncio.sleep(0.1)
+        for _ in range(5):
+            rejected_reader, rejected_writer = await asyncio.open_connection(
+                "127.0.0.1", port
+            )
+            rejected_writer.write(b"GET / HTTP/1.1\r\nHost: a\r\n\r\n")
+            sent = await asyncio.wait_for(rejected_reader.read(), 2)
+            rejected_writer.close()
+
+            self.assertTrue(sent.startswith(b"HTTP/1.1 503 Service Unavailable\r\n"))
+            self.assertIn(b"Retry-After: 1\r\n", sent)
+        stats = server.get_connection_stats()
+        self.assertEqual(stats["rejected"], 5)
+        self.assertEqual(stats["active"], 1)
+        writer.close()
+
+    async def test_connection_counts_released(self):
+        mock_reader = AsyncMock()
+        mock_writer = MagicMock()
+        mock_reader.read = AsyncMock(side_effect=ConnectionResetError())
 
-        self.server._handle_client = client_handler
+        await self.server._handle_client(mock_reader, mock_writer)
+
+        self.assertEqual(self.server.active_conns, 0)
+        self.assertEqual(self.server.idle_conns, 0)
+
+    async def test_idle_keep_alive_connection_counted(self):
+        request = b"GET /test HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        idle_counts = []
+
+        async def read(n):
+            idle_counts.append(self.server.idle_conns)
+            if len(idle_counts) == 1:
+                return request
+            raise ConnectionResetError()
 
         mock_reader = AsyncMock()
+        mock_reader.read = read
         mock_writer = MagicMock()
+        mock_writer.drain = AsyncMock()
+        self.mock_request_factory.create.return_value = HttpRequest(
+            "GET", "/test", {"Host": "localhost"}, b""
+        )
+        handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (handler, {}, False)
 
-        # Start multiple client handlers
-        handlers = [
-            asyncio.create_task(self.server._handle_client(mock_reader, mock_writer))
-            for _ in range(4)
-        ]
+        await self.server._handle_client(mock_reader, mock_writer)
 
-        # Wait for all handlers to complete
-        await asyncio.gather(*handlers)
+        self.assertEqual(idle_counts, [0, 1])
+        self.assertEqual(self.server.idle_conns, 0)
 
-        self.assertEqual(self.server.semaphore._value, 2)
+    def test_initialization_invalid_overload_policy(self):
+        with self.assertRaises(ValueError) as context:
+            HttpServer(
+                router=self.mock_router,
+                request_factory=self.mock_request_factory,
+                overload_policy="drop",
+            )
+        self.assertEqual(
+            str(context.exception), "Overload policy must be one of: reject, pause."
+        )
 
-    # # TODO: Uncomment after keep alive is implemented
-    # async def test_keep_alive_timeout(self):
-    #     mock_reader = AsyncMock()
-    #     mock_writer = MagicMock()
+    async def test_pause_policy_pauses_and_resumes_accepting(self):
+        server = HttpServer(
+            router=self.mock_router,
+            request_factory=self.mock_request_factory,
+            max_conns=2,
+            overload_policy="pause",
+        )
+        listening = MagicMock()
+        listening.fileno.return_value = 42
+        mock_server = MagicMock()
+        mock_server.sockets = (listening,)
+        server._servers = [mock_server]
+        duplicate = MagicMock()
+        resumed = MagicMock()
+
+        with (
+            mock.patch("socket.fromfd", return_value=duplicate) as fromfd,
+            mock.patch("asyncio.start_server", AsyncMock(return_value=resumed)),
+        ):
+            self.assertTrue(server._admit_connection())
+            mock_server.close.assert_not_called()
+            self.assertTrue(server._admit_connection())
+            fromfd.assert_called_once_with(
+                42, listening.family, listening.type, listening.proto
+            )
+            mock_server.close.assert_called_once_with()
+            self.assertFalse(server.get_connection_stats()["accepting"])
+
+            server._release_connection()
+            self.assertTrue(server.get_connection_stats()["accepting"])
+            await asyncio.sleep(0)
+            asyncio.start_server.assert_awaited_once_with(
+                server._handle_client,
+                limit=server.max_header_bytes,
+                sock=duplicate,
+            )
+        self.assertEqual(server._servers, [resumed])
+        self.assertEqual(server._paused_sockets, [])
 
-    #     # Simulate reading headers but not sending another request within timeout
-    #     request_headers = b"GET /test HTTP/1.1\r\nHost: localhost\r\n\r\n"
-    #     mock_reader.readuntil = AsyncMock(
-    #         side_effect=[
-    #             asyncio.sleep(0),  # First read
-    #             request_headers,
-    #             asyncio.TimeoutError(),
-    #         ]
-    #     )
+    async def test_pause_policy_rejects_when_sockets_cannot_be_held(self):
+        server = HttpServer(
+            router=self.mock_router,
+            request_factory=self.mock_request_factory,
+            max_conns=1,
+            overload_policy="pause",
+        )
+        mock_server = MagicMock()
+        mock_server.sockets = (MagicMock(),)
+        server._servers = [mock_server]
+
+        with mock.patch("socket.fromfd", side_effect=OSError("too many files")):
+            self.assertTrue(server._admit_connection())
+        mock_server.close.assert_not_called()
+        self.assertTrue(server.get_connection_stats()["accepting"])
+        self.assertFalse(server._admit_connection())
+
+    def make_stream_connection(self):
+        reader = asyncio.StreamReader()
+        writer = MagicMock()
+        writer.drain = AsyncMock()
+        # Closing the transport ends the read side, as it does for a real socket
+        writer.close.side_effect = reader.feed_eof
+        return reader, writer
+
+    async def test_header_timeout_sends_408(self):
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(b"GET /slow HTTP/1.1\r\nHost: local")
+
+        task = asyncio.ensure_future(self.server._handle_client(reader, writer))
+        await asyncio.sleep(0)
+        self.assertEqual(self.server._timer_wheel.expire(time.monotonic() + 5), 0)
+        self.assertEqual(self.server._timer_wheel.expire(time.monotonic() + 11), 1)
+        await task
 
-    #     # Mock request_factory
-    #     mock_request = HttpRequest("GET", "/test", {"Host": "localhost"}, b"")
-    #     self.mock_request_factory.create.return_value = mock_request
+        response = HttpResponse(status_code=408, body=HTTP_STATUS_CODES[408])
+        writer.write.assert_called_once_with(response.format_response())
+        self.assertEqual(len(self.server._timer_wheel), 0)
+
+    async def test_body_timeout_sends_408(self):
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nContent-Length: 10\r\n\r\nab"
+        )
 
-    #     # Mock router handler
-    #     mock_handler = AsyncMock(return_value=HttpResponse(status_code=200, body=b"OK"))
-    #     self.mock_router.get_handler.return_value = (mock_handler, {}, True)
+        task = asyncio.ensure_future(self.server._handle_client(reader, writer))
+        await asyncio.sleep(0)
+        self.server._timer_wheel.expire(time.monotonic() + 31)
+        await task
 
-    #     await self.server._handle_client(mock_reader, mock_writer)
+        response = HttpResponse(status_code=408, body=HTTP_STATUS_CODES[408])
+        writer.write.assert_called_once_with(response.format_response())
+        self.mock_router.get_handler.assert_not_called()
+
+    async def test_idle_keep_alive_timeout_closes_silently(self):
+        mock_handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (mock_handler, {}, False)
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(b"GET /test HTTP/1.1\r\nHost: localhost\r\n\r\n")
+
+        task = asyncio.ensure_future(self.server._handle_client(reader, writer))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.assertEqual(self.server.idle_conns, 1)
+        self.server._timer_wheel.expire(time.monotonic() + 6)
+        await task
+
+        # Returns without waiting for the unread body or another request
+        writer.write.assert_called_once_with(HttpResponse(body=b"OK").format_response())
+        self.mock_router.get_handler.assert_called_once()
+        self.assertEqual(self.server.idle_conns, 0)
+
+    async def test_header_timeout_applies_to_keep_alive_requests(self):
+        self.server.header_timeout = 2
+        mock_handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (mock_handler, {}, False)
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(b"GET /test HTTP/1.1\r\nHost: localhost\r\n\r\n")
+
+        task = asyncio.ensure_future(self.server._handle_client(reader, writer))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.assertEqual(self.server.idle_conns, 1)
+        # The idle phase ends with the next head's first byte
+        reader.feed_data(b"GET /slow HTTP/1.1\r\n")
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.assertEqual(self.server.idle_conns, 0)
+        self.assertEqual(self.server._timer_wheel.expire(time.monotonic() + 3), 1)
+        await task
 
-    #     # Verify that handler was called once
-    #     mock_handler.assert_awaited_once_with(mock_request, **{})
-    #     # Verify that a 408 response was sent after timeout
-    #     response = HttpResponse(status_code=408, body=HTTP_STATUS_CODES[408])
-    #     mock_writer.write.assert_called_with(response.format_response())
+        response = HttpResponse(status_code=408, body=HTTP_STATUS_CODES[408])
+        writer.write.assert_called_with(response.format_response())
+        mock_handler.assert_called_once()
+        self.assertEqual(self.server.idle_conns, 0)
 
-    #     # Verify that connection was closed
-    #     mock_writer.is_closing.assert_called()
+    async def test_handler_time_not_counted_against_timeouts(self):
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def handler(request):
+            started.set()
+            await release.wait()
+            return HttpResponse(body=b"OK")
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(b"GET /test HTTP/1.1\r\nHost: localhost\r\n\r\n")
+
+        task = asyncio.ensure_future(self.server._handle_client(reader, writer))
+        await started.wait()
+        self.assertEqual(self.server._timer_wheel.expire(time.monotonic() + 60), 0)
+        release.set()
+        reader.feed_eof()
+        await task
+
+        writer.write.assert_called_once_with(HttpResponse(body=b"OK").format_response())
+
+    async def test_pipelined_requests_coalesced_into_one_write(self):
+        mock_handler = MagicMock(
+            side_effect=lambda request: HttpResponse(body=request.path.encode())
+        )
+        self.mock_router.get_handler.return_value = (mock_handler, {}, False)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"GET /one HTTP/1.1\r\nHost: localhost\r\n\r\n"
+            b"GET /two HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        )
+        reader.feed_eof()
+
+        await self.server._handle_client(reader, writer)
+
+        writer.write.assert_not_called()
+        writer.writelines.assert_called_once_with(
+            [
+                HttpResponse(body=b"/one").format_response(),
+                HttpResponse(body=b"/two").format_response(),
+            ]
+        )
+        writer.drain.assert_awaited_once()
+
+    async def test_pipelined_response_not_held_by_suspended_handler(self):
+        release = asyncio.Event()
+
+        async def handler(request):
+            if request.path == "/slow":
+                await release.wait()
+            return HttpResponse(body=request.path.encode())
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"GET /fast HTTP/1.1\r\nHost: localhost\r\n\r\n"
+            b"GET /slow HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        )
+
+        task = asyncio.ensure_future(self.server._handle_client(reader, writer))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        writer.write.assert_called_once_with(
+            HttpResponse(body=b"/fast").format_response()
+        )
+
+        release.set()
+        reader.feed_eof()
+        await task
+
+        writer.write.assert_called_with(HttpResponse(body=b"/slow").format_response())
+
+    async def test_pipelined_responses_flushed_before_error(self):
+        mock_handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (mock_handler, {}, False)
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"GET /one HTTP/1.1\r\nHost: localhost\r\n\r\nINVALID HEADER\r\n\r\n"
+        )
+
+        await self.server._handle_client(reader, writer)
+
+        writer.writelines.assert_called_once_with(
+            [
+                HttpResponse(body=b"OK").format_response(),
+                HttpResponse(
+                    status_code=400, body=HTTP_STATUS_CODES[400]
+                ).format_response(),
+            ]
+        )
+
+    async def test_large_body_read_lazily(self):
+        self.mock_router.streams_body.return_value = True
+        self.server.buffer_size = 4
+        received = []
+
+        async def handler(request):
+            self.assertIsNone(request.body)
+            received.append(await request.read())
+            self.assertEqual(await request.read(), received[0])
+            return HttpResponse(body=b"OK")
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nContent-Length: 10\r\n\r\n"
+            b"0123456789"
+        )
+        reader.feed_eof()
+
+        await self.server._handle_client(reader, writer)
+
+        self.assertEqual(received, [b"0123456789"])
+
+    async def test_small_body_read_eagerly(self):
+        mock_handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (mock_handler, {}, False)
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nContent-Length: 4\r\n\r\ndata"
+        )
+        reader.feed_eof()
+
+        await self.server._handle_client(reader, writer)
+
+        self.assertEqual(self.mock_request_factory.create.call_args.args[3], b"data")
+
+    async def test_large_body_read_before_sync_handler(self):
+        self.server.buffer_size = 4
+        received = []
+
+        def handler(request):
+            received.append(request.get_body())
+            return HttpResponse(body=b"OK")
+
+        self.mock_router.get_handler.return_value = (handler, {}, False)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nContent-Length: 10\r\n\r\n"
+            b"0123456789"
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"4\r\nWiki\r\n6\r\npedia \r\n0\r\n\r\n"
+        )
+        reader.feed_eof()
+
+        await self.server._handle_client(reader, writer)
+
+        self.assertEqual(received, [b"0123456789", b"Wikipedia "])
+        self.mock_router.streams_body.assert_called_with("POST", "/upload")
+        # Both bodies were read, the connection stayed usable for the second
+        self.assertEqual(self.mock_router.get_handler.call_count, 2)
+
+    async def test_unread_large_body_closes_connection(self):
+        self.mock_router.streams_body.return_value = True
+        self.server.buffer_size = 4
+        mock_handler = MagicMock(return_value=HttpResponse(body=b"OK"))
+        self.mock_router.get_handler.return_value = (mock_handler, {}, False)
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nContent-Length: 10\r\n\r\n"
+        )
+
+        await self.server._handle_client(reader, writer)
+
+        # Returns without waiting for the unread body or another request
+        writer.write.assert_called_once_with(HttpResponse(body=b"OK").format_response())
+        self.mock_router.get_handler.assert_called_once()
+
+    async def test_content_length_over_max_body_size_rejected_early(self):
+        self.server.max_body_size = 100
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nContent-Length: 101\r\n\r\n"
+        )
+
+        await self.server._handle_client(reader, writer)
+
+        response = HttpResponse(
+            status_code=413, body=HTTP_STATUS_CODES[413], content_type="text/plain"
+        )
+        writer.write.assert_called_once_with(response.format_response())
+        self.mock_router.get_handler.assert_not_called()
+
+    async def test_expect_continue_sent_on_first_read(self):
+        self.mock_router.streams_body.return_value = True
+        self.server.buffer_size = 4
+        writes = []
+
+        async def handler(request):
+            writes.append(writer.write.call_count)
+            await request.read()
+            return HttpResponse(body=b"OK")
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\nContent-Length: 10\r\n"
+            b"Expect: 100-continue\r\n\r\n0123456789"
+        )
+        reader.feed_eof()
+
+        await self.server._handle_client(reader, writer)
+
+        self.assertEqual(writes, [0])
+        self.assertEqual(
+            writer.write.call_args_list[0].args[0], b"HTTP/1.1 100 Continue\r\n\r\n"
+        )
+        self.assertEqual(
+            writer.write.call_args_list[1].args[0],
+            HttpResponse(body=b"OK").format_response(),
+        )
+
+    async def test_streaming_response_between_pipelined_responses(self):
+        async def handler(request):
+            if request.path == "/export":
+                return StreamingResponse(iter([b"a,b\n", b"c,d\n"]))
+            return HttpResponse(body=b"OK")
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"GET /one HTTP/1.1\r\nHost: localhost\r\n\r\n"
+            b"GET /export HTTP/1.1\r\nHost: localhost\r\n\r\n"
+            b"GET /two HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        )
+        reader.feed_eof()
+
+        await self.server._handle_client(reader, writer)
+
+        data = b""
+        for name, args, _ in writer.method_calls:
+            if name == "write":
+                data += args[0]
+            elif name == "writelines":
+                data += b"".join(args[0])
+        ok = HttpResponse(body=b"OK").format_response()
+        self.assertTrue(data.startswith(ok))
+        self.assertTrue(data.endswith(b"0\r\n\r\n" + ok))
+        self.assertIn(b"Transfer-Encoding: chunked\r\n\r\n4\r\na,b\n\r\n", data)
+
+    async def test_streaming_response_http10_closes_connection(self):
+        handler = AsyncMock(return_value=StreamingResponse([b"data"]))
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"GET /export HTTP/1.0\r\nConnection: keep-alive\r\n\r\n"
+            b"GET /export HTTP/1.0\r\nConnection: keep-alive\r\n\r\n"
+        )
+
+        await self.server._handle_client(reader, writer)
+
+        handler.assert_awaited_once()
+        self.assertEqual(writer.write.call_args.args[0], b"data")
+
+    async def test_conditional_get_answered_with_304(self):
+        handler = AsyncMock(
+            return_value=HttpResponse(body=b"payload", headers={"ETag": '"v1"'})
+        )
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(b'GET /page HTTP/1.1\r\nIf-None-Match: "v0", "v1"\r\n\r\n')
+        reader.feed_eof()
+
+        await self.server._handle_client(reader, writer)
+
+        self.assertEqual(
+            writer.write.call_args.args[0],
+            b"HTTP/1.1 304 Not Modified\r\nDate: now\r\n"
+            b'ETag: "v1"\r\nServer: Areion\r\n\r\n',
+        )
+
+    async def test_conditional_get_with_stale_etag_gets_body(self):
+        response = HttpResponse(body=b"payload", headers={"ETag": '"v2"'})
+        handler = AsyncMock(return_value=response)
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(b'GET /page HTTP/1.1\r\nIf-None-Match: "v1"\r\n\r\n')
+        reader.feed_eof()
+
+        await self.server._handle_client(reader, writer)
+
+        self.assertTrue(writer.write.call_args.args[0].endswith(b"\r\n\r\npayload"))
+
+    async def test_conditional_get_ignored_for_errors(self):
+        response = HttpResponse(
+            status_code=404, body=b"missing", headers={"ETag": '"v1"'}
+        )
+
+        result = self.server._evaluate_conditional({"If-None-Match": "*"}, response)
+
+        self.assertIs(result, response)
+
+    async def test_response_compressed_for_accepting_client(self):
+        self.server.compressor = Compressor(min_size=10)
+        body = b"payload " * 100
+        handler = AsyncMock(
+            return_value=HttpResponse(body=body, content_type="text/plain")
+        )
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(b"GET /page HTTP/1.1\r\nAccept-Encoding: gzip\r\n\r\n")
+        reader.feed_eof()
+
+        await self.server._handle_client(reader, writer)
+
+        head, _, payload = writer.write.call_args.args[0].partition(b"\r\n\r\n")
+        self.assertIn(b"Content-Encoding: gzip", head)
+        self.assertIn(b"Vary: Accept-Encoding", head)
+        self.assertEqual(gzip.decompress(payload), body)
+
+    async def test_plain_return_value_compressed(self):
+        self.server.compressor = Compressor(min_size=10)
+        data = {"items": ["payload"] * 100}
+        handler = MagicMock(return_value=data)
+        self.mock_router.get_handler.return_value = (handler, {}, False)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(b"GET /page HTTP/1.1\r\nAccept-Encoding: gzip\r\n\r\n")
+        reader.feed_eof()
+
+        await self.server._handle_client(reader, writer)
+
+        head, _, payload = writer.write.call_args.args[0].partition(b"\r\n\r\n")
+        self.assertIn(b"Content-Encoding: gzip", head)
+        self.assertEqual(
+            gzip.decompress(payload), HttpResponse(body=data).serialize_body()
+        )
+
+    async def test_head_response_negotiated_like_get(self):
+        self.server.compressor = Compressor(min_size=10)
+        handler = AsyncMock(side_effect=lambda request: "payload " * 100)
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        heads = []
+        for method in (b"GET", b"HEAD"):
+            reader, writer = self.make_stream_connection()
+            reader.feed_data(
+                method + b" /page HTTP/1.1\r\nAccept-Encoding: gzip\r\n\r\n"
+            )
+            reader.feed_eof()
+
+            await self.server._handle_client(reader, writer)
+
+            head, _, payload = writer.write.call_args.args[0].partition(b"\r\n\r\n")
+            heads.append(head)
+        self.assertIn(b"Content-Encoding: gzip", heads[0])
+        self.assertEqual(heads[1], heads[0])
+        self.assertEqual(payload, b"")
+
+    async def test_range_of_cached_file_not_compressed(self):
+        self.server.compressor = Compressor(min_size=10)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "notes.txt")
+        data = b"0123456789" * 100
+        with open(path, "wb") as file:
+            file.write(data)
+        cache = StaticFileCache()
+
+        async def handler(request):
+            return await cache.get(path)
+
+        self.mock_router.get_handler.return_value = (handler, {}, True)
+        self.mock_request_factory.create.side_effect = (
+            lambda method, path, headers, body: HttpRequest(method, path, headers, body)
+        )
+        reader, writer = self.make_stream_connection()
+        reader.feed_data(
+            b"GET /notes.txt HTTP/1.1\r\nAccept-Encoding: gzip\r\n"
+            b"Range: bytes=10-29\r\n\r\n"
+            b"GET /notes.txt HTTP/1.1\r\nAccept-Encoding: gzip\r\n"
+            b"Range: bytes=5000-\r\n\r\n"
+        )
+        reader.feed_eof()
+
+        await self.server._handle_client(reader, writer)
+
+        output = b""
+        for name, args, _ in writer.method_calls:
+            if name == "write":
+                output += args[0]
+            elif name == "writelines":
+                output += b"".join(args[0])
+        partial, _, unsatisfiable = output.partition(b"HTTP/1.1 416 ")
+        self.assertTrue(partial.startswith(b"HTTP/1.1 206 "))
+        self.assertIn(b"Content-Range: bytes 10-29/1000\r\n", partial)
+        self.assertTrue(partial.endswith(b"\r\n\r\n" + data[10:30]))
+        self.assertIn(b"Content-Range: bytes */1000\r\n", unsatisfiable)
+        self.assertNotIn(b"Content-Encoding", output)
+
+    def test_range_applied_to_files_only(self):
+        file_response = MagicMock(accept_ranges=True, status_code=200)
+        headers = {"Range": "bytes=0-1"}
+
+        result = self.server._evaluate_range(headers, file_response)
+
+        file_response.with_range.assert_called_once_with("bytes=0-1")
+        self.assertIs(result, file_response.with_range.return_value)
+        response = HttpResponse(body=b"data")
+        self.assertIs(self.server._evaluate_range(headers, response), response)
+
+    def test_range_ignored_when_if_range_fails(self):
+        file_response = MagicMock(accept_ranges=True, status_code=200)
+        file_response.if_range_matches.return_value = False
+
+        result = self.server._evaluate_range(
+            {"Range": "bytes=0-1", "If-Range": '"old"'}, file_response
+        )
+
+        file_response.if_range_matches.assert_called_once_with('"old"')
+        file_response.with_range.assert_not_called()
+        self.assertIs(result, file_response)
+
+    def test_parse_body_framing(self):
+        def parse(headers):
+            return self.server._parse_body_framing(Headers(headers))
+
+        self.assertEqual(parse({}), (False, 0))
+        self.assertEqual(parse({"Content-Length": "12"}), (False, 12))
+        self.assertEqual(parse({"transfer-encoding": "Chunked"}), (True, 0))
+        self.assertEqual(parse([("Content-Length", "5")] * 2), (False, 5))
+        with self.assertRaises(PayloadTooLargeError):
+            parse({"Content-Length": str(2**24 + 1)})
+        for headers in (
+            {"Content-Length": "-1"},
+            {"Content-Length": "+5"},
+            {"Content-Length": "abc"},
+            {"Transfer-Encoding": "chunked, gzip"},
+            [("Content-Length", "5"), ("content-length", "6")],
+            [("Transfer-Encoding", "chunked"), ("Transfer-Encoding", "gzip")],
+            [("Transfer-Encoding", "chunked"), ("content-length", "6")],
+        ):
+            with self.subTest(headers=headers):
+                with self.assertRaises(BadRequestError):
+                    parse(headers)
+
+    def test_initialization_invalid_header_and_body_timeouts(self):
+        with self.assertRaises(ValueError) as context:
+            HttpServer(
+                router=self.mock_router,
+                request_factory=self.mock_request_factory,
+                header_timeout=0,
+            )
+        self.assertEqual(
+            str(context.exception), "Header timeout must be a positive number."
+        )
+        with self.assertRaises(ValueError) as context:
+            HttpServer(
+                router=self.mock_router,
+                request_factory=self.mock_request_factory,
+                body_timeout="30",
+            )
+        self.assertEqual(
+            str(context.exception), "Body timeout must be a positive number."
+        )
 
     async def test_handle_cancelled_connection(self):
         mock_reader = AsyncMock()
         mock_writer = MagicMock()
         # Simulate cancellation
-        mock_reader.readuntil = AsyncMock(side_effect=asyncio.CancelledError())
+        mock_reader.read = AsyncMock(side_effect=asyncio.CancelledError())
 
         await self.server._handle_client(mock_reader, mock_writer)
 
@@ -617,7 +1603,7 @@ class TestHttpServer(unittest.IsolatedAsyncioTestCase):
         mock_reader = AsyncMock()
         mock_writer = MagicMock()
 
-        mock_reader.readuntil = AsyncMock(side_effect=ConnectionResetError())
+        mock_reader.read = AsyncMock(side_effect=ConnectionResetError())
 
         await self.server._handle_client(mock_reader, mock_writer)
 
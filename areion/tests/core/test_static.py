@@ -0,0 +1,295 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ...core.static import StaticFileCache, CachedResponse
+from ... import FileResponse
+from ...core.response import date_header, file_etag, http_date
+
+
+class TestStaticFileCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def make_file(self, name, data):
+        path = os.path.join(self.dir.name, name)
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+    @mock.patch("areion.core.response.date_header", return_value=b"Date: now\r\n")
+    async def test_small_file_is_preformatted(self, _):
+        path = self.make_file("app.css", b"body{}")
+        cache = StaticFileCache()
+
+        response = await cache.get(path)
+
+        stat_result = os.stat(path)
+        self.assertIsInstance(response, CachedResponse)
+        self.assertEqual(response.body, b"body{}")
+        self.assertEqual(
+            response.format_response(),
+            b"HTTP/1.1 200 OK\r\nDate: now\r\n"
+            + f"ETag: {file_etag(stat_result)}\r\n".encode()
+            + f"Last-Modified: {http_date(stat_result.st_mtime)}\r\n".encode()
+            + b"Accept-Ranges: bytes\r\nContent-Type: text/css\r\nServer: Areion\r\n"
+            b"Content-Length: 6\r\n\r\nbody{}",
+        )
+
+    @mock.patch("areion.core.response.date_header", return_value=b"Date: now\r\n")
+    async def test_not_modified_is_preformatted(self, _):
+        path = self.make_file("app.css", b"body{}")
+        response = await StaticFileCache().get(path)
+
+        self.assertTrue(
+            response.is_not_modified({"If-None-Match": response.get_etag()})
+        )
+        first = response.not_modified()
+        second = (await StaticFileCache().get(path)).not_modified()
+
+        self.assertEqual(first.status_code, 304)
+        self.assertEqual(first.format_response(), second.format_response())
+        self.assertTrue(
+            first.format_response().startswith(b"HTTP/1.1 304 Not Modified")
+        )
+        self.assertNotIn(b"Content-Length", first.format_response())
+        self.assertNotIn(b"body{}", first.format_response())
+
+    async def test_head_request_gets_head_only(self):
+        path = self.make_file("app.css", b"body{}")
+        response = await StaticFileCache().get(path)
+
+        response.body = b""
+
+        self.assertTrue(response.format_response().endswith(b"Length: 6\r\n\r\n"))
+
+    async def test_hit_within_interval_skips_stat(self):
+        path = self.make_file("app.js", b"1")
+        cache = StaticFileCache(stat_interval=60)
+        first = await cache.get(path)
+
+        with mock.patch("os.stat") as stat:
+            second = await cache.get(path)
+
+        stat.assert_not_called()
+        self.assertIs(second.head, first.head)
+        self.assertIs(second.body, first.body)
+
+    async def test_changed_file_is_reloaded(self):
+        path = self.make_file("app.js", b"old")
+        cache = StaticFileCache(stat_interval=0)
+        await cache.get(path)
+
+        self.make_file("app.js", b"newer")
+        os.utime(path, ns=(0, 10**9))
+        response = await cache.get(path)
+
+        self.assertEqual(response.body, b"newer")
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(
+            cache.size, len(response.format_response()) - len(date_header())
+        )
+
+    async def test_unchanged_file_is_not_reread(self):
+        path = self.make_file("app.js", b"1")
+        cache = StaticFileCache(stat_interval=0)
+        await cache.get(path)
+
+        with mock.patch("areion.core.static._read_file") as read_file:
+            response = await cache.get(path)
+
+        read_file.assert_not_called()
+        self.assertEqual(response.body, b"1")
+
+    async def test_missing_file_is_dropped(self):
+        path = self.make_file("app.js", b"1")
+        cache = StaticFileCache(stat_interval=0)
+        await cache.get(path)
+        os.unlink(path)
+
+        self.assertIsNone(await cache.get(path))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    async def test_directory_is_not_served(self):
+        self.assertIsNone(await StaticFileCache().get(self.dir.name))
+
+    async def test_large_file_is_streamed(self):
+        path = self.make_file("video.mp4", b"x" * 100)
+        cache = StaticFileCache(max_file_size=10)
+
+        response = await cache.get(path)
+
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(response.content_type, "video/mp4")
+        self.assertEqual(response.stat_result.st_size, 100)
+        self.assertEqual(cache.size, 0)
+        self.assertEqual(len(cache), 1)
+
+    async def test_evicts_least_recently_used_entry(self):
+        a = self.make_file("a.txt", b"a")
+        b = self.make_file("b.txt", b"b")
+        c = self.make_file("c.txt", b"c")
+        cache = StaticFileCache(max_entries=2, stat_interval=60)
+        await cache.get(a)
+        await cache.get(b)
+        await cache.get(a)
+        await cache.get(c)
+
+        self.assertEqual(list(cache._entries), [a, c])
+
+    async def test_evicts_to_stay_within_max_bytes(self):
+        a = self.make_file("a.txt", b"a" * 500)
+        b = self.make_file("b.txt", b"b" * 500)
+        cache = StaticFileCache(max_bytes=1024)
+        await cache.get(a)
+        await cache.get(b)
+
+        self.assertEqual(list(cache._entries), [b])
+        self.assertLessEqual(cache.size, 1024)
+
+    async def test_single_range(self):
+        path = self.make_file("app.js", b"0123456789")
+        response = await StaticFileCache().get(path)
+
+        partial = response.with_range("bytes=2-4")
+
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial.body, b"234")
+        self.assertEqual(partial.headers["Content-Range"], "bytes 2-4/10")
+        self.assertEqual(partial.headers["ETag"], response.headers["ETag"])
+
+    async def test_multiple_ranges(self):
+        path = self.make_file("app.js", b"0123456789")
+        response = await StaticFileCache().get(path)
+
+        partial = response.with_range("bytes=0-1,-2")
+
+        self.assertEqual(partial.status_code, 206)
+        boundary = partial.content_type.split("boundary=")[1]
+        self.assertTrue(partial.content_type.startswith("multipart/byteranges"))
+        self.assertEqual(
+            partial.body,
+            f"--{boundary}\r\nContent-Type: text/javascript\r\n"
+            f"Content-Range: bytes 0-1/10\r\n\r\n01\r\n"
+            f"--{boundary}\r\nContent-Type: text/javascript\r\n"
+            f"Content-Range: bytes 8-9/10\r\n\r\n89\r\n"
+            f"--{boundary}--\r\n".encode(),
+        )
+
+    async def test_unsatisfiable_range(self):
+        path = self.make_file("app.js", b"0123456789")
+        response = await StaticFileCache().get(path)
+
+        partial = response.with_range("bytes=10-")
+
+        self.assertEqual(partial.status_code, 416)
+        self.assertEqual(partial.headers["Content-Range"], "bytes */10")
+
+    async def test_invalid_range_ignored(self):
+        path = self.make_file("app.js", b"0123456789")
+        response = await StaticFileCache().get(path)
+
+        self.assertIs(response.with_range("lines=1-2"), response)
+
+    async def test_precompressed_variant_negotiated(self):
+        path = self.make_file("app.js", b"plain")
+        self.make_file("app.js.br", b"brotli")
+        self.make_file("app.js.gz", b"gzipped")
+        cache = StaticFileCache()
+
+        br = await cache.get(path, "gzip, deflate, br")
+        gz = await cache.get(path, "gzip")
+        plain = await cache.get(path, "br;q=0, gzip;q=0")
+
+        self.assertEqual(br.body, b"brotli")
+        self.assertEqual(br.headers["Content-Encoding"], "br")
+        self.assertEqual(br.headers["Content-Type"], "text/javascript")
+        self.assertEqual(gz.body, b"gzipped")
+        self.assertEqual(gz.headers["Content-Encoding"], "gzip")
+        self.assertEqual(plain.body, b"plain")
+        self.assertNotIn("Content-Encoding", plain.headers)
+        for response in (br, gz, plain):
+            self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+        self.assertNotEqual(br.get_etag(), plain.get_etag())
+        # Variants share their file's entry but count against max_bytes
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(
+            cache.size,
+            sum(len(r.format_response()) - len(date_header()) for r in (br, gz, plain)),
+        )
+
+    async def test_no_vary_without_variants(self):
+        path = self.make_file("app.js", b"plain")
+
+        response = await StaticFileCache().get(path, "br, gzip")
+
+        self.assertEqual(response.body, b"plain")
+        self.assertNotIn("Vary", response.headers)
+
+    async def test_variant_lookup_cached(self):
+        path = self.make_file("app.js", b"plain")
+        cache = StaticFileCache(stat_interval=60)
+        await cache.get(path, "br")
+
+        with mock.patch("os.stat") as stat:
+            await cache.get(path, "br")
+
+        stat.assert_not_called()
+
+    async def test_variant_added_and_removed(self):
+        path = self.make_file("app.js", b"plain")
+        cache = StaticFileCache(stat_interval=0)
+        self.assertNotIn("Vary", (await cache.get(path, "gzip")).headers)
+
+        gz_path = self.make_file("app.js.gz", b"gzipped")
+        response = await cache.get(path, "gzip")
+        self.assertEqual(response.body, b"gzipped")
+        plain = await cache.get(path)
+        self.assertEqual(plain.headers["Vary"], "Accept-Encoding")
+        self.assertIn(b"Vary: Accept-Encoding", plain.format_response())
+
+        os.unlink(gz_path)
+        response = await cache.get(path, "gzip")
+        self.assertEqual(response.body, b"plain")
+        self.assertNotIn("Vary", response.headers)
+        self.assertEqual(
+            cache.size, len(response.format_response()) - len(date_header())
+        )
+
+    async def test_large_variant_streamed_with_encoding(self):
+        path = self.make_file("video.js", b"x" * 100)
+        self.make_file("video.js.gz", b"y" * 50)
+        cache = StaticFileCache(max_file_size=10)
+
+        response = await cache.get(path, "gzip")
+
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(response.path, path + ".gz")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+
+    async def test_range_of_variant_keeps_encoding(self):
+        path = self.make_file("app.js", b"plain")
+        self.make_file("app.js.gz", b"gzipped")
+        response = await StaticFileCache().get(path, "gzip")
+
+        partial = response.with_range("bytes=0-1")
+
+        self.assertEqual(partial.body, b"gz")
+        self.assertEqual(partial.headers["Content-Encoding"], "gzip")
+        self.assertEqual(partial.headers["Vary"], "Accept-Encoding")
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            StaticFileCache(max_entries=0)
+        with self.assertRaises(ValueError):
+            StaticFileCache(max_bytes=-1)
+        with self.assertRaises(ValueError):
+            StaticFileCache(stat_interval="1")
+
+
+if __name__ == "__main__":
+    unittest.main()
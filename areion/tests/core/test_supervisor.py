@@ -0,0 +1,115 @@
+import signal
+import unittest
+from unittest import mock
+from unittest.mock import MagicMock
+
+from ...core.supervisor import WorkerSupervisor
+
+
+class FakeProcess:
+    _next_pid = 1000
+
+    def __init__(self, target=None, args=(), name=None, daemon=None):
+        FakeProcess._next_pid += 1
+        self.pid = FakeProcess._next_pid
+        self.sentinel = self.pid
+        self.exitcode = None
+        self.alive = False
+        self.target = target
+        self.args = args
+
+    def start(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+    def join(self, timeout=None):
+        pass
+
+    def kill(self):
+        self.alive = False
+        self.exitcode = -9
+
+
+class TestWorkerSupervisor(unittest.TestCase):
+    def setUp(self):
+        self.target = MagicMock()
+        self.logger = MagicMock()
+        self.supervisor = WorkerSupervisor(
+            target=self.target, workers=3, logger=self.logger, restart_delay=0
+        )
+        self.supervisor._context = MagicMock()
+        self.supervisor._context.Process.side_effect = FakeProcess
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            WorkerSupervisor(target=self.target, workers=0)
+
+    def test_spawn_tracks_processes_by_index(self):
+        for index in range(3):
+            self.supervisor._spawn(index)
+
+        self.assertEqual(sorted(self.supervisor.processes), [0, 1, 2])
+        self.assertTrue(all(p.is_alive() for p in self.supervisor.processes.values()))
+        self.assertEqual(self.supervisor.processes[2].args, (2,))
+
+    def test_restart_exited_worker(self):
+        for index in range(3):
+            self.supervisor._spawn(index)
+        crashed = self.supervisor.processes[1]
+        crashed.alive = False
+        crashed.exitcode = 1
+
+        self.supervisor._restart_exited([1])
+
+        replacement = self.supervisor.processes[1]
+        self.assertIsNot(replacement, crashed)
+        self.assertTrue(replacement.is_alive())
+        self.assertEqual(replacement.args, (1,))
+        self.logger.warning.assert_called_once()
+
+    @mock.patch("os.kill")
+    def test_shutdown_forwards_signal(self, mock_kill):
+        for index in range(3):
+            self.supervisor._spawn(index)
+        pids = [p.pid for p in self.supervisor.processes.values()]
+
+        def exit_on_signal(pid, signum):
+            for process in self.supervisor.processes.values():
+                if process.pid == pid:
+                    process.alive = False
+
+        mock_kill.side_effect = exit_on_signal
+
+        self.supervisor.shutdown(signal.SIGINT)
+
+        mock_kill.assert_has_calls([mock.call(pid, signal.SIGINT) for pid in pids])
+        self.assertEqual(self.supervisor.processes, {})
+
+    @mock.patch("os.kill")
+    def test_shutdown_kills_stuck_workers(self, mock_kill):
+        self.supervisor.shutdown_timeout = 0
+        self.supervisor._spawn(0)
+        stuck = self.supervisor.processes[0]
+
+        self.supervisor.shutdown()
+
+        self.assertFalse(stuck.is_alive())
+        self.assertEqual(stuck.exitcode, -9)
+
+    def test_signal_requests_stop(self):
+        self.supervisor._handle_signal(signal.SIGTERM, None)
+        self.assertEqual(self.supervisor._stop_signal, signal.SIGTERM)
+
+    @mock.patch("signal.signal")
+    def test_worker_main_resets_signals_and_runs_target(self, mock_signal):
+        self.supervisor._worker_main(2)
+
+        mock_signal.assert_any_call(signal.SIGTERM, signal.SIG_DFL)
+        mock_signal.assert_any_call(signal.SIGINT, signal.default_int_handler)
+        self.target.assert_called_once_with(2)
+
+
+if __name__ == "__main__":
+    unittest.main()
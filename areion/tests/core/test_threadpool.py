@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import unittest
+
+from ...core.exceptions import HttpError
+from ...core.threadpool import HandlerPool, ThreadedHandler
+
+
+class TestHandlerPool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.pool = HandlerPool(max_workers=1, max_queue=1)
+        self.addCleanup(self.pool.shutdown)
+
+    async def test_runs_off_the_event_loop(self):
+        result = await self.pool.run(
+            lambda a, b=0: (threading.get_ident(), a + b), 1, b=2
+        )
+
+        self.assertNotEqual(result[0], threading.get_ident())
+        self.assertEqual(result[1], 3)
+        self.assertEqual(self.pool.get_stats()["completed"], 1)
+
+    async def test_exceptions_propagate(self):
+        def handler():
+            raise KeyError("missing")
+
+        with self.assertRaises(KeyError):
+            await self.pool.run(handler)
+        self.assertEqual(self.pool.get_stats()["active"], 0)
+
+    async def test_full_queue_rejected(self):
+        release = threading.Event()
+        running = [asyncio.ensure_future(self.pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+
+        stats = self.pool.get_stats()
+        self.assertEqual((stats["active"], stats["queued"]), (1, 1))
+        with self.assertRaises(HttpError) as context:
+            await self.pool.run(release.wait)
+        self.assertEqual(context.exception.status_code, 503)
+        self.assertEqual(self.pool.get_stats()["rejected"], 1)
+
+        release.set()
+        await asyncio.gather(*running)
+        stats = self.pool.get_stats()
+        self.assertEqual((stats["active"], stats["queued"]), (0, 0))
+        self.assertEqual(stats["completed"], 2)
+
+    async def test_executor_created_lazily(self):
+        self.assertIsNone(self.pool._executor)
+        await self.pool.run(int)
+        self.assertIsNotNone(self.pool._executor)
+
+        self.pool.shutdown()
+        self.assertIsNone(self.pool._executor)
+        self.assertEqual(await self.pool.run(int, "7"), 7)
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            HandlerPool(max_workers=0)
+        with self.assertRaises(ValueError):
+            HandlerPool(max_queue=-1)
+
+
+class TestThreadedHandler(unittest.TestCase):
+    def test_calls_through(self):
+        handler = ThreadedHandler(lambda request, id: f"{request}:{id}")
+        self.assertEqual(handler("req", id=3), "req:3")
@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import MagicMock
+
+import asyncio
+from ...core.timeouts import TimerWheel, TimeoutEntry
+
+
+class TestTimerWheel(unittest.TestCase):
+    def setUp(self):
+        self.wheel = TimerWheel(resolution=1.0)
+
+    def make_entry(self):
+        return TimeoutEntry(MagicMock())
+
+    def test_invalid_resolution(self):
+        with self.assertRaises(ValueError):
+            TimerWheel(resolution=0)
+
+    @unittest.mock.patch("time.monotonic", return_value=100.0)
+    def test_expire_fires_due_entries(self, _):
+        entry = self.make_entry()
+        self.wheel.schedule(entry, 5, "header")
+
+        self.assertEqual(self.wheel.expire(now=104.0), 0)
+        entry.callback.assert_not_called()
+
+        self.assertEqual(self.wheel.expire(now=106.0), 1)
+        entry.callback.assert_called_once_with()
+        self.assertTrue(entry.expired)
+        self.assertEqual(entry.phase, "header")
+        self.assertEqual(len(self.wheel), 0)
+
+    @unittest.mock.patch("time.monotonic", return_value=100.0)
+    def test_cancel(self, _):
+        entry = self.make_entry()
+        self.wheel.schedule(entry, 5, "idle")
+        self.wheel.cancel(entry)
+
+        self.assertEqual(self.wheel.expire(now=200.0), 0)
+        entry.callback.assert_not_called()
+        self.assertIsNone(entry.phase)
+
+    def test_rearm_later_is_refiled_lazily(self):
+        entry = self.make_entry()
+        with unittest.mock.patch("time.monotonic", return_value=100.0):
+            self.wheel.schedule(entry, 5, "header")
+        with unittest.mock.patch("time.monotonic", return_value=103.0):
+            self.wheel.schedule(entry, 30, "idle")
+        # The entry stays in its old slot until that slot is reached
+        self.assertEqual(entry.slot, 105)
+
+        self.assertEqual(self.wheel.expire(now=106.0), 0)
+        self.assertEqual(entry.slot, 133)
+        self.assertEqual(self.wheel.expire(now=133.5), 1)
+        entry.callback.assert_called_once_with()
+        self.assertEqual(entry.phase, "idle")
+
+    def test_rearm_earlier_moves_slot(self):
+        entry = self.make_entry()
+        with unittest.mock.patch("time.monotonic", return_value=100.0):
+            self.wheel.schedule(entry, 30, "idle")
+            self.wheel.schedule(entry, 2, "header")
+
+        self.assertEqual(self.wheel.expire(now=102.5), 1)
+        self.assertEqual(entry.phase, "header")
+
+    def test_rearmed_entry_is_not_expired(self):
+        entry = self.make_entry()
+        with unittest.mock.patch("time.monotonic", return_value=100.0):
+            self.wheel.schedule(entry, 1, "header")
+        self.wheel.expire(now=102.0)
+        self.assertTrue(entry.expired)
+
+        with unittest.mock.patch("time.monotonic", return_value=102.0):
+            self.wheel.schedule(entry, 1, "header")
+        self.assertFalse(entry.expired)
+
+    def test_many_entries_share_slots(self):
+        entries = [self.make_entry() for _ in range(100)]
+        with unittest.mock.patch("time.monotonic", return_value=100.0):
+            for entry in entries:
+                self.wheel.schedule(entry, 10, "idle")
+
+        self.assertEqual(len(self.wheel._slots), 1)
+        self.assertEqual(self.wheel.expire(now=111.0), 100)
+
+    @unittest.mock.patch("time.monotonic", return_value=100.0)
+    def test_expire_phase(self, _):
+        idle = self.make_entry()
+        header = self.make_entry()
+        self.wheel.schedule(idle, 30, "idle")
+        self.wheel.schedule(header, 5, "header")
+
+        self.assertEqual(self.wheel.expire_phase("idle"), 1)
+        idle.callback.assert_called_once_with()
+        self.assertTrue(idle.expired)
+        self.assertEqual(idle.phase, "idle")
+        header.callback.assert_not_called()
+        self.assertEqual(len(self.wheel), 1)
+
+
+class TestTimerWheelLoop(unittest.IsolatedAsyncioTestCase):
+    async def test_start_ticks_on_running_loop(self):
+        wheel = TimerWheel(resolution=0.01)
+        entry = TimeoutEntry(MagicMock())
+        wheel.start()
+        wheel.schedule(entry, 0.01, "header")
+
+        await asyncio.sleep(0.05)
+        wheel.stop()
+
+        entry.callback.assert_called_once_with()
+        self.assertIsNone(wheel._handle)
+
+
+if __name__ == "__main__":
+    unittest.main()
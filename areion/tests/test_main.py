@@ -1,8 +1,13 @@
+import asyncio
+import os
+import tempfile
 import unittest
 from unittest.mock import Mock, patch, AsyncMock
 from .. import (
     AreionServerBuilder,
     AreionServer,
+    FileResponse,
+    HttpServer,
     DEFAULT_HOST,
     DEFAULT_PORT,
     AREION_LOGO,
@@ -93,6 +98,121 @@ class TestAreionServerBuilder(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.builder.with_static_dir("/non_existent_dir")
 
+    def test_with_transport(self):
+        self.builder.with_transport("protocol")
+        self.assertEqual(self.builder.transport, "protocol")
+
+    def test_with_transport_invalid(self):
+        with self.assertRaises(ValueError):
+            self.builder.with_transport("udp")
+
+    def test_with_parser(self):
+        self.assertEqual(self.builder.parser, "auto")
+        self.builder.with_parser("python")
+        server = self.builder.with_router(Mock()).build()
+        self.assertEqual(server.parser, "python")
+
+    def test_with_parser_invalid(self):
+        with self.assertRaises(ValueError):
+            self.builder.with_parser("fast")
+        with patch("areion.core.parser.httptools", None):
+            with self.assertRaises(ValueError):
+                self.builder.with_parser("httptools")
+
+    def test_with_head_limits(self):
+        self.builder.with_head_limits(max_request_line=1024, max_header_count=20)
+        server = self.builder.with_router(Mock()).build()
+        self.assertEqual(server.head_limits["max_request_line"], 1024)
+        self.assertEqual(server.head_limits["max_header_count"], 20)
+        self.assertEqual(server.head_limits["max_header_bytes"], 2**16)
+
+        with self.assertRaises(ValueError):
+            self.builder.with_head_limits(max_header_size=0)
+
+    def test_with_thread_pool(self):
+        self.builder.with_thread_pool(max_workers=4, max_queue=8)
+        server = self.builder.with_router(Mock()).build()
+        stats = server.get_thread_pool_stats()
+        self.assertEqual((stats["max_workers"], stats["max_queue"]), (4, 8))
+
+        with self.assertRaises(ValueError):
+            self.builder.with_thread_pool(max_workers=0)
+
+    def test_with_workers(self):
+        self.builder.with_workers(4)
+        self.assertEqual(self.builder.workers, 4)
+
+    def test_with_workers_invalid(self):
+        with self.assertRaises(ValueError):
+            self.builder.with_workers(0)
+
+        with self.assertRaises(ValueError):
+            self.builder.with_workers("4")
+
+    def test_with_connection_settings(self):
+        self.builder.with_max_conns(50).with_buffer_size(4096).with_keep_alive_timeout(
+            10
+        ).with_overload_policy("pause").with_header_timeout(5).with_body_timeout(2.5)
+        server = self.builder.with_router(Mock()).build()
+        self.assertEqual(server.max_conns, 50)
+        self.assertEqual(server.buffer_size, 4096)
+        self.assertEqual(server.keep_alive_timeout, 10)
+        self.assertEqual(server.overload_policy, "pause")
+        self.assertEqual(server.header_timeout, 5)
+        self.assertEqual(server.body_timeout, 2.5)
+
+    def test_with_body_limits(self):
+        self.builder.with_max_body_size(1024).with_max_chunk_size(256)
+        server = self.builder.with_router(Mock()).build()
+        self.assertEqual(server.max_body_size, 1024)
+        self.assertEqual(server.max_chunk_size, 256)
+
+        with self.assertRaises(ValueError):
+            self.builder.with_max_body_size(0)
+        with self.assertRaises(ValueError):
+            self.builder.with_max_chunk_size(1.5)
+
+    def test_with_static_cache_settings(self):
+        self.builder.with_static_cache_entries(8).with_static_cache_bytes(4096)
+        self.builder.with_static_stat_interval(0)
+        server = self.builder.with_router(Mock()).build()
+        self.assertEqual(server.static_cache.max_entries, 8)
+        self.assertEqual(server.static_cache.max_bytes, 4096)
+        self.assertEqual(server.static_cache.stat_interval, 0)
+
+        with self.assertRaises(ValueError):
+            self.builder.with_static_cache_entries(0)
+        with self.assertRaises(ValueError):
+            self.builder.with_static_cache_bytes("1M")
+        with self.assertRaises(ValueError):
+            self.builder.with_static_stat_interval(-1)
+
+    def test_with_compression(self):
+        self.assertIsNone(self.builder.with_router(Mock()).build().compressor)
+
+        self.builder.with_compression(min_size=10, level=9)
+        server = self.builder.build()
+        self.assertEqual(server.compressor.min_size, 10)
+        self.assertEqual(server.compressor.level, 9)
+        self.assertIn("gzip", server.compressor.codings)
+
+        with self.assertRaises(ValueError):
+            self.builder.with_compression(level=0)
+
+    def test_with_connection_settings_invalid(self):
+        with self.assertRaises(ValueError):
+            self.builder.with_max_conns(0)
+        with self.assertRaises(ValueError):
+            self.builder.with_buffer_size(-1)
+        with self.assertRaises(ValueError):
+            self.builder.with_keep_alive_timeout("30")
+        with self.assertRaises(ValueError):
+            self.builder.with_overload_policy("drop")
+        with self.assertRaises(ValueError):
+            self.builder.with_header_timeout(0)
+        with self.assertRaises(ValueError):
+            self.builder.with_body_timeout("30")
+
     def test_build(self):
         router = Mock()
         self.builder.with_router(router)
@@ -106,13 +226,15 @@ class TestAreionServerBuilder(unittest.TestCase):
         self.assertEqual(server.logger, self.builder.logger)
         self.assertEqual(server.engine, self.builder.engine)
         self.assertEqual(server.static_dir, self.builder.static_dir)
+        self.assertEqual(server.transport, "stream")
+        self.assertEqual(server.workers, 1)
 
     def test_build_without_router(self):
         with self.assertRaises(ValueError):
             self.builder.build()
 
 
-class TestAreionServer(unittest.TestCase):
+class TestAreionServer(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.router = Mock()
         self.orchestrator = Mock()
@@ -137,6 +259,18 @@ class TestAreionServer(unittest.TestCase):
         self.server.run()
         mock_asyncio_run.assert_called_once()
 
+    @patch("asyncio.run")
+    @patch("areion.main.WorkerSupervisor")
+    def test_run_with_workers(self, mock_supervisor, mock_asyncio_run):
+        self.server.workers = 3
+        with patch("builtins.print"):
+            self.server.run()
+        mock_supervisor.assert_called_once_with(
+            target=self.server._run_worker, workers=3, logger=self.logger
+        )
+        mock_supervisor.return_value.run.assert_called_once()
+        mock_asyncio_run.assert_not_called()
+
     @patch("asyncio.run", side_effect=KeyboardInterrupt)
     def test_run_keyboard_interrupt(self, mock_asyncio_run):
         self.server.stop = Mock()
@@ -150,14 +284,12 @@ class TestAreionServer(unittest.TestCase):
         self.server.stop.assert_called_once()
 
     @patch("builtins.print")
-    @patch("asyncio.Event.wait", new_callable=AsyncMock)
-    @patch("..main.HttpServer.run", new_callable=AsyncMock)
-    async def test_start(self, mock_http_server_run, mock_event_wait, mock_print):
-        self.logger.info = Mock()
-        self.logger.debug = Mock()
+    @patch.object(HttpServer, "stop", new_callable=AsyncMock)
+    @patch.object(HttpServer, "run", new_callable=AsyncMock)
+    async def test_start(self, mock_http_server_run, mock_http_server_stop, mock_print):
         self.server._start_orchestrator_in_thread = Mock()
-        self.server.http_server = Mock()
-        self.server.http_server.run = mock_http_server_run
+        # Shut down as soon as the HTTP server is started
+        self.server._shutdown_event.set()
 
         await self.server.start()
 
@@ -165,28 +297,30 @@ class TestAreionServer(unittest.TestCase):
         self.logger.info.assert_any_call(
             f"Starting server on {self.server.host}:{self.server.port}"
         )
-        self.logger.info.assert_any_call(
-            f"Server running on http://{self.server.host}:{self.server.port}"
-        )
-        self.logger.debug.assert_called_once_with(
-            f"Available Routes and Handlers: {self.router.routes}"
+        self.router.add_route.assert_called_once_with(
+            "/static/:filename", self.server._static_file_handler, methods=["GET"]
         )
+        self.assertIsInstance(self.server.http_server, HttpServer)
+        self.assertIs(self.server.http_server.router, self.router)
         self.server._start_orchestrator_in_thread.assert_called_once()
-        mock_event_wait.assert_called_once()
+        mock_http_server_run.assert_awaited_once()
+        mock_http_server_stop.assert_awaited_once()
 
     @patch("asyncio.get_event_loop")
-    @patch("..main.HttpServer.stop", new_callable=AsyncMock)
+    @patch.object(HttpServer, "stop", new_callable=AsyncMock)
     async def test_shutdown(self, mock_http_server_stop, mock_get_event_loop):
-        server_task = AsyncMock()
+        server_task = asyncio.ensure_future(asyncio.sleep(0))
         self.server.http_server = Mock()
         self.server.http_server.stop = mock_http_server_stop
+        self.server.stop = Mock()
         self.orchestrator.shutdown = Mock()
         mock_get_event_loop.return_value.run_in_executor = AsyncMock()
 
         await self.server.shutdown(server_task)
 
-        mock_http_server_stop.assert_called_once()
-        server_task.assert_awaited_once()
+        mock_http_server_stop.assert_awaited_once()
+        self.assertTrue(server_task.done())
+        self.server.stop.assert_called_once()
         mock_get_event_loop.return_value.run_in_executor.assert_awaited_once_with(
             None, self.orchestrator.shutdown
         )
@@ -199,30 +333,71 @@ class TestAreionServer(unittest.TestCase):
             self.server._shutdown_event.set
         )
 
+    def test_get_connection_stats(self):
+        self.assertEqual(self.server.get_connection_stats(), {})
+        self.server.http_server = Mock()
+        self.server.http_server.get_connection_stats.return_value = {"active": 3}
+        self.assertEqual(self.server.get_connection_stats(), {"active": 3})
+
     def test_start_orchestrator_in_thread(self):
         self.server._start_orchestrator = Mock()
         self.server._start_orchestrator_in_thread()
         self.assertTrue(self.server._start_orchestrator.called)
 
-    @patch("os.path.exists", return_value=True)
-    @patch("os.path.isfile", return_value=True)
-    @patch(
-        "builtins.open", new_callable=unittest.mock.mock_open, read_data=b"file content"
-    )
-    @patch("mimetypes.guess_type", return_value=("text/plain", None))
-    async def test_static_file_handler(
-        self, mock_guess_type, mock_open, mock_isfile, mock_exists
-    ):
-        request = Mock()
-        filename = "test.txt"
-        response = await self.server._static_file_handler(request, filename)
+
+class TestAreionServerStaticFiles(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.static_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.static_dir.cleanup)
+        self.server = AreionServer(
+            host=DEFAULT_HOST,
+            port=DEFAULT_PORT,
+            router=Mock(),
+            orchestrator=Mock(),
+            logger=Mock(),
+            engine=Mock(),
+            static_dir=self.static_dir.name,
+            request_factory=Mock(),
+        )
+
+    async def test_static_file_handler(self):
+        static_dir = self.static_dir.name
+        with open(os.path.join(static_dir, "test.txt"), "wb") as file:
+            file.write(b"file content")
+
+        response = await self.server._static_file_handler(Mock(), "test.txt")
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.body, b"file content")
         self.assertEqual(response.headers["Content-Type"], "text/plain")
 
-    @patch("os.path.exists", return_value=False)
-    async def test_static_file_handler_file_not_found(self, mock_exists):
+    async def test_static_file_handler_large_file(self):
+        self.server.static_cache.max_file_size = 4
+        static_dir = self.static_dir.name
+        with open(os.path.join(static_dir, "test.txt"), "wb") as file:
+            file.write(b"file content")
+
+        response = await self.server._static_file_handler(Mock(), "test.txt")
+
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(response.path, os.path.join(static_dir, "test.txt"))
+        self.assertEqual(response.stat_result.st_size, 12)
+
+    async def test_static_file_handler_precompressed(self):
+        static_dir = self.static_dir.name
+        for name, data in (("app.css", b"plain"), ("app.css.gz", b"gzipped")):
+            with open(os.path.join(static_dir, name), "wb") as file:
+                file.write(data)
+        request = Mock()
+        request.get_header.return_value = "gzip, deflate"
+
+        response = await self.server._static_file_handler(request, "app.css")
+
+        request.get_header.assert_called_with("Accept-Encoding")
+        self.assertEqual(response.body, b"gzipped")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+
+    async def test_static_file_handler_file_not_found(self):
         request = Mock()
         filename = "test.txt"
         response = await self.server._static_file_handler(request, filename)
@@ -230,6 +405,13 @@ class TestAreionServer(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertEqual(response.body, "File Not Found")
 
+    async def test_static_file_handler_directory_not_served(self):
+        os.mkdir(os.path.join(self.static_dir.name, "assets"))
+
+        response = await self.server._static_file_handler(Mock(), "assets")
+
+        self.assertEqual(response.status_code, 404)
+
 
 if __name__ == "__main__":
     unittest.main()